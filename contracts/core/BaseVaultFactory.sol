@@ -0,0 +1,53 @@
+//SPDX-License-Identifier: GPL-3.0
+pragma solidity ^0.8.0;
+
+// Vault registry shared by VaultFactory and VaultCloneFactory
+abstract contract BaseVaultFactory {
+
+    mapping(address => address[]) public getVault;
+    address[] public allVaults;
+
+    event VaultCreated(address[] addresses, uint256[] weights, address trackingToken, address vault, uint);
+
+    function allVaultsLength() external view returns (uint256) {
+        return allVaults.length;
+    }
+
+    // Rejects repeated tokens in linear time: every address goes into an open addressing
+    // hash set in memory, keyed by its low bits, sized to stay at most half full
+    function _checkAssets(address[] memory addresses) internal pure {
+        uint256 size = 4;
+        while (size < addresses.length * 2) {
+            size <<= 1;
+        }
+        uint256 mask = size - 1;
+        // address(0) marks empty slots, so the zero address is tracked on its own
+        address[] memory seen = new address[](size);
+        bool seenZero;
+        for (uint i; i < addresses.length; i++) {
+            address asset = addresses[i];
+            if (asset == address(0)) {
+                require(!seenZero, "Repeating token not supported");
+                seenZero = true;
+                continue;
+            }
+            uint256 slot = uint160(asset) & mask;
+            while (seen[slot] != address(0)) {
+                require(seen[slot] != asset, "Repeating token not supported");
+                slot = (slot + 1) & mask;
+            }
+            seen[slot] = asset;
+        }
+    }
+
+    function _vaultSalt(address[] memory addresses, uint256[] memory weights, address trackingToken) internal pure returns (bytes32) {
+        return keccak256(abi.encodePacked(addresses, weights, trackingToken));
+    }
+
+    function _registerVault(address[] memory addresses, uint256[] memory weights, address trackingToken, address vault) internal {
+        getVault[trackingToken].push(vault);
+        allVaults.push(vault);
+        emit VaultCreated(addresses, weights, trackingToken, vault, allVaults.length);
+    }
+
+}
@@ -0,0 +1,20 @@
+//SPDX-License-Identifier: GPL-3.0
+pragma solidity ^0.8.0;
+
+import "./BaseImmutableVault.sol";
+
+interface IVaultParameters {
+    function vaultParameters() external view returns (address[] memory addresses, uint256[] memory weights, address trackingToken);
+}
+
+// ImmutableVault as created by VaultFactory. The basket is read back from the factory
+// instead of being passed as constructor arguments, so the init code, and therefore
+// its hash, is the same for every vault
+contract FactoryImmutableVault is BaseImmutableVault {
+
+    constructor() ERC20("Vault", "PGV") {
+        (address[] memory _assets, uint256[] memory _weights, address _trackingToken) = IVaultParameters(msg.sender).vaultParameters();
+        _initializeVault(_assets, _weights, _trackingToken);
+    }
+
+}
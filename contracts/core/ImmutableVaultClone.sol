@@ -0,0 +1,18 @@
+//SPDX-License-Identifier: GPL-3.0
+pragma solidity ^0.8.0;
+
+import "@openzeppelin/contracts/proxy/utils/Initializable.sol";
+import "./BaseImmutableVault.sol";
+
+// Implementation behind the EIP-1167 clones created by VaultCloneFactory, every clone
+// is initialized once by the factory in the same transaction that creates it
+contract ImmutableVaultClone is BaseImmutableVault, Initializable {
+
+    // locks the implementation itself, only clones can be initialized
+    constructor() ERC20("Vault", "PGV") initializer {}
+
+    function initialize(address[] memory _assets, uint256[] memory _weights, address _trackingToken) external initializer {
+        _initializeVault(_assets, _weights, _trackingToken);
+    }
+
+}
@@ -0,0 +1,162 @@
+//SPDX-License-Identifier: GPL-3.0
+pragma solidity ^0.8.0;
+
+import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+
+// Gas optimized ImmutableVault with the same external interface.
+// Baskets of up to 8 assets live in immutables (bytecode) instead of storage, larger
+// baskets keep the remaining assets in storage arrays. Reserves are not tracked in
+// storage anymore, `reserves(i)` is the vault balance of the asset, which is what
+// withdraw already uses to pay out.
+contract LeanImmutableVault is ERC20 {
+    using SafeERC20 for ERC20;
+
+    uint256 private constant MAX_IMMUTABLE_ASSETS = 8;
+
+    address private immutable factory;
+    ERC20 public immutable trackingToken;
+    uint256 private immutable _assetLength;
+
+    address private immutable _asset0;
+    address private immutable _asset1;
+    address private immutable _asset2;
+    address private immutable _asset3;
+    address private immutable _asset4;
+    address private immutable _asset5;
+    address private immutable _asset6;
+    address private immutable _asset7;
+
+    uint256 private immutable _weight0;
+    uint256 private immutable _weight1;
+    uint256 private immutable _weight2;
+    uint256 private immutable _weight3;
+    uint256 private immutable _weight4;
+    uint256 private immutable _weight5;
+    uint256 private immutable _weight6;
+    uint256 private immutable _weight7;
+
+    address[] private _extraAssets;
+    uint256[] private _extraWeights;
+
+    constructor(address[] memory _assets, uint256[] memory _weights, address _trackingToken) ERC20(_vaultName(_assets), "PGV") {
+        require(_assets.length == _weights.length, "Assets and Weights are not matching");
+        uint256 length = _assets.length;
+        _assetLength = length;
+        _asset0 = _assets[0];
+        _asset1 = _assets[1];
+        _asset2 = length > 2 ? _assets[2] : address(0);
+        _asset3 = length > 3 ? _assets[3] : address(0);
+        _asset4 = length > 4 ? _assets[4] : address(0);
+        _asset5 = length > 5 ? _assets[5] : address(0);
+        _asset6 = length > 6 ? _assets[6] : address(0);
+        _asset7 = length > 7 ? _assets[7] : address(0);
+        _weight0 = _weights[0];
+        _weight1 = _weights[1];
+        _weight2 = length > 2 ? _weights[2] : 0;
+        _weight3 = length > 3 ? _weights[3] : 0;
+        _weight4 = length > 4 ? _weights[4] : 0;
+        _weight5 = length > 5 ? _weights[5] : 0;
+        _weight6 = length > 6 ? _weights[6] : 0;
+        _weight7 = length > 7 ? _weights[7] : 0;
+        for (uint i = MAX_IMMUTABLE_ASSETS; i < length; i++) {
+            _extraAssets.push(_assets[i]);
+            _extraWeights.push(_weights[i]);
+        }
+        trackingToken = ERC20(_trackingToken);
+        factory = msg.sender;
+    }
+
+    function _vaultName(address[] memory _assets) private view returns (string memory) {
+        require(_assets.length > 1, "At least 2 tokens are needed");
+        bytes memory _bname = abi.encodePacked("PGVault: ", ERC20(_assets[0]).symbol());
+        for (uint i = 1; i < _assets.length; i++) {
+            _bname = abi.encodePacked(_bname, "-", ERC20(_assets[i]).symbol());
+        }
+        return string(_bname);
+    }
+
+    function _assetAt(uint256 i) private view returns (ERC20) {
+        if (i < 4) {
+            if (i < 2) return ERC20(i == 0 ? _asset0 : _asset1);
+            return ERC20(i == 2 ? _asset2 : _asset3);
+        }
+        if (i < MAX_IMMUTABLE_ASSETS) {
+            if (i < 6) return ERC20(i == 4 ? _asset4 : _asset5);
+            return ERC20(i == 6 ? _asset6 : _asset7);
+        }
+        return ERC20(_extraAssets[i - MAX_IMMUTABLE_ASSETS]);
+    }
+
+    function _weightAt(uint256 i) private view returns (uint256) {
+        if (i < 4) {
+            if (i < 2) return i == 0 ? _weight0 : _weight1;
+            return i == 2 ? _weight2 : _weight3;
+        }
+        if (i < MAX_IMMUTABLE_ASSETS) {
+            if (i < 6) return i == 4 ? _weight4 : _weight5;
+            return i == 6 ? _weight6 : _weight7;
+        }
+        return _extraWeights[i - MAX_IMMUTABLE_ASSETS];
+    }
+
+    function assets(uint256 i) external view returns (ERC20) {
+        require(i < _assetLength, "Index out of bounds");
+        return _assetAt(i);
+    }
+
+    function weights(uint256 i) external view returns (uint256) {
+        require(i < _assetLength, "Index out of bounds");
+        return _weightAt(i);
+    }
+
+    function reserves(uint256 i) external view returns (uint256) {
+        require(i < _assetLength, "Index out of bounds");
+        return _assetAt(i).balanceOf(address(this));
+    }
+
+    function _deposit(address toAccount, uint256 amount) internal {
+        uint256 length = _assetLength;
+        for (uint i; i < length; ) {
+            //we need to figure out a way to make this decimals safe
+            _assetAt(i).safeTransferFrom(msg.sender, address(this), _weightAt(i) * amount);
+            unchecked { ++i; }
+        }
+
+        _mint(toAccount, amount);
+    }
+
+    function _withdraw(address toAccount, uint256 amount) internal {
+        uint256 _totalSupply = totalSupply();
+        _burn(msg.sender, amount);
+
+        uint256 length = _assetLength;
+        for (uint i; i < length; ) {
+            ERC20 asset = _assetAt(i);
+            uint tokenAmount = amount * asset.balanceOf(address(this)) / _totalSupply;
+            require(tokenAmount > 0, "Insufficient token to transfer");
+            asset.safeTransfer(toAccount, tokenAmount);
+            unchecked { ++i; }
+        }
+    }
+
+    function deposit(uint256 amount) external {
+        _deposit(msg.sender, amount);
+    }
+
+    function depositTo(address toAccount, uint256 amount) external {
+        _deposit(toAccount, amount);
+    }
+
+    function withdraw(uint256 amount) external {
+        _withdraw(msg.sender, amount);
+    }
+
+    function withdrawTo(address toAccount, uint256 amount) external {
+        _withdraw(toAccount, amount);
+    }
+
+    function assetLength() external view returns (uint256) {
+        return _assetLength;
+    }
+}
@@ -0,0 +1,31 @@
+//SPDX-License-Identifier: GPL-3.0
+pragma solidity ^0.8.0;
+
+import "@openzeppelin/contracts/proxy/Clones.sol";
+import "./BaseVaultFactory.sol";
+import "./ImmutableVaultClone.sol";
+
+// Creates vaults as EIP-1167 minimal proxies of a single ImmutableVaultClone
+// implementation. Clones are deployed with CREATE2 using the same salt as
+// VaultFactory, so vault addresses stay deterministic per basket.
+contract VaultCloneFactory is BaseVaultFactory {
+
+    address public immutable implementation;
+
+    constructor() {
+        implementation = address(new ImmutableVaultClone());
+    }
+
+    function createVault(address[] memory addresses, uint256[] memory weights, address trackingToken) external returns (address vault) {
+        _checkAssets(addresses);
+
+        vault = Clones.cloneDeterministic(implementation, _vaultSalt(addresses, weights, trackingToken));
+        ImmutableVaultClone(vault).initialize(addresses, weights, trackingToken);
+        _registerVault(addresses, weights, trackingToken, vault);
+    }
+
+    function getVaultAddress(address[] memory addresses, uint256[] memory weights, address trackingToken) external view returns (address) {
+        return Clones.predictDeterministicAddress(implementation, _vaultSalt(addresses, weights, trackingToken));
+    }
+
+}
@@ -0,0 +1,24 @@
+//SPDX-License-Identifier: GPL-3.0
+pragma solidity ^0.8.0;
+
+import "../BaseVaultFactory.sol";
+
+// Exposes the createVault duplicate-asset check, next to the nested loop it replaced,
+// so their gas can be measured in isolation
+contract AssetCheckHarness is BaseVaultFactory {
+
+    function checkAssets(address[] memory addresses) external pure returns (bool) {
+        _checkAssets(addresses);
+        return true;
+    }
+
+    function checkAssetsQuadratic(address[] memory addresses) external pure returns (bool) {
+        for (uint i; i < addresses.length; i++) {
+            for (uint j = i + 1; j < addresses.length; j++) {
+                require(addresses[i] != addresses[j], "Repeating token not supported");
+            }
+        }
+        return true;
+    }
+
+}
@@ -0,0 +1,64 @@
+//SPDX-License-Identifier: GPL-3.0
+pragma solidity ^0.8.0;
+
+// Chainlink-style aggregator exposing the read API of the EACAggregatorProxy used by the
+// price feed tests, answers are pushed with updateAnswer
+contract MockAggregator {
+
+    uint8 public decimals;
+    string public description;
+    uint256 public constant version = 4;
+
+    uint256 public latestRound;
+    mapping(uint256 => int256) public getAnswer;
+    mapping(uint256 => uint256) public getTimestamp;
+    mapping(uint256 => uint256) private getStartedAt;
+
+    event AnswerUpdated(int256 indexed current, uint256 indexed roundId, uint256 updatedAt);
+    event NewRound(uint256 indexed roundId, address indexed startedBy, uint256 startedAt);
+
+    constructor(uint8 _decimals, string memory _description, int256 _initialAnswer) {
+        decimals = _decimals;
+        description = _description;
+        updateAnswer(_initialAnswer);
+    }
+
+    function updateAnswer(int256 _answer) public {
+        latestRound++;
+        getAnswer[latestRound] = _answer;
+        getTimestamp[latestRound] = block.timestamp;
+        getStartedAt[latestRound] = block.timestamp;
+        emit NewRound(latestRound, msg.sender, block.timestamp);
+        emit AnswerUpdated(_answer, latestRound, block.timestamp);
+    }
+
+    function latestAnswer() external view returns (int256) {
+        return getAnswer[latestRound];
+    }
+
+    function latestTimestamp() external view returns (uint256) {
+        return getTimestamp[latestRound];
+    }
+
+    function getRoundData(uint80 _roundId) public view returns (
+        uint80 roundId,
+        int256 answer,
+        uint256 startedAt,
+        uint256 updatedAt,
+        uint80 answeredInRound
+    ) {
+        require(getTimestamp[_roundId] > 0, "No data present");
+        return (_roundId, getAnswer[_roundId], getStartedAt[_roundId], getTimestamp[_roundId], _roundId);
+    }
+
+    function latestRoundData() external view returns (
+        uint80 roundId,
+        int256 answer,
+        uint256 startedAt,
+        uint256 updatedAt,
+        uint80 answeredInRound
+    ) {
+        return getRoundData(uint80(latestRound));
+    }
+
+}
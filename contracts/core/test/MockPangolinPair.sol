@@ -0,0 +1,103 @@
+//SPDX-License-Identifier: GPL-3.0
+pragma solidity ^0.8.0;
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+
+// Minimal stand-in for PangolinPair: reserves, cumulative prices and swaps follow the
+// real pair, liquidity is seeded by transferring tokens in and calling sync
+contract MockPangolinPair {
+    using SafeERC20 for IERC20;
+
+    address public factory;
+    address public token0;
+    address public token1;
+
+    uint112 private reserve0;
+    uint112 private reserve1;
+    uint32 private blockTimestampLast;
+
+    uint public price0CumulativeLast;
+    uint public price1CumulativeLast;
+
+    event Swap(
+        address indexed sender,
+        uint amount0In,
+        uint amount1In,
+        uint amount0Out,
+        uint amount1Out,
+        address indexed to
+    );
+    event Sync(uint112 reserve0, uint112 reserve1);
+
+    constructor() {
+        factory = msg.sender;
+    }
+
+    function initialize(address _token0, address _token1) external {
+        require(msg.sender == factory, "Pangolin: FORBIDDEN");
+        token0 = _token0;
+        token1 = _token1;
+    }
+
+    function getReserves() public view returns (uint112 _reserve0, uint112 _reserve1, uint32 _blockTimestampLast) {
+        _reserve0 = reserve0;
+        _reserve1 = reserve1;
+        _blockTimestampLast = blockTimestampLast;
+    }
+
+    function _update(uint balance0, uint balance1, uint112 _reserve0, uint112 _reserve1) private {
+        require(balance0 <= type(uint112).max && balance1 <= type(uint112).max, "Pangolin: OVERFLOW");
+        uint32 blockTimestamp = uint32(block.timestamp % 2**32);
+        unchecked {
+            // overflow is desired, same as the UQ112x112 accumulators of the real pair
+            uint32 timeElapsed = blockTimestamp - blockTimestampLast;
+            if (timeElapsed > 0 && _reserve0 != 0 && _reserve1 != 0) {
+                price0CumulativeLast += ((uint(_reserve1) << 112) / _reserve0) * timeElapsed;
+                price1CumulativeLast += ((uint(_reserve0) << 112) / _reserve1) * timeElapsed;
+            }
+        }
+        reserve0 = uint112(balance0);
+        reserve1 = uint112(balance1);
+        blockTimestampLast = blockTimestamp;
+        emit Sync(reserve0, reserve1);
+    }
+
+    function swap(uint amount0Out, uint amount1Out, address to, bytes calldata data) external {
+        require(amount0Out > 0 || amount1Out > 0, "Pangolin: INSUFFICIENT_OUTPUT_AMOUNT");
+        require(data.length == 0, "Flash swaps not supported");
+        (uint112 _reserve0, uint112 _reserve1,) = getReserves();
+        require(amount0Out < _reserve0 && amount1Out < _reserve1, "Pangolin: INSUFFICIENT_LIQUIDITY");
+
+        uint balance0;
+        uint balance1;
+        {
+            require(to != token0 && to != token1, "Pangolin: INVALID_TO");
+            if (amount0Out > 0) IERC20(token0).safeTransfer(to, amount0Out);
+            if (amount1Out > 0) IERC20(token1).safeTransfer(to, amount1Out);
+            balance0 = IERC20(token0).balanceOf(address(this));
+            balance1 = IERC20(token1).balanceOf(address(this));
+        }
+        uint amount0In = balance0 > _reserve0 - amount0Out ? balance0 - (_reserve0 - amount0Out) : 0;
+        uint amount1In = balance1 > _reserve1 - amount1Out ? balance1 - (_reserve1 - amount1Out) : 0;
+        require(amount0In > 0 || amount1In > 0, "Pangolin: INSUFFICIENT_INPUT_AMOUNT");
+        {
+            uint balance0Adjusted = balance0 * 1000 - amount0In * 3;
+            uint balance1Adjusted = balance1 * 1000 - amount1In * 3;
+            require(balance0Adjusted * balance1Adjusted >= uint(_reserve0) * _reserve1 * 1000**2, "Pangolin: K");
+        }
+
+        _update(balance0, balance1, _reserve0, _reserve1);
+        emit Swap(msg.sender, amount0In, amount1In, amount0Out, amount1Out, to);
+    }
+
+    function skim(address to) external {
+        IERC20(token0).safeTransfer(to, IERC20(token0).balanceOf(address(this)) - reserve0);
+        IERC20(token1).safeTransfer(to, IERC20(token1).balanceOf(address(this)) - reserve1);
+    }
+
+    function sync() external {
+        _update(IERC20(token0).balanceOf(address(this)), IERC20(token1).balanceOf(address(this)), reserve0, reserve1);
+    }
+
+}
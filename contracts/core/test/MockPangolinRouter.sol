@@ -0,0 +1,116 @@
+//SPDX-License-Identifier: GPL-3.0
+pragma solidity ^0.8.0;
+
+import "./MockPangolinFactory.sol";
+
+// Quote and token-to-token swap functions of PangolinRouter/PangolinLibrary over the
+// mock factory pairs
+contract MockPangolinRouter {
+    using SafeERC20 for IERC20;
+
+    address public immutable factory;
+    address public immutable WAVAX;
+
+    constructor(address _factory, address _WAVAX) {
+        factory = _factory;
+        WAVAX = _WAVAX;
+    }
+
+    modifier ensure(uint deadline) {
+        require(deadline >= block.timestamp, "PangolinRouter: EXPIRED");
+        _;
+    }
+
+    function _pairFor(address tokenA, address tokenB) private view returns (address pair) {
+        pair = MockPangolinFactory(factory).getPair(tokenA, tokenB);
+        require(pair != address(0), "PangolinLibrary: PAIR_NOT_FOUND");
+    }
+
+    function getReserves(address tokenA, address tokenB) public view returns (uint reserveA, uint reserveB) {
+        address pair = _pairFor(tokenA, tokenB);
+        (uint reserve0, uint reserve1,) = MockPangolinPair(pair).getReserves();
+        (reserveA, reserveB) = tokenA == MockPangolinPair(pair).token0() ? (reserve0, reserve1) : (reserve1, reserve0);
+    }
+
+    function quote(uint amountA, uint reserveA, uint reserveB) public pure returns (uint amountB) {
+        require(amountA > 0, "PangolinLibrary: INSUFFICIENT_AMOUNT");
+        require(reserveA > 0 && reserveB > 0, "PangolinLibrary: INSUFFICIENT_LIQUIDITY");
+        amountB = amountA * reserveB / reserveA;
+    }
+
+    function getAmountOut(uint amountIn, uint reserveIn, uint reserveOut) public pure returns (uint amountOut) {
+        require(amountIn > 0, "PangolinLibrary: INSUFFICIENT_INPUT_AMOUNT");
+        require(reserveIn > 0 && reserveOut > 0, "PangolinLibrary: INSUFFICIENT_LIQUIDITY");
+        uint amountInWithFee = amountIn * 997;
+        uint numerator = amountInWithFee * reserveOut;
+        uint denominator = reserveIn * 1000 + amountInWithFee;
+        amountOut = numerator / denominator;
+    }
+
+    function getAmountIn(uint amountOut, uint reserveIn, uint reserveOut) public pure returns (uint amountIn) {
+        require(amountOut > 0, "PangolinLibrary: INSUFFICIENT_OUTPUT_AMOUNT");
+        require(reserveIn > 0 && reserveOut > 0, "PangolinLibrary: INSUFFICIENT_LIQUIDITY");
+        uint numerator = reserveIn * amountOut * 1000;
+        uint denominator = (reserveOut - amountOut) * 997;
+        amountIn = numerator / denominator + 1;
+    }
+
+    function getAmountsOut(uint amountIn, address[] memory path) public view returns (uint[] memory amounts) {
+        require(path.length >= 2, "PangolinLibrary: INVALID_PATH");
+        amounts = new uint[](path.length);
+        amounts[0] = amountIn;
+        for (uint i; i < path.length - 1; i++) {
+            (uint reserveIn, uint reserveOut) = getReserves(path[i], path[i + 1]);
+            amounts[i + 1] = getAmountOut(amounts[i], reserveIn, reserveOut);
+        }
+    }
+
+    function getAmountsIn(uint amountOut, address[] memory path) public view returns (uint[] memory amounts) {
+        require(path.length >= 2, "PangolinLibrary: INVALID_PATH");
+        amounts = new uint[](path.length);
+        amounts[amounts.length - 1] = amountOut;
+        for (uint i = path.length - 1; i > 0; i--) {
+            (uint reserveIn, uint reserveOut) = getReserves(path[i - 1], path[i]);
+            amounts[i - 1] = getAmountIn(amounts[i], reserveIn, reserveOut);
+        }
+    }
+
+    // requires the initial amount to have already been sent to the first pair
+    function _swap(uint[] memory amounts, address[] memory path, address _to) private {
+        for (uint i; i < path.length - 1; i++) {
+            (address input, address output) = (path[i], path[i + 1]);
+            MockPangolinPair pair = MockPangolinPair(_pairFor(input, output));
+            uint amountOut = amounts[i + 1];
+            (uint amount0Out, uint amount1Out) = input == pair.token0() ? (uint(0), amountOut) : (amountOut, uint(0));
+            address to = i < path.length - 2 ? _pairFor(output, path[i + 2]) : _to;
+            pair.swap(amount0Out, amount1Out, to, new bytes(0));
+        }
+    }
+
+    function swapExactTokensForTokens(
+        uint amountIn,
+        uint amountOutMin,
+        address[] calldata path,
+        address to,
+        uint deadline
+    ) external ensure(deadline) returns (uint[] memory amounts) {
+        amounts = getAmountsOut(amountIn, path);
+        require(amounts[amounts.length - 1] >= amountOutMin, "PangolinRouter: INSUFFICIENT_OUTPUT_AMOUNT");
+        IERC20(path[0]).safeTransferFrom(msg.sender, _pairFor(path[0], path[1]), amounts[0]);
+        _swap(amounts, path, to);
+    }
+
+    function swapTokensForExactTokens(
+        uint amountOut,
+        uint amountInMax,
+        address[] calldata path,
+        address to,
+        uint deadline
+    ) external ensure(deadline) returns (uint[] memory amounts) {
+        amounts = getAmountsIn(amountOut, path);
+        require(amounts[0] <= amountInMax, "PangolinRouter: EXCESSIVE_INPUT_AMOUNT");
+        IERC20(path[0]).safeTransferFrom(msg.sender, _pairFor(path[0], path[1]), amounts[0]);
+        _swap(amounts, path, to);
+    }
+
+}
@@ -0,0 +1,87 @@
+//SPDX-License-Identifier: GPL-3.0
+pragma solidity ^0.8.0;
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/extensions/draft-IERC20Permit.sol";
+import "../../interfaces/IImmutableVault.sol";
+
+// Runs deposits and withdrawals across many vaults in one transaction, all of them or
+// none. Assets and shares are pulled from the caller, so the batcher needs a single
+// allowance per token instead of one per vault, and EIP-2612 permits can grant those
+// allowances in the same transaction
+contract VaultBatcher {
+    using SafeERC20 for IERC20;
+
+    enum Action { Deposit, Withdraw }
+
+    struct Operation {
+        address vault;
+        Action action;
+        uint256 amount;
+        address to;
+    }
+
+    struct Permit {
+        address token;
+        uint256 value;
+        uint256 deadline;
+        uint8 v;
+        bytes32 r;
+        bytes32 s;
+    }
+
+    function execute(Operation[] calldata operations) external {
+        _execute(operations);
+    }
+
+    function executeWithPermits(Permit[] calldata permits, Operation[] calldata operations) external {
+        for (uint i; i < permits.length; i++) {
+            Permit calldata p = permits[i];
+            // a permit already submitted by someone else leaves the allowance in place,
+            // pulling the tokens fails anyway if it's missing
+            try IERC20Permit(p.token).permit(msg.sender, address(this), p.value, p.deadline, p.v, p.r, p.s) {
+            } catch {
+            }
+        }
+        _execute(operations);
+    }
+
+    function _execute(Operation[] calldata operations) private {
+        for (uint i; i < operations.length; i++) {
+            Operation calldata op = operations[i];
+            if (op.action == Action.Deposit) {
+                _deposit(op.vault, op.amount, op.to);
+            } else {
+                _withdraw(op.vault, op.amount, op.to);
+            }
+        }
+    }
+
+    function _deposit(address vault, uint256 amount, address to) private {
+        uint length = IImmutableVault(vault).assetLength();
+        for (uint i; i < length; i++) {
+            address asset = IImmutableVault(vault).assets(i);
+            uint assetAmount = IImmutableVault(vault).weights(i) * amount;
+            IERC20(asset).safeTransferFrom(msg.sender, address(this), assetAmount);
+            _approve(asset, vault, assetAmount);
+        }
+        IImmutableVault(vault).depositTo(to, amount);
+    }
+
+    function _withdraw(address vault, uint256 amount, address to) private {
+        IERC20(vault).safeTransferFrom(msg.sender, address(this), amount);
+        IImmutableVault(vault).withdrawTo(to, amount);
+    }
+
+    function _approve(address token, address spender, uint amount) private {
+        uint allowance = IERC20(token).allowance(address(this), spender);
+        if (allowance < amount) {
+            if (allowance > 0) {
+                IERC20(token).safeApprove(spender, 0);
+            }
+            IERC20(token).safeApprove(spender, type(uint).max);
+        }
+    }
+
+}
@@ -0,0 +1,156 @@
+//SPDX-License-Identifier: GPL-3.0
+pragma solidity ^0.8.0;
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import "../../interfaces/IImmutableVault.sol";
+import "../../interfaces/Pangolin/IPangolinRouter.sol";
+import "../../interfaces/Pangolin/IWAVAX.sol";
+
+// Single-token entry to and exit from a vault. zapIn swaps one input token (or AVAX)
+// into the exact weights[i] * shares of every asset through Pangolin and deposits
+// them in the same transaction, the unspent input is refunded. zapOut withdraws the
+// shares and swaps every asset into the vault's trackingToken.
+// paths[i] is the Pangolin path between the input/output token and assets(i), left
+// empty when they are the same token. Plans are computed off-chain by scripts/zap.py
+contract VaultZap {
+    using SafeERC20 for IERC20;
+
+    IPangolinRouter public immutable router;
+    address public immutable WAVAX;
+
+    constructor(address _router) {
+        router = IPangolinRouter(_router);
+        WAVAX = IPangolinRouter(_router).WAVAX();
+    }
+
+    receive() external payable {
+        require(msg.sender == WAVAX, "VaultZap: ONLY_WAVAX");
+    }
+
+    modifier ensure(uint deadline) {
+        require(deadline >= block.timestamp, "VaultZap: EXPIRED");
+        _;
+    }
+
+    function zapIn(
+        address vault,
+        address tokenIn,
+        uint amountInMax,
+        uint shares,
+        address[][] calldata paths,
+        address to,
+        uint deadline
+    ) external ensure(deadline) returns (uint amountIn) {
+        IERC20(tokenIn).safeTransferFrom(msg.sender, address(this), amountInMax);
+        amountIn = _buyAssets(vault, tokenIn, amountInMax, shares, paths, deadline);
+        IImmutableVault(vault).depositTo(to, shares);
+        if (amountIn < amountInMax) {
+            IERC20(tokenIn).safeTransfer(msg.sender, amountInMax - amountIn);
+        }
+    }
+
+    function zapInAVAX(
+        address vault,
+        uint shares,
+        address[][] calldata paths,
+        address to,
+        uint deadline
+    ) external payable ensure(deadline) returns (uint amountIn) {
+        IWAVAX(WAVAX).deposit{value: msg.value}();
+        amountIn = _buyAssets(vault, WAVAX, msg.value, shares, paths, deadline);
+        IImmutableVault(vault).depositTo(to, shares);
+        if (amountIn < msg.value) {
+            IWAVAX(WAVAX).withdraw(msg.value - amountIn);
+            (bool success,) = msg.sender.call{value: msg.value - amountIn}("");
+            require(success, "VaultZap: AVAX_TRANSFER_FAILED");
+        }
+    }
+
+    function zapOut(
+        address vault,
+        uint shares,
+        address[][] calldata paths,
+        uint amountOutMin,
+        address to,
+        uint deadline
+    ) external ensure(deadline) returns (uint amountOut) {
+        address tokenOut = IImmutableVault(vault).trackingToken();
+        require(paths.length == IImmutableVault(vault).assetLength(), "VaultZap: INVALID_PATHS");
+        IERC20(vault).safeTransferFrom(msg.sender, address(this), shares);
+        IImmutableVault(vault).withdrawTo(address(this), shares);
+        for (uint i; i < paths.length; i++) {
+            amountOut += _sellAsset(IImmutableVault(vault).assets(i), tokenOut, paths[i], to, deadline);
+        }
+        require(amountOut >= amountOutMin, "VaultZap: INSUFFICIENT_OUTPUT_AMOUNT");
+    }
+
+    function _buyAssets(
+        address vault,
+        address tokenIn,
+        uint amountInMax,
+        uint shares,
+        address[][] calldata paths,
+        uint deadline
+    ) private returns (uint amountIn) {
+        require(paths.length == IImmutableVault(vault).assetLength(), "VaultZap: INVALID_PATHS");
+        _approve(tokenIn, address(router), amountInMax);
+        for (uint i; i < paths.length; i++) {
+            address asset = IImmutableVault(vault).assets(i);
+            uint assetAmount = IImmutableVault(vault).weights(i) * shares;
+            if (asset == tokenIn) {
+                amountIn += assetAmount;
+            } else {
+                amountIn += _buyAsset(tokenIn, asset, assetAmount, amountInMax - amountIn, paths[i], deadline);
+            }
+            require(amountIn <= amountInMax, "VaultZap: EXCESSIVE_INPUT_AMOUNT");
+            _approve(asset, vault, assetAmount);
+        }
+    }
+
+    function _buyAsset(
+        address tokenIn,
+        address asset,
+        uint assetAmount,
+        uint amountInMax,
+        address[] calldata path,
+        uint deadline
+    ) private returns (uint amountIn) {
+        _checkPath(path, tokenIn, asset);
+        amountIn = router.swapTokensForExactTokens(assetAmount, amountInMax, path, address(this), deadline)[0];
+    }
+
+    // the withdrawn amount is the whole balance, the zap holds nothing between calls
+    function _sellAsset(
+        address asset,
+        address tokenOut,
+        address[] calldata path,
+        address to,
+        uint deadline
+    ) private returns (uint amountOut) {
+        uint balance = IERC20(asset).balanceOf(address(this));
+        if (asset == tokenOut) {
+            IERC20(asset).safeTransfer(to, balance);
+            return balance;
+        }
+        _checkPath(path, asset, tokenOut);
+        _approve(asset, address(router), balance);
+        uint[] memory amounts = router.swapExactTokensForTokens(balance, 0, path, to, deadline);
+        amountOut = amounts[amounts.length - 1];
+    }
+
+    function _checkPath(address[] calldata path, address from, address to) private pure {
+        require(path.length >= 2 && path[0] == from && path[path.length - 1] == to, "VaultZap: INVALID_PATH");
+    }
+
+    function _approve(address token, address spender, uint amount) private {
+        uint allowance = IERC20(token).allowance(address(this), spender);
+        if (allowance < amount) {
+            if (allowance > 0) {
+                IERC20(token).safeApprove(spender, 0);
+            }
+            IERC20(token).safeApprove(spender, type(uint).max);
+        }
+    }
+
+}
@@ -0,0 +1,14 @@
+pragma solidity >=0.8.0;
+
+interface IImmutableVault {
+    function assets(uint256 i) external view returns (address);
+    function weights(uint256 i) external view returns (uint256);
+    function reserves(uint256 i) external view returns (uint256);
+    function trackingToken() external view returns (address);
+    function assetLength() external view returns (uint256);
+
+    function deposit(uint256 amount) external;
+    function depositTo(address toAccount, uint256 amount) external;
+    function withdraw(uint256 amount) external;
+    function withdrawTo(address toAccount, uint256 amount) external;
+}
@@ -0,0 +1,85 @@
+"""Gas per operation of VaultBatcher as the batch grows, against one transaction per
+deposit or withdraw.
+
+Every vault holds the same two fresh `MockERC20` tokens with different weights. The
+approvals are made up front and not counted: the batcher needs one per token (or a
+permit), the one-by-one flow one per token and vault.
+
+brownie run benchmarks/batch_gas
+"""
+
+from typing import Dict, Sequence
+
+from brownie import ImmutableVault, VaultBatcher, accounts
+from brownie.network.account import Account
+
+from scripts.vault_batcher import deposit_op, withdraw_op
+
+from .gas_scaling import deploy_tokens
+
+BATCH_SIZES = (1, 2, 4, 8, 16, 32)
+DEPOSIT_AMOUNT = 10**6
+MAX_APPROVAL = 2**256 - 1
+
+# operation -> batch size -> gas per operation, size 0 is one transaction per operation
+BatchReport = Dict[str, Dict[int, int]]
+
+
+def measure_batch_gas(
+    deployer: Account, account: Account, batch_sizes: Sequence[int] = BATCH_SIZES
+) -> BatchReport:
+    tokens = deploy_tokens(deployer, 2)
+    batcher = VaultBatcher.deploy({"from": deployer})
+    # every batch deposits into fresh vaults, like the single deposit it's compared to
+    count = sum(batch_sizes) + 1
+    vaults = [
+        ImmutableVault.deploy(
+            [t.address for t in tokens],
+            [i + 1, 2 * i + 1],
+            tokens[0],
+            {"from": deployer},
+        )
+        for i in range(count)
+    ]
+    single = vaults.pop()
+    for token in tokens:
+        token.mint(account, 2 * count**2 * DEPOSIT_AMOUNT, {"from": deployer})
+        token.approve(batcher, MAX_APPROVAL, {"from": account})
+        token.approve(single, MAX_APPROVAL, {"from": account})
+    for vault in vaults:
+        vault.approve(batcher, MAX_APPROVAL, {"from": account})
+
+    report: BatchReport = {
+        "deposit": {0: single.deposit(DEPOSIT_AMOUNT, {"from": account}).gas_used},
+        "withdraw": {
+            0: single.withdraw(DEPOSIT_AMOUNT // 2, {"from": account}).gas_used
+        },
+    }
+    for size in batch_sizes:
+        batch, vaults = vaults[:size], vaults[size:]
+        tx = batcher.execute(
+            [deposit_op(v, DEPOSIT_AMOUNT, account) for v in batch], {"from": account}
+        )
+        report["deposit"][size] = tx.gas_used // size
+        tx = batcher.execute(
+            [withdraw_op(v, DEPOSIT_AMOUNT // 2, account) for v in batch],
+            {"from": account},
+        )
+        report["withdraw"][size] = tx.gas_used // size
+    return report
+
+
+def print_report(report: BatchReport):
+    for op, by_size in report.items():
+        single = by_size[0]
+        print(f"{op:>8}    one tx each: {single:>8} gas")
+        for size, gas in by_size.items():
+            if size:
+                print(
+                    f"{op:>8} batch of {size:>3}: {gas:>8} gas/op "
+                    f"({(gas - single) / single:+.1%})"
+                )
+
+
+def main():
+    print_report(measure_batch_gas(accounts[0], accounts[1]))
@@ -0,0 +1,47 @@
+"""Gas of the createVault duplicate-asset check from 2 to 64 assets, linear hash set
+against the nested loop it replaced.
+
+    brownie run benchmarks/duplicate_check_gas
+"""
+
+import random
+from typing import Dict, List, Sequence
+
+from brownie import AssetCheckHarness, accounts
+from brownie.network.account import Account
+from eth_utils import to_checksum_address
+
+ASSET_COUNTS = (2, 4, 8, 16, 32, 64)
+
+
+def random_addresses(count: int, seed: int = 0) -> List[str]:
+    """`count` distinct-looking addresses, the same ones for the same seed"""
+    rng = random.Random(seed)
+    return [
+        to_checksum_address(rng.getrandbits(160).to_bytes(20, "big"))
+        for _ in range(count)
+    ]
+
+
+def measure_duplicate_check(
+    deployer: Account, asset_counts: Sequence[int] = ASSET_COUNTS
+) -> Dict[str, Dict[int, int]]:
+    """Gas of checking a basket without duplicates, the worst case of both checks"""
+    harness = AssetCheckHarness.deploy({"from": deployer})
+    curve: Dict[str, Dict[int, int]] = {"linear": {}, "quadratic": {}}
+    for count in asset_counts:
+        addresses = random_addresses(count)
+        curve["linear"][count] = harness.checkAssets.estimate_gas(addresses)
+        curve["quadratic"][count] = harness.checkAssetsQuadratic.estimate_gas(addresses)
+    return curve
+
+
+def main():
+    curve = measure_duplicate_check(accounts[0])
+    counts = sorted(curve["linear"])
+    print(f"{'assets':>10}" + "".join(f"{c:>9}" for c in counts))
+    for name, gas in curve.items():
+        print(f"{name:>10}" + "".join(f"{gas[c]:>9}" for c in counts))
+    base = curve["linear"][counts[0]]
+    per_asset = [(curve["linear"][c] - base) / (c - counts[0]) for c in counts[1:]]
+    print("linear gas per extra asset: " + ", ".join(f"{g:.0f}" for g in per_asset))
@@ -0,0 +1,57 @@
+"""Times the test suite against the avalanche mainnet fork and the local stand-in.
+
+Each mode runs `brownie test` in a subprocess so the forked node starts cold the
+same way it does in CI:
+
+    python -m scripts.benchmarks.fork_vs_local [--runs 3] [tests/unit/Vault]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Sequence
+
+MODES: Dict[str, Sequence[str]] = {
+    "fork": ("--network", "avalanche-main-fork"),
+    "local": ("--network", "development"),
+}
+
+
+def time_run(paths: Sequence[str], network_args: Sequence[str]) -> float:
+    cmd = ["brownie", "test", *paths, *network_args, "-q"]
+    start = time.perf_counter()
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} failed:\n{result.stderr.decode()}")
+    return elapsed
+
+
+def main(argv: Sequence[str] = ()) -> Dict[str, List[float]]:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="*", default=["tests"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    args = parser.parse_args(argv)
+
+    timings: Dict[str, List[float]] = {}
+    for mode in args.modes:
+        timings[mode] = [time_run(args.paths, MODES[mode]) for _ in range(args.runs)]
+        print(
+            f"{mode:>6}: first {timings[mode][0]:7.2f}s"
+            f"  median {statistics.median(timings[mode]):7.2f}s"
+        )
+    if "fork" in timings and "local" in timings:
+        speedup = statistics.median(timings["fork"]) / statistics.median(
+            timings["local"]
+        )
+        print(f"local is {speedup:.1f}x faster than fork")
+    print(json.dumps(timings))
+    return timings
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
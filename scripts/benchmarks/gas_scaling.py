@@ -0,0 +1,197 @@
+"""Gas used by ImmutableVault and VaultFactory as the number of assets grows.
+
+Every operation is measured at each basket size against fresh `MockERC20` tokens,
+so the numbers don't depend on the network the run happens on:
+
+    deploy       ImmutableVault deployment
+    createVault  VaultFactory.createVault
+    deposit      first deposit into the empty vault
+    depositTo    second deposit, to another account
+    withdraw     partial withdraw
+    withdrawTo   partial withdraw to another account
+
+    createVaultClone  VaultCloneFactory.createVault, EIP-1167 clone + initialize
+    depositClone      first deposit into the clone, pays the delegatecall overhead
+
+`tests/gas/test_gas_scaling.py` runs the measurement as part of the suite, writes
+`reports/gas_scaling.json` and fails when an operation uses more gas than the
+checked-in baseline allows, or isn't in the baseline at all. After an intended
+change, refresh the baseline with
+
+    brownie run benchmarks/gas_scaling update_baseline
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from brownie import (
+    ImmutableVault,
+    ImmutableVaultClone,
+    MockERC20,
+    VaultCloneFactory,
+    VaultFactory,
+    accounts,
+)
+from brownie.network.account import Account
+
+ASSET_COUNTS = (2, 4, 8, 16, 32)
+OPERATIONS = (
+    "deploy",
+    "createVault",
+    "deposit",
+    "depositTo",
+    "withdraw",
+    "withdrawTo",
+    "createVaultClone",
+    "depositClone",
+)
+
+BASELINE_PATH = Path(__file__).parent / "gas_baseline.json"
+REPORT_PATH = Path("reports") / "gas_scaling.json"
+# relative gas increase tolerated before a measurement counts as a regression
+DEFAULT_THRESHOLD = 0.02
+
+DEPOSIT_AMOUNT = 10**6
+
+# operation -> number of assets -> gas used
+GasReport = Dict[str, Dict[str, int]]
+
+
+def deploy_tokens(deployer: Account, count: int) -> List:
+    return [
+        MockERC20.deploy(f"Gas Token {i}", f"GAS{i}", 18, {"from": deployer})
+        for i in range(count)
+    ]
+
+
+def measure_vault_ops(
+    vault,
+    tokens: Sequence,
+    weights: Sequence[int],
+    deployer: Account,
+    depositor: Account,
+    receiver: Account,
+) -> Dict[str, int]:
+    """Gas of deposit, depositTo, withdraw and withdrawTo on a fresh `vault`"""
+    for token, weight in zip(tokens, weights):
+        token.mint(depositor, 2 * weight * DEPOSIT_AMOUNT, {"from": deployer})
+        token.approve(vault, 2 * weight * DEPOSIT_AMOUNT, {"from": depositor})
+    return {
+        "deposit": vault.deposit(DEPOSIT_AMOUNT, {"from": depositor}).gas_used,
+        "depositTo": vault.depositTo(
+            receiver, DEPOSIT_AMOUNT, {"from": depositor}
+        ).gas_used,
+        "withdraw": vault.withdraw(DEPOSIT_AMOUNT // 2, {"from": depositor}).gas_used,
+        "withdrawTo": vault.withdrawTo(
+            depositor, DEPOSIT_AMOUNT // 2, {"from": receiver}
+        ).gas_used,
+    }
+
+
+def measure_gas_scaling(
+    deployer: Account,
+    depositor: Account,
+    receiver: Account,
+    asset_counts: Sequence[int] = ASSET_COUNTS,
+) -> GasReport:
+    report: GasReport = {op: {} for op in OPERATIONS}
+    tokens = deploy_tokens(deployer, max(asset_counts))
+    factory = VaultFactory.deploy({"from": deployer})
+    clone_factory = VaultCloneFactory.deploy({"from": deployer})
+    for count in asset_counts:
+        basket = [token.address for token in tokens[:count]]
+        weights = [i + 1 for i in range(count)]
+        tracking_token = basket[0]
+        key = str(count)
+
+        vault = ImmutableVault.deploy(
+            basket, weights, tracking_token, {"from": deployer}
+        )
+        report["deploy"][key] = vault.tx.gas_used
+        tx = factory.createVault(basket, weights, tracking_token, {"from": deployer})
+        report["createVault"][key] = tx.gas_used
+        ops = measure_vault_ops(vault, tokens, weights, deployer, depositor, receiver)
+        for op, gas in ops.items():
+            report[op][key] = gas
+
+        tx = clone_factory.createVault(
+            basket, weights, tracking_token, {"from": deployer}
+        )
+        report["createVaultClone"][key] = tx.gas_used
+        clone = ImmutableVaultClone.at(tx.events["VaultCreated"]["vault"])
+        ops = measure_vault_ops(clone, tokens, weights, deployer, depositor, receiver)
+        report["depositClone"][key] = ops["deposit"]
+    return report
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict:
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def write_report(report: GasReport, path: Path = REPORT_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as fp:
+        json.dump(report, fp, indent=2, sort_keys=True)
+
+
+def find_regressions(report: GasReport, baseline: dict) -> List[str]:
+    """Measurements above the baseline by more than its threshold, and the ones the
+    baseline has no entry for, which can't be checked until it is refreshed
+    """
+    threshold = baseline.get("threshold", DEFAULT_THRESHOLD)
+    regressions = []
+    for op, by_count in report.items():
+        for count, gas in by_count.items():
+            expected = baseline["gas"].get(op, {}).get(count)
+            if expected is None:
+                regressions.append(
+                    f"{op} with {count} assets: {gas} gas, not in the baseline, "
+                    "run `brownie run benchmarks/gas_scaling update_baseline`"
+                )
+            elif gas > expected * (1 + threshold):
+                regressions.append(
+                    f"{op} with {count} assets: {gas} gas, baseline {expected} "
+                    f"(+{(gas - expected) / expected:.1%})"
+                )
+    return regressions
+
+
+def print_report(report: GasReport):
+    counts = sorted({int(c) for by_count in report.values() for c in by_count})
+    print(f"{'assets':>12}" + "".join(f"{c:>10}" for c in counts))
+    for op, by_count in report.items():
+        print(f"{op:>12}" + "".join(f"{by_count.get(str(c), '-'):>10}" for c in counts))
+
+
+def print_clone_comparison(report: GasReport):
+    """Vault creation before (full CREATE2 deploy) and after (clone) and what each
+    clone pays back per deposit through the proxy
+    """
+    for count, full in report["createVault"].items():
+        clone = report["createVaultClone"][count]
+        overhead = report["depositClone"][count] - report["deposit"][count]
+        print(
+            f"{count:>3} assets: createVault {full} -> {clone} "
+            f"({(clone - full) / full:+.1%}), deposit overhead {overhead:+}"
+        )
+
+
+def main():
+    report = measure_gas_scaling(accounts[0], accounts[1], accounts[2])
+    write_report(report)
+    print_report(report)
+    print_clone_comparison(report)
+    regressions = find_regressions(report, load_baseline())
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+
+def update_baseline():
+    report = measure_gas_scaling(accounts[0], accounts[1], accounts[2])
+    baseline = load_baseline()
+    baseline["gas"] = report
+    with open(BASELINE_PATH, "w") as fp:
+        json.dump(baseline, fp, indent=2, sort_keys=True)
+    print_report(report)
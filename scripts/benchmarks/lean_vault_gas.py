@@ -0,0 +1,52 @@
+"""Side-by-side gas of ImmutableVault and LeanImmutableVault.
+
+brownie run benchmarks/lean_vault_gas
+"""
+
+from typing import Dict, Sequence
+
+from brownie import ImmutableVault, LeanImmutableVault, accounts
+from brownie.network.account import Account
+
+from .gas_scaling import ASSET_COUNTS, deploy_tokens, measure_vault_ops
+
+VARIANTS = {"ImmutableVault": ImmutableVault, "LeanImmutableVault": LeanImmutableVault}
+
+# variant -> operation -> number of assets -> gas used
+Comparison = Dict[str, Dict[str, Dict[int, int]]]
+
+
+def compare_vaults(
+    deployer: Account,
+    depositor: Account,
+    receiver: Account,
+    asset_counts: Sequence[int] = ASSET_COUNTS,
+) -> Comparison:
+    tokens = deploy_tokens(deployer, max(asset_counts))
+    comparison: Comparison = {name: {} for name in VARIANTS}
+    for count in asset_counts:
+        basket = [token.address for token in tokens[:count]]
+        weights = [i + 1 for i in range(count)]
+        for name, container in VARIANTS.items():
+            vault = container.deploy(basket, weights, basket[0], {"from": deployer})
+            ops = {"deploy": vault.tx.gas_used}
+            ops.update(
+                measure_vault_ops(vault, tokens, weights, deployer, depositor, receiver)
+            )
+            for op, gas in ops.items():
+                comparison[name].setdefault(op, {})[count] = gas
+    return comparison
+
+
+def print_comparison(comparison: Comparison):
+    base, lean = comparison["ImmutableVault"], comparison["LeanImmutableVault"]
+    for op in base:
+        for count, gas in base[op].items():
+            print(
+                f"{op:>10} {count:>3} assets: {gas:>9} -> {lean[op][count]:>9} "
+                f"({(lean[op][count] - gas) / gas:+.1%})"
+            )
+
+
+def main():
+    print_comparison(compare_vaults(accounts[0], accounts[1], accounts[2]))
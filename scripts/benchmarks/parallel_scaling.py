@@ -0,0 +1,61 @@
+"""Wall time of the test suite on 1 to N cores with pytest-xdist.
+
+Each run is a fresh `brownie test` subprocess. Every xdist worker starts its own
+local node and repeats the session setup (local DEX, funded accounts, session
+vaults), so the speedup levels off once that setup outweighs the tests a worker
+gets:
+
+    python -m scripts.benchmarks.parallel_scaling [--workers 8] [--runs 3] [tests/unit/Vault]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Sequence
+
+
+def time_run(paths: Sequence[str], workers: int, network: str) -> float:
+    cmd = ["brownie", "test", *paths, "--network", network, "-q"]
+    # 0 workers is the plain serial run, without xdist
+    if workers:
+        cmd += ["-n", str(workers)]
+    start = time.perf_counter()
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} failed:\n{result.stderr.decode()}")
+    return elapsed
+
+
+def main(argv: Sequence[str] = ()) -> Dict[int, List[float]]:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="*", default=["tests/unit/Vault"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--network", default="development")
+    args = parser.parse_args(argv)
+
+    timings: Dict[int, List[float]] = {}
+    for workers in range(args.workers + 1):
+        timings[workers] = [
+            time_run(args.paths, workers, args.network) for _ in range(args.runs)
+        ]
+    serial = statistics.median(timings[0])
+    print(f"serial: median {serial:7.2f}s")
+    for workers in range(1, args.workers + 1):
+        median = statistics.median(timings[workers])
+        print(
+            f"{workers:>3} workers: median {median:7.2f}s"
+            f"  speedup {serial / median:5.2f}x"
+            f"  efficiency {serial / median / workers:6.1%}"
+        )
+    print(json.dumps(timings))
+    return timings
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
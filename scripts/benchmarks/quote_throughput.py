@@ -0,0 +1,70 @@
+"""Quotes per second of the exact-integer Pangolin quote engine, against the float
+formula `tests/utils/dex.py` used before and how often that one was wrong.
+
+    python -m scripts.benchmarks.quote_throughput
+"""
+
+import random
+import time
+from math import ceil
+from typing import Callable, Dict, List
+
+from scripts.pangolin_quotes import (
+    PairReserves,
+    add_pair_reserves,
+    get_amount_out,
+    get_amounts_out_batch,
+    quote_batch,
+)
+
+QUOTES = 200_000
+
+
+def float_amount_out(amount_in: int, reserve_in: int, reserve_out: int) -> int:
+    amount_after_fee = amount_in * 997
+    return ceil(amount_after_fee * reserve_out / (reserve_in * 1000 + amount_after_fee))
+
+
+def rate(fn: Callable[[], object], count: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def main() -> Dict[str, float]:
+    rng = random.Random(0)
+    reserve_in, reserve_out = 10**5 * 10**18, 63 * 10**8
+    amounts = [rng.randrange(10**15, 10**22) for _ in range(QUOTES)]
+    tokens = [f"0x{i:040x}" for i in range(4)]
+    reserves: PairReserves = {}
+    for token_a, token_b in zip(tokens, tokens[1:]):
+        add_pair_reserves(reserves, token_a, token_b, 10**24, 10**24 + 10**21)
+    requests = [(amount, tokens) for amount in amounts[: QUOTES // 10]]
+
+    results: Dict[str, float] = {
+        "single": rate(
+            lambda: [get_amount_out(a, reserve_in, reserve_out) for a in amounts],
+            QUOTES,
+        ),
+        "batch": rate(
+            lambda: get_amounts_out_batch(amounts, reserve_in, reserve_out), QUOTES
+        ),
+        "float": rate(
+            lambda: [float_amount_out(a, reserve_in, reserve_out) for a in amounts],
+            QUOTES,
+        ),
+        "3-hop": rate(lambda: quote_batch(requests, reserves), len(requests)),
+    }
+    for name, quotes_per_second in results.items():
+        print(f"{name:>7}: {quotes_per_second:12,.0f} quotes/s")
+    exact: List[int] = get_amounts_out_batch(amounts, reserve_in, reserve_out)
+    wrong = sum(
+        float_amount_out(a, reserve_in, reserve_out) != q
+        for a, q in zip(amounts, exact)
+    )
+    print(f"float quotes off by at least 1 wei: {wrong}/{QUOTES}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Cost of building contract handles and looking up pairs, with and without
+`scripts.contract_registry`, and of parsing the test ABIs the loader now defers.
+
+    brownie run benchmarks/registry_overhead
+"""
+
+import time
+from typing import Callable, Dict
+
+from brownie import MockERC20, MockPangolinFactory, accounts, interface
+
+from scripts.contract_registry import ContractRegistry
+
+CALLS = 1_000
+PAIR_LOOKUPS = 200
+
+
+def per_call(fn: Callable[[], object], count: int) -> float:
+    """Mean seconds per call of `fn`"""
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return (time.perf_counter() - start) / count
+
+
+def abi_parse_time() -> float:
+    """What importing `tests.abis` used to cost, the loader now pays it on first use"""
+    from tests.abis.loader import load_abi
+
+    return per_call(lambda: load_abi.__wrapped__("linkfeed"), 100)
+
+
+def measure() -> Dict[str, float]:
+    deployer = accounts[0]
+    tokens = [
+        MockERC20.deploy(f"Registry {i}", f"REG{i}", 18, {"from": deployer})
+        for i in range(2)
+    ]
+    factory = MockPangolinFactory.deploy({"from": deployer})
+    factory.createPair(tokens[0], tokens[1], {"from": deployer})
+    address = tokens[0].address
+    registry = ContractRegistry()
+
+    def uncached_pair():
+        pair = factory.getPair(tokens[0], tokens[1])
+        return interface.IPangolinPair(pair).token0()
+
+    def cached_pair():
+        return registry.token0(registry.get_pair(factory, tokens[0], tokens[1]))
+
+    return {
+        "interface.IERC20": per_call(lambda: interface.IERC20(address), CALLS),
+        "registry IERC20": per_call(
+            lambda: registry.interface("IERC20", address), CALLS
+        ),
+        "getPair + token0": per_call(uncached_pair, PAIR_LOOKUPS),
+        "memoized pair": per_call(cached_pair, PAIR_LOOKUPS),
+        "parse linkfeed.json": abi_parse_time(),
+    }
+
+
+def main():
+    for name, seconds in measure().items():
+        print(f"{name:>20}: {seconds * 1e6:10.1f} us")
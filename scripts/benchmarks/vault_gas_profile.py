@@ -0,0 +1,64 @@
+"""Where the gas of the vault hot paths goes, per function and source line.
+
+Profiles createVault, deposit, depositTo, withdraw and withdrawTo of a fresh vault
+with `count` assets and writes one collapsed-stack file per operation, ready for
+flamegraph.pl, inferno or speedscope:
+
+    brownie run benchmarks/vault_gas_profile
+    brownie run benchmarks/vault_gas_profile main 8
+    flamegraph.pl reports/gas_profile/deposit_8.folded > deposit.svg
+"""
+
+from pathlib import Path
+from typing import Dict
+
+from brownie import ImmutableVault, VaultFactory, accounts
+from brownie.network.account import Account
+
+from scripts.gas_profiler import GasProfile, profile_transactions
+
+from .gas_scaling import DEPOSIT_AMOUNT, deploy_tokens
+
+REPORT_DIR = Path("reports") / "gas_profile"
+
+
+def profile_vault_ops(
+    deployer: Account, depositor: Account, receiver: Account, count: int = 4
+) -> Dict[str, GasProfile]:
+    tokens = deploy_tokens(deployer, count)
+    basket = [token.address for token in tokens]
+    weights = [i + 1 for i in range(count)]
+    factory = VaultFactory.deploy({"from": deployer})
+    create = factory.createVault(basket, weights, basket[0], {"from": deployer})
+    vault = ImmutableVault.at(create.events["VaultCreated"]["vault"])
+    for token, weight in zip(tokens, weights):
+        token.mint(depositor, 2 * weight * DEPOSIT_AMOUNT, {"from": deployer})
+        token.approve(vault, 2 * weight * DEPOSIT_AMOUNT, {"from": depositor})
+
+    txs = {
+        "createVault": create,
+        "deposit": vault.deposit(DEPOSIT_AMOUNT, {"from": depositor}),
+        "depositTo": vault.depositTo(receiver, DEPOSIT_AMOUNT, {"from": depositor}),
+        "withdraw": vault.withdraw(DEPOSIT_AMOUNT // 2, {"from": depositor}),
+        "withdrawTo": vault.withdrawTo(
+            depositor, DEPOSIT_AMOUNT // 2, {"from": receiver}
+        ),
+    }
+    return {op: profile_transactions(tx) for op, tx in txs.items()}
+
+
+def write_profiles(
+    profiles: Dict[str, GasProfile], count: int, report_dir: Path = REPORT_DIR
+):
+    for op, profile in profiles.items():
+        profile.write_collapsed(report_dir / f"{op}_{count}.folded")
+
+
+def main(count: int = 4):
+    count = int(count)
+    profiles = profile_vault_ops(accounts[0], accounts[1], accounts[2], count)
+    write_profiles(profiles, count)
+    for op, profile in profiles.items():
+        print(f"\n{op} with {count} assets: {profile.gas_used} gas")
+        print("\n".join(profile.function_table(limit=15)))
+        print("\n".join(profile.line_table(limit=10)))
@@ -0,0 +1,39 @@
+"""Throughput and confirmation latency of concurrent vault users on a local node.
+
+    brownie run benchmarks/vault_load
+    brownie run benchmarks/vault_load main 200 25 8
+
+Arguments are the number of users, transactions per user, vaults and pipelined
+transactions per user. Run the node with a block time (e.g. ganache `-b 1`) to see
+how many transactions and how much gas fit in a block instead of one per block.
+"""
+
+import asyncio
+
+from brownie import ImmutableVault, accounts
+
+from scripts.load_test import LoadGenerator, mint_funding, prepare_users
+
+from .gas_scaling import deploy_tokens
+
+
+def main(users: int = 50, txs: int = 20, vaults: int = 4, pipeline: int = 4):
+    users, txs, vaults, pipeline = int(users), int(txs), int(vaults), int(pipeline)
+    deployer = accounts[0]
+    tokens = deploy_tokens(deployer, 2)
+    deployed = [
+        ImmutableVault.deploy(
+            [t.address for t in tokens],
+            [i + 1, 2 * i + 1],
+            tokens[0],
+            {"from": deployer},
+        )
+        for i in range(vaults)
+    ]
+    load_users = prepare_users(
+        deployer, deployed, users, mint_funding(deployer), deposits=txs
+    )
+    generator = LoadGenerator(deployed, load_users, pipeline=pipeline)
+    report = asyncio.run(generator.run(txs_per_user=txs))
+    print(f"{users} users, {vaults} vaults, {pipeline} txs in flight per user")
+    print("\n".join(report.summary()))
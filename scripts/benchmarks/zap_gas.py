@@ -0,0 +1,147 @@
+"""Gas, transactions and price paid by a VaultZap deposit against the per-asset flow
+it replaces: approve the router, swap into every asset in its own transaction,
+approve the vault for every asset and deposit.
+
+Both flows buy the same shares from the same input token. The price paid is the
+input spent over the value of the deposited assets at the pairs' mid prices before
+the first swap, so it includes the swap fees and the price impact.
+
+brownie run benchmarks/zap_gas main <zap> <vault> <token_in> <amount_in> <multicall>
+"""
+
+from fractions import Fraction
+from typing import Dict, NamedTuple
+
+from brownie import (
+    Contract,
+    ImmutableVault,
+    Multicall,
+    VaultZap,
+    accounts,
+    chain,
+    interface,
+)
+from brownie.network.account import Account
+
+from scripts.pangolin_quotes import PairReserves, load_path_reserves
+from scripts.zap import ZapInPlan, plan_vault_zap_in
+
+
+class FlowCost(NamedTuple):
+    transactions: int
+    gas: int
+    amount_in: int
+    # amount_in over the mid-price value of the deposited assets, minus one
+    price_impact: Fraction
+
+
+def _mid_value(plan: ZapInPlan, reserves: PairReserves) -> Fraction:
+    value = Fraction(0)
+    for amount, path in zip(plan.asset_amounts, plan.paths):
+        price = Fraction(1)
+        for token_in, token_out in zip(path, path[1:]):
+            reserve_in, reserve_out = reserves[(token_in.lower(), token_out.lower())]
+            price *= Fraction(reserve_in, reserve_out)
+        value += amount * price
+    return value
+
+
+def _cost(txs, amount_in: int, mid_value: Fraction) -> FlowCost:
+    return FlowCost(
+        len(txs), sum(tx.gas_used for tx in txs), amount_in, amount_in / mid_value - 1
+    )
+
+
+def per_asset_flow(
+    router: Contract, vault: Contract, token_in: str, plan: ZapInPlan, account: Account
+) -> list:
+    deadline = chain.time() + 600
+    token = interface.IERC20(token_in)
+    txs = [token.approve(router, plan.amount_in_max, {"from": account})]
+    remaining = plan.amount_in_max
+    for amount, path in zip(plan.asset_amounts, plan.paths):
+        if path:
+            tx = router.swapTokensForExactTokens(
+                amount, remaining, path, account, deadline, {"from": account}
+            )
+            remaining -= tx.return_value[0]
+            txs.append(tx)
+    for i, amount in enumerate(plan.asset_amounts):
+        asset = interface.IERC20(vault.assets(i))
+        txs.append(asset.approve(vault, amount, {"from": account}))
+    txs.append(vault.deposit(plan.shares, {"from": account}))
+    return txs
+
+
+def zap_flow(
+    zap: Contract, vault: Contract, token_in: str, plan: ZapInPlan, account: Account
+) -> list:
+    token = interface.IERC20(token_in)
+    return [
+        token.approve(zap, plan.amount_in_max, {"from": account}),
+        zap.zapIn(
+            vault,
+            token_in,
+            plan.amount_in_max,
+            plan.shares,
+            plan.paths,
+            account,
+            chain.time() + 600,
+            {"from": account},
+        ),
+    ]
+
+
+def compare_zap(
+    zap: Contract,
+    vault: Contract,
+    token_in: str,
+    amount_in: int,
+    multicall: Contract,
+    account: Account,
+) -> Dict[str, FlowCost]:
+    """Runs the per-asset flow, then the zap, each planned on the state it starts from"""
+    router = interface.IPangolinRouter(zap.router())
+    factory = interface.IPangolinFactory(router.factory())
+    wavax = zap.WAVAX()
+    flows = (("per-asset", per_asset_flow, router), ("zap", zap_flow, zap))
+    token = interface.IERC20(token_in)
+    costs = {}
+    for name, flow, contract in flows:
+        plan = plan_vault_zap_in(vault, token_in, amount_in, factory, multicall, wavax)
+        reserves = load_path_reserves(factory, multicall, [p for p in plan.paths if p])
+        before = token.balanceOf(account)
+        txs = flow(contract, vault, token_in, plan, account)
+        spent = before - token.balanceOf(account)
+        costs[name] = _cost(txs, spent, _mid_value(plan, reserves))
+    return costs
+
+
+def print_comparison(costs: Dict[str, FlowCost]):
+    for name, cost in costs.items():
+        print(
+            f"{name:>10}: {cost.transactions:>2} txs, {cost.gas:>8} gas, "
+            f"spent {cost.amount_in}, {float(cost.price_impact):+.3%} over mid price"
+        )
+    base, zap = costs["per-asset"], costs["zap"]
+    print(
+        f"zap saves {base.gas - zap.gas} gas ({(zap.gas - base.gas) / base.gas:+.1%})"
+    )
+
+
+def main(
+    zap_address: str,
+    vault_address: str,
+    token_in: str,
+    amount_in: int,
+    multicall_address: str,
+):
+    costs = compare_zap(
+        VaultZap.at(zap_address),
+        ImmutableVault.at(vault_address),
+        token_in,
+        int(amount_in),
+        Multicall.at(multicall_address),
+        accounts[0],
+    )
+    print_comparison(costs)
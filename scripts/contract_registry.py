@@ -0,0 +1,92 @@
+"""Cached contract handles, selector tables and Pangolin pair lookups.
+
+    token = REGISTRY.interface("IERC20", address)
+    pair = REGISTRY.get_pair(factory, token_a, token_b)
+
+Building a brownie `Contract` parses its ABI and builds its method objects, which
+costs more than most of the calls made through it. The registry builds one handle
+per chain, address and ABI and hands out the same object afterwards; the ABI is
+identified by a fingerprint computed once per ABI list, with its selector table
+(`0x` selector -> signature) built at the same time.
+
+Pangolin pairs never move once created, so `getPair` results other than the zero
+address and every pair's `token0` are memoized per chain and factory. Call
+`clear()` after creating pairs on a chain that was reverted to before them.
+"""
+
+import json
+from typing import Dict, List, Tuple
+
+from brownie import Contract, chain, interface
+from brownie.convert.utils import build_function_selector, build_function_signature
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+class ContractRegistry:
+    def __init__(self):
+        # id(abi) -> (abi, fingerprint), the abi is kept so its id isn't reused
+        self._fingerprints: Dict[int, Tuple[List[dict], str]] = {}
+        # fingerprint -> selector -> signature
+        self.selector_tables: Dict[str, Dict[str, str]] = {}
+        # (chain id, address, fingerprint) -> handle
+        self.handles: Dict[Tuple[int, str, str], Contract] = {}
+        # (chain id, factory, token, token) -> pair, tokens sorted
+        self.pairs: Dict[Tuple[int, str, str, str], str] = {}
+        # (chain id, pair) -> token0
+        self.token0s: Dict[Tuple[int, str], str] = {}
+
+    def clear(self):
+        self.handles.clear()
+        self.pairs.clear()
+        self.token0s.clear()
+
+    def fingerprint(self, abi: List[dict]) -> str:
+        cached = self._fingerprints.get(id(abi))
+        if cached is not None:
+            return cached[1]
+        fingerprint = json.dumps(abi, sort_keys=True)
+        self._fingerprints[id(abi)] = (abi, fingerprint)
+        if fingerprint not in self.selector_tables:
+            self.selector_tables[fingerprint] = {
+                build_function_selector(item): build_function_signature(item)
+                for item in abi
+                if item.get("type") == "function"
+            }
+        return fingerprint
+
+    def selectors(self, abi: List[dict]) -> Dict[str, str]:
+        return self.selector_tables[self.fingerprint(abi)]
+
+    def contract(self, name: str, address: str, abi: List[dict]) -> Contract:
+        key = (chain.id, str(address).lower(), self.fingerprint(abi))
+        handle = self.handles.get(key)
+        if handle is None:
+            handle = self.handles[key] = Contract.from_abi(name, str(address), abi)
+        return handle
+
+    def interface(self, name: str, address: str) -> Contract:
+        """Same as `interface.<name>(address)`, built once"""
+        return self.contract(name, address, getattr(interface, name).abi)
+
+    def get_pair(self, factory: Contract, token_a: str, token_b: str) -> str:
+        """`factory.getPair`, ZERO_ADDRESS when the pair doesn't exist (yet)"""
+        low, high = sorted((str(token_a).lower(), str(token_b).lower()))
+        key = (chain.id, factory.address.lower(), low, high)
+        pair = self.pairs.get(key)
+        if pair is None:
+            pair = factory.getPair(token_a, token_b)
+            if pair == ZERO_ADDRESS:
+                return pair
+            self.pairs[key] = pair
+        return pair
+
+    def token0(self, pair: str) -> str:
+        key = (chain.id, str(pair).lower())
+        token0 = self.token0s.get(key)
+        if token0 is None:
+            token0 = self.token0s[key] = self.interface("IPangolinPair", pair).token0()
+        return token0
+
+
+REGISTRY = ContractRegistry()
@@ -0,0 +1,184 @@
+"""Attributes the gas of transactions to contracts, functions and source lines from
+their debug traces.
+
+    with profiling() as profile:
+        vault.deposit(amount, {"from": account})
+    profile.write_collapsed("reports/deposit.folded")
+    print("\\n".join(profile.function_table()))
+
+The transactions are replayed by the node with `debug_traceTransaction` and
+brownie maps every opcode to its contract, function and source offset. Each
+opcode is charged to the innermost frame of the call stack it runs in, internal
+calls (`_deposit`, `_mint`, `SafeERC20.safeTransferFrom`) included. Calls to
+other contracts are only charged for their own overhead; the callee's opcodes are
+charged to the callee's frames. The gas the trace doesn't cover (intrinsic cost,
+calldata, refunds) is kept under `OVERHEAD_FRAME` so the profile adds up to
+`gas_used`.
+
+`write_collapsed` emits the collapsed-stack format of flamegraph.pl, inferno and
+speedscope, one `frame;frame;frame gas` line per distinct stack.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from brownie import history
+from brownie.network.transaction import TransactionReceipt
+
+CALL_OPS = {"CALL", "CALLCODE", "DELEGATECALL", "STATICCALL", "CREATE", "CREATE2"}
+OVERHEAD_FRAME = "[intrinsic and refunds]"
+UNKNOWN_FRAME = "<unknown>"
+
+# (source file, line)
+SourceLine = Tuple[str, int]
+
+
+class _SourceLines:
+    """Maps source offsets to line numbers, reading every file once"""
+
+    def __init__(self):
+        self.line_starts: Dict[str, Optional[List[int]]] = {}
+
+    def _load(self, filename: str) -> Optional[List[int]]:
+        for path in (
+            Path(filename),
+            Path.home() / ".brownie" / "packages" / filename,
+        ):
+            if path.is_file():
+                text = path.read_text()
+                return [0] + [i + 1 for i, c in enumerate(text) if c == "\n"]
+        return None
+
+    def line(self, filename: str, offset: int) -> int:
+        """1-based line of `offset`, 0 when the file can't be found"""
+        if filename not in self.line_starts:
+            self.line_starts[filename] = self._load(filename)
+        starts = self.line_starts[filename]
+        if starts is None:
+            return 0
+        low, high = 0, len(starts)
+        while high - low > 1:
+            middle = (low + high) // 2
+            if starts[middle] <= offset:
+                low = middle
+            else:
+                high = middle
+        return low + 1
+
+
+def opcode_costs(trace: List[dict]) -> List[int]:
+    """Gas charged to every step of `trace`. Call opcodes report the gas forwarded
+    to the callee in `gasCost`, they are charged what the caller lost over the call
+    minus what the callee's own steps used.
+    """
+    costs = [step["gasCost"] for step in trace]
+    calls = [i for i, step in enumerate(trace) if step["op"] in CALL_OPS]
+    # inner calls come later in the trace, fix them before the calls around them
+    for i in reversed(calls):
+        depth = trace[i]["depth"]
+        j = i + 1
+        while j < len(trace) and trace[j]["depth"] > depth:
+            j += 1
+        if j == len(trace):
+            continue
+        costs[i] = trace[i]["gas"] - trace[j]["gas"] - sum(costs[i + 1 : j])
+    return costs
+
+
+class GasProfile:
+    def __init__(self):
+        self.transactions = 0
+        self.gas_used = 0
+        # "frame;frame;frame" -> gas
+        self.stacks: Counter = Counter()
+        # function -> gas spent in its own opcodes
+        self.self_gas: Counter = Counter()
+        # function -> gas spent while it is on the stack
+        self.inclusive_gas: Counter = Counter()
+        self.contract_gas: Counter = Counter()
+        self.line_gas: Counter = Counter()
+        self._lines = _SourceLines()
+
+    def add(self, tx: TransactionReceipt):
+        trace = tx.trace
+        costs = opcode_costs(trace)
+        self.transactions += 1
+        self.gas_used += tx.gas_used
+
+        # [(depth, jumpDepth, function)], innermost last
+        stack: List[Tuple[int, int, str]] = []
+        for step, cost in zip(trace, costs):
+            key = (step["depth"], step["jumpDepth"])
+            fn = step["fn"] or UNKNOWN_FRAME
+            while stack and stack[-1][:2] > key:
+                stack.pop()
+            if stack and stack[-1][:2] == key:
+                stack[-1] = (*key, fn)
+            else:
+                stack.append((*key, fn))
+
+            frames = [frame[2] for frame in stack]
+            self.stacks[";".join(frames)] += cost
+            self.self_gas[fn] += cost
+            for frame in set(frames):
+                self.inclusive_gas[frame] += cost
+            self.contract_gas[step["contractName"] or UNKNOWN_FRAME] += cost
+            source = step["source"]
+            if source:
+                filename = source["filename"]
+                line = self._lines.line(filename, source["offset"][0])
+                self.line_gas[(filename, line)] += cost
+
+        overhead = tx.gas_used - sum(costs)
+        self.stacks[OVERHEAD_FRAME] += overhead
+        self.self_gas[OVERHEAD_FRAME] += overhead
+        self.inclusive_gas[OVERHEAD_FRAME] += overhead
+
+    def write_collapsed(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as fp:
+            for stack, gas in sorted(self.stacks.items()):
+                # refunds can leave the overhead negative, flamegraphs can't draw it
+                if gas > 0:
+                    fp.write(f"{stack} {gas}\n")
+
+    def function_table(self, limit: Optional[int] = None) -> List[str]:
+        """Functions by gas spent in their own opcodes, with the gas of everything
+        they call and both as a share of the profiled `gas_used`
+        """
+        total = self.gas_used or 1
+        lines = [f"{'function':<48}{'self':>10}{'%':>7}{'inclusive':>12}{'%':>7}"]
+        for fn, gas in self.self_gas.most_common(limit):
+            inclusive = self.inclusive_gas[fn]
+            lines.append(
+                f"{fn:<48}{gas:>10}{gas / total:>7.1%}"
+                f"{inclusive:>12}{inclusive / total:>7.1%}"
+            )
+        return lines
+
+    def line_table(self, limit: Optional[int] = 20) -> List[str]:
+        total = self.gas_used or 1
+        return [
+            f"{Path(filename).name}:{line:<6}{gas:>10}{gas / total:>7.1%}"
+            for (filename, line), gas in self.line_gas.most_common(limit)
+        ]
+
+
+def profile_transactions(*txs: TransactionReceipt) -> GasProfile:
+    profile = GasProfile()
+    for tx in txs:
+        profile.add(tx)
+    return profile
+
+
+@contextmanager
+def profiling() -> Iterator[GasProfile]:
+    """Profiles every transaction sent inside the block, once it exits"""
+    profile = GasProfile()
+    start = len(history)
+    yield profile
+    for tx in history[start:]:
+        profile.add(tx)
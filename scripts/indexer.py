@@ -0,0 +1,479 @@
+"""Indexes VaultFactory vaults and vault token balances into SQLite from event logs.
+
+    indexer = VaultIndexer("vaults.db", factory.address, start_block=deploy_block)
+    indexer.sync()
+    indexer.vaults(tracking_token=WAVAX)
+    indexer.holdings(account)
+
+`VaultCreated` logs of the factory and `Transfer` logs of every vault it created are
+fetched with `eth_getLogs` over block ranges that double after each successful query
+and halve when the node rejects one (too many results, timeouts). Each range is
+decoded and written in one SQLite transaction together with the block cursor of the
+contracts it covers, so an interrupted sync resumes where it stopped.
+
+Block hashes of recent cursors and logs are kept for `REORG_WINDOW` blocks. A sync
+first checks them against the chain and, on a mismatch, rolls everything after the
+last matching block back before indexing again.
+
+brownie run indexer main <factory> [database] --network avalanche-main
+"""
+
+import sqlite3
+from collections import defaultdict
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from brownie import web3
+from eth_abi import decode_abi
+from eth_utils import keccak
+from hexbytes import HexBytes
+from requests.exceptions import RequestException
+
+VAULT_CREATED_TOPIC = HexBytes(
+    keccak(text="VaultCreated(address[],uint256[],address,address,uint256)")
+).hex()
+TRANSFER_TOPIC = HexBytes(keccak(text="Transfer(address,address,uint256)")).hex()
+VAULT_CREATED_TYPES = ["address[]", "uint256[]", "address", "address", "uint256"]
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# blocks behind the head whose hashes are kept to detect reorgs
+REORG_WINDOW = 128
+INITIAL_CHUNK_SIZE = 1_000
+MAX_CHUNK_SIZE = 100_000
+# vault addresses per eth_getLogs filter
+ADDRESS_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursors (
+    contract TEXT PRIMARY KEY,
+    block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    number INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vaults (
+    address TEXT PRIMARY KEY,
+    factory TEXT NOT NULL,
+    tracking_token TEXT NOT NULL,
+    vault_index INTEGER NOT NULL,
+    block INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS vaults_tracking_token ON vaults (tracking_token);
+CREATE TABLE IF NOT EXISTS vault_assets (
+    vault TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    asset TEXT NOT NULL,
+    weight TEXT NOT NULL,
+    PRIMARY KEY (vault, position)
+);
+CREATE INDEX IF NOT EXISTS vault_assets_asset ON vault_assets (asset);
+CREATE TABLE IF NOT EXISTS transfers (
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    vault TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    receiver TEXT NOT NULL,
+    value TEXT NOT NULL,
+    tx_hash TEXT NOT NULL,
+    PRIMARY KEY (block, log_index)
+);
+CREATE INDEX IF NOT EXISTS transfers_vault ON transfers (vault);
+CREATE TABLE IF NOT EXISTS balances (
+    vault TEXT NOT NULL,
+    holder TEXT NOT NULL,
+    balance TEXT NOT NULL,
+    PRIMARY KEY (vault, holder)
+);
+CREATE INDEX IF NOT EXISTS balances_holder ON balances (holder);
+"""
+
+
+class VaultCreated(NamedTuple):
+    block: int
+    tx_hash: str
+    vault: str
+    assets: List[str]
+    weights: List[int]
+    tracking_token: str
+    vault_index: int
+
+
+class Transfer(NamedTuple):
+    block: int
+    log_index: int
+    tx_hash: str
+    vault: str
+    sender: str
+    receiver: str
+    value: int
+
+
+class SyncStats(NamedTuple):
+    head: int
+    requests: int
+    logs: int
+    # block the index was rolled back to, None without a reorg
+    reorg_ancestor: Optional[int]
+
+
+def _address(value) -> str:
+    return str(value).lower()
+
+
+def _topic_address(topic) -> str:
+    return "0x" + HexBytes(topic).hex()[-40:]
+
+
+def decode_vault_created(log) -> VaultCreated:
+    assets, weights, tracking_token, vault, vault_index = decode_abi(
+        VAULT_CREATED_TYPES, HexBytes(log["data"])
+    )
+    return VaultCreated(
+        log["blockNumber"],
+        HexBytes(log["transactionHash"]).hex(),
+        _address(vault),
+        [_address(a) for a in assets],
+        list(weights),
+        _address(tracking_token),
+        vault_index,
+    )
+
+
+def decode_transfer(log) -> Transfer:
+    return Transfer(
+        log["blockNumber"],
+        log["logIndex"],
+        HexBytes(log["transactionHash"]).hex(),
+        _address(log["address"]),
+        _topic_address(log["topics"][1]),
+        _topic_address(log["topics"][2]),
+        int.from_bytes(HexBytes(log["data"]), "big"),
+    )
+
+
+class VaultIndexer:
+    def __init__(
+        self,
+        database: str,
+        factory: str,
+        start_block: int = 0,
+        confirmations: int = 0,
+        chunk_size: int = INITIAL_CHUNK_SIZE,
+        max_chunk_size: int = MAX_CHUNK_SIZE,
+    ):
+        self.db = sqlite3.connect(database)
+        self.db.executescript(SCHEMA)
+        self.factory = _address(factory)
+        self.start_block = start_block
+        self.confirmations = confirmations
+        self.chunk_size = chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.requests = 0
+        self.logs = 0
+        # chain height at the start of the current sync
+        self.height = 0
+
+    def close(self):
+        self.db.close()
+
+    # queries
+
+    def cursor(self, contract: str) -> Optional[int]:
+        row = self.db.execute(
+            "SELECT block FROM cursors WHERE contract = ?", (_address(contract),)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def vaults(
+        self, tracking_token: Optional[str] = None, asset: Optional[str] = None
+    ) -> List[str]:
+        """Indexed vaults in creation order, optionally filtered"""
+        query = "SELECT address FROM vaults"
+        clauses, params = [], []
+        if tracking_token is not None:
+            clauses.append("tracking_token = ?")
+            params.append(_address(tracking_token))
+        if asset is not None:
+            clauses.append(
+                "address IN (SELECT vault FROM vault_assets WHERE asset = ?)"
+            )
+            params.append(_address(asset))
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY vault_index"
+        return [row[0] for row in self.db.execute(query, params)]
+
+    def basket(self, vault: str) -> List[Tuple[str, int]]:
+        rows = self.db.execute(
+            "SELECT asset, weight FROM vault_assets WHERE vault = ? ORDER BY position",
+            (_address(vault),),
+        )
+        return [(asset, int(weight)) for asset, weight in rows]
+
+    def balance_of(self, vault: str, holder: str) -> int:
+        row = self.db.execute(
+            "SELECT balance FROM balances WHERE vault = ? AND holder = ?",
+            (_address(vault), _address(holder)),
+        ).fetchone()
+        return 0 if row is None else int(row[0])
+
+    def holders(self, vault: str) -> Dict[str, int]:
+        rows = self.db.execute(
+            "SELECT holder, balance FROM balances WHERE vault = ?", (_address(vault),)
+        )
+        return {holder: int(balance) for holder, balance in rows}
+
+    def holdings(self, holder: str) -> Dict[str, int]:
+        rows = self.db.execute(
+            "SELECT vault, balance FROM balances WHERE holder = ?", (_address(holder),)
+        )
+        return {vault: int(balance) for vault, balance in rows}
+
+    # syncing
+
+    def sync(self, to_block: Optional[int] = None) -> SyncStats:
+        """Indexes the factory and every vault up to `to_block`, by default the head
+        minus `confirmations`
+        """
+        requests, logs = self.requests, self.logs
+        ancestor = self._check_reorg()
+        self.height = web3.eth.block_number
+        head = self.height - self.confirmations
+        if to_block is None or to_block > head:
+            to_block = head
+
+        # vaults first: their Transfer logs start at their creation block
+        self._sync_contracts([self.factory], to_block)
+        vaults = [row[0] for row in self.db.execute("SELECT address FROM vaults")]
+        self._sync_contracts(vaults, to_block)
+        self._prune_blocks(to_block)
+        return SyncStats(to_block, self.requests - requests, self.logs - logs, ancestor)
+
+    def _sync_contracts(self, contracts: Sequence[str], to_block: int):
+        # contracts with the nearest cursors share their eth_getLogs filters, a batch
+        # is scanned once from its lowest cursor and `_write_chunk` drops the logs a
+        # contract already has
+        cursors: Dict[str, int] = {}
+        for contract in contracts:
+            cursor = self.cursor(contract)
+            if cursor is None:
+                cursor = self.start_block - 1
+            if cursor < to_block:
+                cursors[contract] = cursor
+        behind = sorted(cursors, key=cursors.get)
+        for i in range(0, len(behind), ADDRESS_BATCH):
+            batch = {
+                contract: cursors[contract]
+                for contract in behind[i : i + ADDRESS_BATCH]
+            }
+            from_block = min(batch.values()) + 1
+            for start, end, logs in self._log_chunks(list(batch), from_block, to_block):
+                self._write_chunk(batch, end, logs)
+
+    def _log_chunks(
+        self, addresses: List[str], from_block: int, to_block: int
+    ) -> Iterator[Tuple[int, int, List]]:
+        """(from, to, logs) ranges covering the blocks, sized adaptively"""
+        topics = [[VAULT_CREATED_TOPIC, TRANSFER_TOPIC]]
+        start = from_block
+        while start <= to_block:
+            end = min(to_block, start + self.chunk_size - 1)
+            self.requests += 1
+            try:
+                logs = web3.eth.get_logs(
+                    {
+                        "address": [web3.toChecksumAddress(a) for a in addresses],
+                        "fromBlock": start,
+                        "toBlock": end,
+                        "topics": topics,
+                    }
+                )
+            except (ValueError, RequestException):
+                if end == start:
+                    raise
+                self.chunk_size = max(1, (end - start + 1) // 2)
+                continue
+            self.logs += len(logs)
+            yield start, end, logs
+            start = end + 1
+            self.chunk_size = min(self.max_chunk_size, self.chunk_size * 2)
+
+    def _write_chunk(self, cursors: Dict[str, int], end: int, logs: List):
+        """Writes the logs of `cursors`' contracts after their cursors, up to `end`"""
+        created, transfers = [], []
+        hashes = {}
+        for log in logs:
+            if log["blockNumber"] <= cursors[_address(log["address"])]:
+                continue
+            topic = HexBytes(log["topics"][0]).hex()
+            if (
+                topic == VAULT_CREATED_TOPIC
+                and _address(log["address"]) == self.factory
+            ):
+                created.append(decode_vault_created(log))
+            elif topic == TRANSFER_TOPIC and len(log["topics"]) == 3:
+                transfers.append(decode_transfer(log))
+            else:
+                continue
+            hashes[log["blockNumber"]] = HexBytes(log["blockHash"]).hex()
+        if end > self.height - REORG_WINDOW:
+            self.requests += 1
+            hashes[end] = HexBytes(web3.eth.get_block(end)["hash"]).hex()
+
+        with self.db:
+            for event in created:
+                self._insert_vault(event)
+            self._apply_transfers(transfers)
+            self.db.executemany(
+                "INSERT OR REPLACE INTO blocks (number, hash) VALUES (?, ?)",
+                hashes.items(),
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO cursors (contract, block) VALUES (?, ?)",
+                [(contract, max(cursor, end)) for contract, cursor in cursors.items()],
+            )
+
+    def _insert_vault(self, event: VaultCreated):
+        self.db.execute(
+            "INSERT OR REPLACE INTO vaults VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                event.vault,
+                self.factory,
+                event.tracking_token,
+                event.vault_index,
+                event.block,
+                event.tx_hash,
+            ),
+        )
+        self.db.executemany(
+            "INSERT OR REPLACE INTO vault_assets VALUES (?, ?, ?, ?)",
+            [
+                (event.vault, i, asset, str(weight))
+                for i, (asset, weight) in enumerate(zip(event.assets, event.weights))
+            ],
+        )
+        # the vault's own logs start in its creation block
+        self.db.execute(
+            "INSERT OR IGNORE INTO cursors (contract, block) VALUES (?, ?)",
+            (event.vault, event.block - 1),
+        )
+
+    def _apply_transfers(self, transfers: List[Transfer]):
+        if not transfers:
+            return
+        self.db.executemany(
+            "INSERT OR REPLACE INTO transfers VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    t.block,
+                    t.log_index,
+                    t.vault,
+                    t.sender,
+                    t.receiver,
+                    str(t.value),
+                    t.tx_hash,
+                )
+                for t in transfers
+            ],
+        )
+        deltas: Dict[Tuple[str, str], int] = defaultdict(int)
+        for t in transfers:
+            deltas[(t.vault, t.sender)] -= t.value
+            deltas[(t.vault, t.receiver)] += t.value
+        self._apply_deltas(deltas)
+
+    def _apply_deltas(self, deltas: Dict[Tuple[str, str], int]):
+        updates, emptied = [], []
+        for (vault, holder), delta in deltas.items():
+            if holder == ZERO_ADDRESS or delta == 0:
+                continue
+            balance = self.balance_of(vault, holder) + delta
+            if balance:
+                updates.append((vault, holder, str(balance)))
+            else:
+                emptied.append((vault, holder))
+        self.db.executemany("INSERT OR REPLACE INTO balances VALUES (?, ?, ?)", updates)
+        self.db.executemany(
+            "DELETE FROM balances WHERE vault = ? AND holder = ?", emptied
+        )
+
+    # reorgs
+
+    def _check_reorg(self) -> Optional[int]:
+        """Rolls back to the newest stored block still on chain, if any isn't"""
+        rows = self.db.execute(
+            "SELECT number, hash FROM blocks ORDER BY number DESC"
+        ).fetchall()
+        if not rows:
+            return None
+        height = web3.eth.block_number
+        ancestor = rows[-1][0] - 1
+        for number, stored in rows:
+            self.requests += 1
+            if (
+                number <= height
+                and HexBytes(web3.eth.get_block(number)["hash"]).hex() == stored
+            ):
+                ancestor = number
+                break
+        if ancestor == rows[0][0]:
+            return None
+        self._rollback(ancestor)
+        return ancestor
+
+    def _rollback(self, ancestor: int):
+        with self.db:
+            vaults = {
+                row[0]
+                for row in self.db.execute(
+                    "SELECT DISTINCT vault FROM transfers WHERE block > ?", (ancestor,)
+                )
+            }
+            dropped = [
+                row[0]
+                for row in self.db.execute(
+                    "SELECT address FROM vaults WHERE block > ?", (ancestor,)
+                )
+            ]
+            for table, column in (("vault_assets", "vault"), ("cursors", "contract")):
+                self.db.executemany(
+                    f"DELETE FROM {table} WHERE {column} = ?", [(v,) for v in dropped]
+                )
+            self.db.execute("DELETE FROM vaults WHERE block > ?", (ancestor,))
+            self.db.execute("DELETE FROM transfers WHERE block > ?", (ancestor,))
+            self.db.execute("DELETE FROM blocks WHERE number > ?", (ancestor,))
+            self.db.execute(
+                "UPDATE cursors SET block = ? WHERE block > ?", (ancestor, ancestor)
+            )
+            for vault in vaults:
+                self._replay_balances(vault)
+
+    def _replay_balances(self, vault: str):
+        self.db.execute("DELETE FROM balances WHERE vault = ?", (vault,))
+        deltas: Dict[Tuple[str, str], int] = defaultdict(int)
+        for sender, receiver, value in self.db.execute(
+            "SELECT sender, receiver, value FROM transfers WHERE vault = ?", (vault,)
+        ):
+            deltas[(vault, sender)] -= int(value)
+            deltas[(vault, receiver)] += int(value)
+        self._apply_deltas(deltas)
+
+    def _prune_blocks(self, to_block: int):
+        with self.db:
+            self.db.execute(
+                "DELETE FROM blocks WHERE number < ? AND number < "
+                "(SELECT MAX(number) FROM blocks)",
+                (to_block - REORG_WINDOW,),
+            )
+
+
+def main(factory_address: str, database: str = "vaults.db"):
+    indexer = VaultIndexer(database, factory_address)
+    stats = indexer.sync()
+    print(
+        f"indexed up to block {stats.head}: {stats.logs} logs in "
+        f"{stats.requests} requests, {len(indexer.vaults())} vaults"
+    )
+    indexer.close()
@@ -0,0 +1,280 @@
+"""Concurrent vault traffic from many accounts, for throughput and latency numbers.
+
+    users = prepare_users(owner, vaults, 100, mint_funding(owner))
+    report = asyncio.run(LoadGenerator(vaults, users).run(txs_per_user=20))
+    print("\\n".join(report.summary()))
+
+Every user is a local account that signs its own transactions, so the generator
+keeps the nonces itself and can have up to `pipeline` transactions of a user in
+flight without waiting for the node. Users pick deposits, withdrawals and share
+transfers with the weights of `mix`; a local model of their shares keeps them from
+withdrawing or sending shares they don't have, so failures in the report are real
+failures.
+
+Web3 is blocking, its requests run on a thread pool sized by `workers` and the
+event loop only schedules them. Latency is measured from `eth_sendRawTransaction`
+to the first poll that sees the receipt, so it includes up to `poll_interval`.
+"""
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import mean
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from brownie import MockERC20, accounts, interface, web3
+from brownie.network.account import Account, LocalAccount
+from eth_account import Account as EthAccount
+from web3.exceptions import TransactionNotFound
+
+DEPOSIT = "deposit"
+WITHDRAW = "withdraw"
+TRANSFER = "transfer"
+
+DEFAULT_MIX = {DEPOSIT: 5, WITHDRAW: 3, TRANSFER: 2}
+# shares moved by one operation at most
+MAX_SHARES = 10**6
+DEFAULT_GAS_LIMIT = 500_000
+MAX_APPROVAL = 2**256 - 1
+
+# (token address, account, amount), e.g. `fund_token` of the test utils
+Funding = Callable[[str, Account, int], None]
+
+
+class TxResult(NamedTuple):
+    op: str
+    user: str
+    latency: float
+    block_number: int
+    gas_used: int
+    success: bool
+
+
+class LoadReport(NamedTuple):
+    results: List[TxResult]
+    seconds: float
+    # block number -> (transactions, gas used)
+    blocks: Dict[int, tuple]
+    # transactions the node refused before mining them
+    rejected: int
+
+    def tx_per_second(self) -> float:
+        return len(self.results) / self.seconds
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)) -> Dict[int, float]:
+        latencies = sorted(r.latency for r in self.results)
+        if not latencies:
+            return {}
+        return {
+            p: latencies[min(len(latencies) - 1, len(latencies) * p // 100)]
+            for p in percentiles
+        }
+
+    def summary(self) -> List[str]:
+        failed = sum(not r.success for r in self.results)
+        lines = [
+            f"{len(self.results)} txs in {self.seconds:.1f}s: "
+            f"{self.tx_per_second():.1f} tx/s, {failed} reverted, "
+            f"{self.rejected} rejected",
+            "latency "
+            + "  ".join(
+                f"p{p} {seconds * 1000:.0f}ms"
+                for p, seconds in self.latency_percentiles().items()
+            ),
+        ]
+        if self.blocks:
+            txs, gas = zip(*self.blocks.values())
+            lines.append(
+                f"{len(self.blocks)} blocks: {mean(txs):.1f} txs and "
+                f"{mean(gas):,.0f} gas per block, max {max(gas):,}"
+            )
+        for op in DEFAULT_MIX:
+            gas = [r.gas_used for r in self.results if r.op == op and r.success]
+            if gas:
+                lines.append(f"{op:>9}: {len(gas)} txs, {mean(gas):,.0f} gas")
+        return lines
+
+
+def mint_funding(minter: Account) -> Funding:
+    """Funding for `MockERC20` baskets, which anyone can mint"""
+
+    def fund(token: str, account: Account, amount: int):
+        MockERC20.at(token).mint(account, amount, {"from": minter})
+
+    return fund
+
+
+def prepare_users(
+    funder: Account,
+    vaults: Sequence,
+    count: int,
+    fund: Funding,
+    deposits: int = 20,
+    avax: int = 10**18,
+) -> List[LocalAccount]:
+    """`count` new local accounts with `avax` for gas, enough assets for `deposits`
+    deposits of `MAX_SHARES` into every vault and approvals for all of them
+    """
+    users = [accounts.add() for _ in range(count)]
+    for user in users:
+        funder.transfer(user, avax)
+        for vault in vaults:
+            for i in range(vault.assetLength()):
+                asset = vault.assets(i)
+                fund(asset, user, vault.weights(i) * MAX_SHARES * deposits)
+                interface.IERC20(asset).approve(vault, MAX_APPROVAL, {"from": user})
+    return users
+
+
+class _User:
+    def __init__(self, account: LocalAccount, nonce: int, pipeline: int):
+        self.account = account
+        self.nonce = nonce
+        self.in_flight = asyncio.Semaphore(pipeline)
+        # vault index -> shares confirmed and not spent by a pending transaction
+        self.shares: Dict[int, int] = {}
+
+
+class LoadGenerator:
+    def __init__(
+        self,
+        vaults: Sequence,
+        users: Sequence[LocalAccount],
+        mix: Optional[Dict[str, int]] = None,
+        pipeline: int = 4,
+        workers: int = 32,
+        gas_limit: int = DEFAULT_GAS_LIMIT,
+        poll_interval: float = 0.05,
+        seed: int = 0,
+    ):
+        self.vaults = list(vaults)
+        self.accounts = list(users)
+        self.mix = mix or DEFAULT_MIX
+        self.pipeline = pipeline
+        self.workers = workers
+        self.gas_limit = gas_limit
+        self.poll_interval = poll_interval
+        self.rng = random.Random(seed)
+
+    async def _rpc(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, fn, *args
+        )
+
+    def _choose(self, user: _User, users: List[_User]):
+        """Next operation of `user` as (op, vault index, amount, recipient)"""
+        ops, weights = zip(*self.mix.items())
+        op = self.rng.choices(ops, weights)[0]
+        vault = self.rng.randrange(len(self.vaults))
+        owned = user.shares.get(vault, 0)
+        if op == DEPOSIT or owned == 0:
+            return DEPOSIT, vault, self.rng.randint(1, MAX_SHARES), None
+        amount = self.rng.randint(1, owned)
+        if op == TRANSFER:
+            return TRANSFER, vault, amount, self.rng.choice(users)
+        return WITHDRAW, vault, amount, None
+
+    def _sign(self, user: _User, op: str, vault, amount: int, recipient) -> bytes:
+        if op == TRANSFER:
+            data = vault.transfer.encode_input(recipient.account.address, amount)
+        else:
+            data = getattr(vault, op).encode_input(amount)
+        tx = {
+            "to": vault.address,
+            "data": data,
+            "value": 0,
+            "nonce": user.nonce,
+            "gas": self.gas_limit,
+            "gasPrice": self.gas_price,
+            "chainId": self.chain_id,
+        }
+        return EthAccount.sign_transaction(tx, user.account.private_key).rawTransaction
+
+    async def _confirm(self, tx_hash, sent_at: float, user: _User, operation):
+        op, vault, amount, recipient = operation
+        try:
+            while True:
+                try:
+                    receipt = await self._rpc(web3.eth.get_transaction_receipt, tx_hash)
+                    break
+                except TransactionNotFound:
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            user.in_flight.release()
+        latency = time.perf_counter() - sent_at
+        success = receipt["status"] == 1
+        if success and op == DEPOSIT:
+            user.shares[vault] = user.shares.get(vault, 0) + amount
+        elif success and op == TRANSFER:
+            recipient.shares[vault] = recipient.shares.get(vault, 0) + amount
+        elif not success and op != DEPOSIT:
+            user.shares[vault] += amount
+        self.results.append(
+            TxResult(
+                op,
+                user.account.address,
+                latency,
+                receipt["blockNumber"],
+                receipt["gasUsed"],
+                success,
+            )
+        )
+
+    async def _drive(self, user: _User, users: List[_User], count: int):
+        confirmations = []
+        for _ in range(count):
+            await user.in_flight.acquire()
+            operation = self._choose(user, users)
+            op, vault, amount, recipient = operation
+            if op != DEPOSIT:
+                user.shares[vault] -= amount
+            raw = self._sign(user, op, self.vaults[vault], amount, recipient)
+            sent_at = time.perf_counter()
+            try:
+                tx_hash = await self._rpc(web3.eth.send_raw_transaction, raw)
+            except ValueError:
+                # refused by the node, the nonce wasn't used
+                self.rejected += 1
+                user.in_flight.release()
+                if op != DEPOSIT:
+                    user.shares[vault] += amount
+                user.nonce = await self._rpc(
+                    web3.eth.get_transaction_count, user.account.address, "pending"
+                )
+                continue
+            user.nonce += 1
+            confirmations.append(
+                asyncio.ensure_future(self._confirm(tx_hash, sent_at, user, operation))
+            )
+        await asyncio.gather(*confirmations)
+
+    async def run(self, txs_per_user: int = 20) -> LoadReport:
+        self.results: List[TxResult] = []
+        self.rejected = 0
+        self.chain_id = web3.eth.chain_id
+        self.gas_price = web3.eth.gas_price
+        self.executor = ThreadPoolExecutor(self.workers)
+        try:
+            users = [
+                _User(
+                    account,
+                    await self._rpc(
+                        web3.eth.get_transaction_count, account.address, "pending"
+                    ),
+                    self.pipeline,
+                )
+                for account in self.accounts
+            ]
+            first_block = await self._rpc(lambda: web3.eth.block_number)
+            start = time.perf_counter()
+            await asyncio.gather(*(self._drive(u, users, txs_per_user) for u in users))
+            seconds = time.perf_counter() - start
+            blocks = {}
+            for number in sorted({r.block_number for r in self.results}):
+                if number > first_block:
+                    block = await self._rpc(web3.eth.get_block, number)
+                    blocks[number] = (len(block["transactions"]), block["gasUsed"])
+        finally:
+            self.executor.shutdown()
+        return LoadReport(self.results, seconds, blocks, self.rejected)
@@ -0,0 +1,21 @@
+"""Prints the state of every vault of a VaultFactory, one eth_call per vault.
+
+brownie run monitor_vaults main <factory> <multicall> --network avalanche-main
+"""
+
+from brownie import ImmutableVault, Multicall, VaultFactory
+
+from .multicall import MulticallBatch, fetch_vault_state
+
+
+def main(factory_address: str, multicall_address: str):
+    factory = VaultFactory.at(factory_address)
+    multicall = Multicall.at(multicall_address)
+    batch = MulticallBatch(multicall)
+    for i in range(factory.allVaultsLength()):
+        batch.add(factory.allVaults, i)
+    for address in batch.execute():
+        state = fetch_vault_state(multicall, ImmutableVault.at(address))
+        print(f"{state.address} {state.name} supply={state.total_supply}")
+        for asset, weight, reserve in zip(state.assets, state.weights, state.reserves):
+            print(f"    {asset} weight={weight} reserve={reserve}")
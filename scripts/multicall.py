@@ -0,0 +1,152 @@
+"""Batches contract reads into a single `eth_call` through the Multicall contract.
+
+    batch = MulticallBatch(multicall)
+    batch.add(token.balanceOf, account)
+    batch.add(vault.totalSupply)
+    balance, total_supply = batch.execute()
+
+Any brownie view method (`ContractCall`) can be batched, arguments are encoded and
+results decoded with the method's own ABI.
+"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from brownie import Contract, Multicall
+from brownie.network.account import Account
+from brownie.network.contract import ContractCall
+
+_default_multicall: Optional[Contract] = None
+
+
+def set_default_multicall(multicall: Optional[Contract]):
+    global _default_multicall
+    _default_multicall = multicall
+
+
+def default_multicall() -> Optional[Contract]:
+    return _default_multicall
+
+
+def deploy_multicall(deployer: Account) -> Contract:
+    multicall = Multicall.deploy({"from": deployer})
+    set_default_multicall(multicall)
+    return multicall
+
+
+class MulticallBatch:
+    def __init__(self, multicall: Contract):
+        self.multicall = multicall
+        self.calls: List[Tuple[ContractCall, Tuple]] = []
+        self.block_number: Optional[int] = None
+
+    def add(self, method: ContractCall, *args) -> int:
+        """Queues `method(*args)`, returns its index in the results"""
+        self.calls.append((method, args))
+        return len(self.calls) - 1
+
+    def _encoded(self) -> List[Tuple[str, str]]:
+        return [
+            (method._address, method.encode_input(*args)) for method, args in self.calls
+        ]
+
+    @staticmethod
+    def _decode(method: ContractCall, data) -> Any:
+        return method.decode_output(data)
+
+    def execute(self, block_identifier=None) -> List[Any]:
+        """Runs every queued call in one eth_call, reverts if any of them fails"""
+        if not self.calls:
+            return []
+        self.block_number, return_data = self.multicall.aggregate.call(
+            self._encoded(), block_identifier=block_identifier
+        )
+        return [self._decode(m, data) for (m, _), data in zip(self.calls, return_data)]
+
+    def try_execute(self, block_identifier=None) -> List[Optional[Any]]:
+        """Same as `execute`, failed calls return None instead of reverting the batch"""
+        if not self.calls:
+            return []
+        self.block_number, results = self.multicall.tryAggregate.call(
+            self._encoded(), block_identifier=block_identifier
+        )
+        return [
+            self._decode(m, data) if success else None
+            for (m, _), (success, data) in zip(self.calls, results)
+        ]
+
+
+def fetch_balances(
+    multicall: Contract, tokens: Iterable[Contract], accounts: Iterable[str]
+) -> Dict[Tuple[Contract, str], int]:
+    """`balanceOf` of every (token, account) pair in a single eth_call"""
+    batch = MulticallBatch(multicall)
+    keys = [(token, str(account)) for token in tokens for account in accounts]
+    for token, account in keys:
+        batch.add(token.balanceOf, account)
+    return dict(zip(keys, batch.execute()))
+
+
+class VaultState(NamedTuple):
+    address: str
+    name: str
+    tracking_token: str
+    total_supply: int
+    assets: List[str]
+    weights: List[int]
+    reserves: List[int]
+    block_number: int
+
+
+# assets(i)/weights(i)/reserves(i) requested speculatively on the first read of a
+# vault, so vaults up to this size are read in one eth_call
+ASSET_GUESS = 8
+
+
+def fetch_vault_state(
+    multicall: Contract, vault: Contract, asset_length: Optional[int] = None
+) -> VaultState:
+    """Whole state of an ImmutableVault in one eth_call. Pass `asset_length` when it's
+    known (it never changes), otherwise vaults larger than `ASSET_GUESS` take a second
+    call for the remaining assets.
+    """
+    batch = MulticallBatch(multicall)
+    batch.add(vault.name)
+    batch.add(vault.trackingToken)
+    batch.add(vault.totalSupply)
+    batch.add(vault.assetLength)
+    count = ASSET_GUESS if asset_length is None else asset_length
+    for i in range(count):
+        batch.add(vault.assets, i)
+        batch.add(vault.weights, i)
+        batch.add(vault.reserves, i)
+    # only the guessed slots past `assetLength` may fail
+    results = batch.try_execute()
+    name, tracking_token, total_supply, length = results[:4]
+    if None in results[:4]:
+        raise ValueError(f"{vault.address} isn't an ImmutableVault")
+    per_asset = results[4:]
+    if None in per_asset[: 3 * min(length, count)]:
+        raise ValueError(f"Reading the assets of {vault.address} failed")
+    assets = list(per_asset[0::3][:length])
+    weights = list(per_asset[1::3][:length])
+    reserves = list(per_asset[2::3][:length])
+    if length > count:
+        rest = MulticallBatch(multicall)
+        for i in range(count, length):
+            rest.add(vault.assets, i)
+            rest.add(vault.weights, i)
+            rest.add(vault.reserves, i)
+        extra = rest.execute(block_identifier=batch.block_number)
+        assets += extra[0::3]
+        weights += extra[1::3]
+        reserves += extra[2::3]
+    return VaultState(
+        vault.address,
+        name,
+        tracking_token,
+        total_supply,
+        assets,
+        weights,
+        reserves,
+        batch.block_number,
+    )
@@ -0,0 +1,310 @@
+"""Net asset value of every vault of a VaultFactory, in each vault's trackingToken.
+
+Assets are priced at the Pangolin mid price against the tracking token, directly
+when the pair exists and through WAVAX otherwise. All reads of a valuation are
+pinned to one block: vault balances and supplies go in one multicall, and every
+unique pair is read once no matter how many vaults hold its tokens. Pair reserves
+and prices are cached until a new block is mined; vault baskets and pair addresses
+never change and are cached for the engine's lifetime.
+
+Optionally, Chainlink USD feeds cross-check the Pangolin prices:
+
+    engine = NavEngine(factory, multicall, pangolin_factory(), WAVAX, usd_feeds={
+        WETH: eth_usd_feed, WAVAX: avax_usd_feed,
+    })
+    navs = engine.value_all()
+"""
+
+from fractions import Fraction
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from brownie import Contract, ImmutableVault, interface, web3
+
+from .multicall import MulticallBatch
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+# getVault(trackingToken, i) entries requested per eth_call when enumerating
+GET_VAULT_CHUNK = 64
+
+
+class VaultBasket(NamedTuple):
+    assets: List[str]
+    weights: List[int]
+    tracking_token: str
+
+
+class VaultNav(NamedTuple):
+    vault: str
+    tracking_token: str
+    total_supply: int
+    # value of the vault's balances, in tracking token wei
+    total_value: Fraction
+    # value of one share unit (1 wei of the vault token), in tracking token wei
+    nav_per_share: Fraction
+    # asset -> Chainlink price / Pangolin price - 1, only with usd_feeds
+    deviations: Dict[str, Fraction]
+    block_number: int
+
+
+def _key(address: str) -> str:
+    return address.lower()
+
+
+class NavEngine:
+    def __init__(
+        self,
+        factory: Contract,
+        multicall: Contract,
+        pangolin_factory: Contract,
+        wavax: str,
+        usd_feeds: Optional[Dict[str, Contract]] = None,
+    ):
+        self.factory = factory
+        self.multicall = multicall
+        self.pangolin_factory = pangolin_factory
+        self.wavax = _key(wavax)
+        self.usd_feeds = {_key(t): feed for t, feed in (usd_feeds or {}).items()}
+
+        self.vaults: List[str] = []
+        self.baskets: Dict[str, VaultBasket] = {}
+        self.decimals: Dict[str, int] = {}
+        # sorted token pair -> pair address, ZERO_ADDRESS when it doesn't exist
+        self.pairs: Dict[Tuple[str, str], str] = {}
+
+        self.block_number: Optional[int] = None
+        # (base, quote) -> price of 1 wei of base in quote wei, for the cached block
+        self.prices: Dict[Tuple[str, str], Fraction] = {}
+        self.usd_prices: Dict[str, Fraction] = {}
+
+    def _batch(self) -> MulticallBatch:
+        return MulticallBatch(self.multicall)
+
+    def _new_block(self, block_number: int):
+        if block_number != self.block_number:
+            self.block_number = block_number
+            self.prices = {}
+            self.usd_prices = {}
+
+    def refresh_vaults(self) -> List[str]:
+        """Picks up vaults created since the last call and loads their baskets"""
+        length = self.factory.allVaultsLength(block_identifier=self.block_number)
+        if length > len(self.vaults):
+            batch = self._batch()
+            for i in range(len(self.vaults), length):
+                batch.add(self.factory.allVaults, i)
+            self.vaults += batch.execute(block_identifier=self.block_number)
+        self._load_baskets([v for v in self.vaults if v not in self.baskets])
+        return self.vaults
+
+    def vaults_tracking(self, tracking_token: str) -> List[str]:
+        """Vaults registered in `getVault[tracking_token]`. The array length isn't
+        exposed, so entries are requested in chunks until one of them reverts.
+        """
+        vaults: List[str] = []
+        while True:
+            batch = self._batch()
+            for i in range(len(vaults), len(vaults) + GET_VAULT_CHUNK):
+                batch.add(self.factory.getVault, tracking_token, i)
+            for address in batch.try_execute(block_identifier=self.block_number):
+                if address is None:
+                    return vaults
+                vaults.append(address)
+
+    def _load_baskets(self, vaults: List[str]):
+        if not vaults:
+            return
+        # every vault flavour shares the ImmutableVault getters
+        contracts = [
+            Contract.from_abi("ImmutableVault", v, ImmutableVault.abi) for v in vaults
+        ]
+        batch = self._batch()
+        for vault in contracts:
+            batch.add(vault.assetLength)
+            batch.add(vault.trackingToken)
+        heads = batch.execute()
+        batch = self._batch()
+        for vault, length in zip(contracts, heads[0::2]):
+            for i in range(length):
+                batch.add(vault.assets, i)
+                batch.add(vault.weights, i)
+        results = iter(batch.execute())
+        for address, length, tracking_token in zip(vaults, heads[0::2], heads[1::2]):
+            per_asset = [next(results) for _ in range(2 * length)]
+            self.baskets[address] = VaultBasket(
+                [_key(a) for a in per_asset[0::2]],
+                per_asset[1::2],
+                _key(tracking_token),
+            )
+        self._load_decimals(
+            t for b in self.baskets.values() for t in b.assets + [b.tracking_token]
+        )
+
+    def _load_decimals(self, tokens: Iterable[str]):
+        missing = sorted({t for t in tokens if t not in self.decimals})
+        if missing:
+            batch = self._batch()
+            for token in missing:
+                batch.add(interface.IERC20(token).decimals)
+            self.decimals.update(zip(missing, batch.execute()))
+
+    def _via_wavax(self, asset: str, tracking_token: str) -> List[Tuple[str, str]]:
+        hops = [(asset, self.wavax), (self.wavax, tracking_token)]
+        return [(a, b) for a, b in hops if a != b]
+
+    def _candidate_hops(self, asset: str, tracking_token: str) -> List[Tuple[str, str]]:
+        """Every pair that might price `asset`, so a single getPair pass finds them"""
+        if asset == tracking_token:
+            return []
+        return [(asset, tracking_token)] + self._via_wavax(asset, tracking_token)
+
+    def _routes(self, asset: str, tracking_token: str) -> List[Tuple[str, str]]:
+        """Hops used to price `asset` in `tracking_token`"""
+        if asset == tracking_token:
+            return []
+        direct = tuple(sorted((asset, tracking_token)))
+        if self.pairs.get(direct, ZERO_ADDRESS) != ZERO_ADDRESS:
+            return [(asset, tracking_token)]
+        return self._via_wavax(asset, tracking_token)
+
+    def _load_pairs(self, hops: Iterable[Tuple[str, str]]):
+        missing = sorted({tuple(sorted(h)) for h in hops} - set(self.pairs))
+        if missing:
+            batch = self._batch()
+            for token_a, token_b in missing:
+                batch.add(self.pangolin_factory.getPair, token_a, token_b)
+            for pair, address in zip(missing, batch.execute()):
+                self.pairs[pair] = address
+
+    def vault_pairs(
+        self, vaults: Optional[List[str]] = None
+    ) -> Dict[Tuple[str, str], str]:
+        """Existing pairs that can price the assets of `vaults` (every vault of the
+        factory by default) in their tracking tokens, by sorted token pair
+        """
+        if vaults is None:
+            vaults = self.refresh_vaults()
+        else:
+            self._load_baskets([v for v in vaults if v not in self.baskets])
+        hops = {
+            tuple(sorted(hop))
+            for basket in (self.baskets[v] for v in vaults)
+            for asset in basket.assets
+            for hop in self._candidate_hops(asset, basket.tracking_token)
+        }
+        self._load_pairs(hops)
+        return {
+            pair: address
+            for pair, address in self.pairs.items()
+            if pair in hops and address != ZERO_ADDRESS
+        }
+
+    def _load_prices(self, hops: Iterable[Tuple[str, str]]):
+        """Mid prices of every unique pair along `hops` in one multicall"""
+        unique = sorted({tuple(sorted(h)) for h in hops if h not in self.prices})
+        batch = self._batch()
+        for pair in unique:
+            if self.pairs[pair] == ZERO_ADDRESS:
+                raise ValueError(f"No Pangolin pair for {pair[0]} and {pair[1]}")
+            contract = interface.IPangolinPair(self.pairs[pair])
+            batch.add(contract.token0)
+            batch.add(contract.getReserves)
+        results = batch.execute(block_identifier=self.block_number)
+        for pair, token0, (reserve0, reserve1, _) in zip(
+            unique, results[0::2], results[1::2]
+        ):
+            token0 = _key(token0)
+            token1 = pair[1] if token0 == pair[0] else pair[0]
+            self.prices[(token0, token1)] = Fraction(reserve1, reserve0)
+            self.prices[(token1, token0)] = Fraction(reserve0, reserve1)
+
+    def price(self, asset: str, tracking_token: str) -> Fraction:
+        """Price of 1 wei of `asset` in `tracking_token` wei, from the cached block"""
+        price = Fraction(1)
+        for hop in self._routes(_key(asset), _key(tracking_token)):
+            price *= self.prices[hop]
+        return price
+
+    def _load_usd_prices(self, tokens: Iterable[str]):
+        feeds = sorted(
+            {t for t in tokens if t in self.usd_feeds} - set(self.usd_prices)
+        )
+        if not feeds:
+            return
+        batch = self._batch()
+        for token in feeds:
+            batch.add(self.usd_feeds[token].latestAnswer)
+            batch.add(self.usd_feeds[token].decimals)
+        results = batch.execute(block_identifier=self.block_number)
+        self._load_decimals(feeds)
+        for token, answer, feed_decimals in zip(feeds, results[0::2], results[1::2]):
+            # USD price of 1 wei of the token
+            self.usd_prices[token] = Fraction(
+                answer, 10 ** (feed_decimals + self.decimals[token])
+            )
+
+    def _deviations(self, basket: VaultBasket) -> Dict[str, Fraction]:
+        tracking_usd = self.usd_prices.get(basket.tracking_token)
+        deviations = {}
+        for asset in basket.assets:
+            if tracking_usd is None or asset not in self.usd_prices:
+                continue
+            feed_price = self.usd_prices[asset] / tracking_usd
+            deviations[asset] = (
+                feed_price / self.price(asset, basket.tracking_token) - 1
+            )
+        return deviations
+
+    def value_all(self, vaults: Optional[List[str]] = None) -> List[VaultNav]:
+        """NAV of `vaults` (every vault of the factory by default) at the latest block"""
+        self._new_block(web3.eth.block_number)
+        if vaults is None:
+            vaults = self.refresh_vaults()
+        else:
+            self._load_baskets([v for v in vaults if v not in self.baskets])
+        baskets = [self.baskets[v] for v in vaults]
+
+        hops = [
+            hop
+            for basket in baskets
+            for asset in basket.assets
+            for hop in self._candidate_hops(asset, basket.tracking_token)
+        ]
+        self._load_pairs(hops)
+        used = [
+            hop
+            for basket in baskets
+            for asset in basket.assets
+            for hop in self._routes(asset, basket.tracking_token)
+        ]
+        self._load_prices(used)
+        self._load_usd_prices(t for b in baskets for t in b.assets + [b.tracking_token])
+
+        batch = self._batch()
+        for vault, basket in zip(vaults, baskets):
+            batch.add(interface.IERC20(vault).totalSupply)
+            for asset in basket.assets:
+                batch.add(interface.IERC20(asset).balanceOf, vault)
+        results = iter(batch.execute(block_identifier=self.block_number))
+
+        navs = []
+        for vault, basket in zip(vaults, baskets):
+            total_supply = next(results)
+            total_value = sum(
+                (
+                    next(results) * self.price(a, basket.tracking_token)
+                    for a in basket.assets
+                ),
+                Fraction(0),
+            )
+            navs.append(
+                VaultNav(
+                    vault,
+                    basket.tracking_token,
+                    total_supply,
+                    total_value,
+                    total_value / total_supply if total_supply else Fraction(0),
+                    self._deviations(basket),
+                    self.block_number,
+                )
+            )
+        return navs
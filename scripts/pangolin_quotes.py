@@ -0,0 +1,180 @@
+"""Integer-exact Pangolin constant-product quotes.
+
+Same arithmetic as PangolinLibrary (0.3% fee), so quotes match
+`IPangolinRouter.getAmountsOut/getAmountsIn` to the wei for any reserve size:
+
+    getAmountOut = amountIn * 997 * reserveOut / (reserveIn * 1000 + amountIn * 997)
+    getAmountIn  = reserveIn * amountOut * 1000 / ((reserveOut - amountOut) * 997) + 1
+
+Reserves of multi-hop paths are looked up in a `PairReserves` mapping, which
+`load_path_reserves` fills from chain with a single multicall per step.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+FEE_NUMERATOR = 997
+FEE_DENOMINATOR = 1000
+
+# (token_in, token_out) -> (reserve_in, reserve_out), addresses in lowercase
+PairReserves = Dict[Tuple[str, str], Tuple[int, int]]
+
+
+class QuoteError(ValueError):
+    pass
+
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int) -> int:
+    if amount_in <= 0:
+        raise QuoteError("PangolinLibrary: INSUFFICIENT_INPUT_AMOUNT")
+    if reserve_in <= 0 or reserve_out <= 0:
+        raise QuoteError("PangolinLibrary: INSUFFICIENT_LIQUIDITY")
+    amount_in_with_fee = amount_in * FEE_NUMERATOR
+    numerator = amount_in_with_fee * reserve_out
+    denominator = reserve_in * FEE_DENOMINATOR + amount_in_with_fee
+    return numerator // denominator
+
+
+def get_amount_in(amount_out: int, reserve_in: int, reserve_out: int) -> int:
+    if amount_out <= 0:
+        raise QuoteError("PangolinLibrary: INSUFFICIENT_OUTPUT_AMOUNT")
+    if reserve_in <= 0 or reserve_out <= 0:
+        raise QuoteError("PangolinLibrary: INSUFFICIENT_LIQUIDITY")
+    if amount_out >= reserve_out:
+        raise QuoteError("ds-math-sub-underflow")
+    numerator = reserve_in * amount_out * FEE_DENOMINATOR
+    denominator = (reserve_out - amount_out) * FEE_NUMERATOR
+    return numerator // denominator + 1
+
+
+def get_amounts_out_batch(
+    amounts_in: Iterable[int], reserve_in: int, reserve_out: int
+) -> List[int]:
+    """`get_amount_out` for many amounts through the same pair"""
+    if reserve_in <= 0 or reserve_out <= 0:
+        raise QuoteError("PangolinLibrary: INSUFFICIENT_LIQUIDITY")
+    scaled_reserve_in = reserve_in * FEE_DENOMINATOR
+    quotes = []
+    for amount_in in amounts_in:
+        if amount_in <= 0:
+            raise QuoteError("PangolinLibrary: INSUFFICIENT_INPUT_AMOUNT")
+        amount_in_with_fee = amount_in * FEE_NUMERATOR
+        quotes.append(
+            amount_in_with_fee * reserve_out // (scaled_reserve_in + amount_in_with_fee)
+        )
+    return quotes
+
+
+def get_amounts_in_batch(
+    amounts_out: Iterable[int], reserve_in: int, reserve_out: int
+) -> List[int]:
+    """`get_amount_in` for many amounts through the same pair"""
+    if reserve_in <= 0 or reserve_out <= 0:
+        raise QuoteError("PangolinLibrary: INSUFFICIENT_LIQUIDITY")
+    scaled_reserve_in = reserve_in * FEE_DENOMINATOR
+    quotes = []
+    for amount_out in amounts_out:
+        if amount_out <= 0:
+            raise QuoteError("PangolinLibrary: INSUFFICIENT_OUTPUT_AMOUNT")
+        if amount_out >= reserve_out:
+            raise QuoteError("ds-math-sub-underflow")
+        quotes.append(
+            scaled_reserve_in
+            * amount_out
+            // ((reserve_out - amount_out) * FEE_NUMERATOR)
+            + 1
+        )
+    return quotes
+
+
+def _hop_reserves(
+    reserves: PairReserves, token_in: str, token_out: str
+) -> Tuple[int, int]:
+    try:
+        return reserves[(token_in.lower(), token_out.lower())]
+    except KeyError:
+        raise QuoteError(f"No reserves for {token_in} -> {token_out}") from None
+
+
+def get_amounts_out(
+    amount_in: int, path: Sequence[str], reserves: PairReserves
+) -> List[int]:
+    """Same as `IPangolinRouter.getAmountsOut`"""
+    if len(path) < 2:
+        raise QuoteError("PangolinLibrary: INVALID_PATH")
+    amounts = [amount_in]
+    for token_in, token_out in zip(path, path[1:]):
+        amounts.append(
+            get_amount_out(amounts[-1], *_hop_reserves(reserves, token_in, token_out))
+        )
+    return amounts
+
+
+def get_amounts_in(
+    amount_out: int, path: Sequence[str], reserves: PairReserves
+) -> List[int]:
+    """Same as `IPangolinRouter.getAmountsIn`"""
+    if len(path) < 2:
+        raise QuoteError("PangolinLibrary: INVALID_PATH")
+    amounts = [amount_out]
+    for token_in, token_out in zip(reversed(path[:-1]), reversed(path[1:])):
+        amounts.append(
+            get_amount_in(amounts[-1], *_hop_reserves(reserves, token_in, token_out))
+        )
+    return amounts[::-1]
+
+
+def quote_batch(
+    requests: Iterable[Tuple[int, Sequence[str]]], reserves: PairReserves
+) -> List[List[int]]:
+    """`get_amounts_out` of many (amount_in, path) requests against one reserve set"""
+    return [get_amounts_out(amount_in, path, reserves) for amount_in, path in requests]
+
+
+def add_pair_reserves(
+    reserves: PairReserves, token0: str, token1: str, reserve0: int, reserve1: int
+):
+    token0, token1 = token0.lower(), token1.lower()
+    reserves[(token0, token1)] = (reserve0, reserve1)
+    reserves[(token1, token0)] = (reserve1, reserve0)
+
+
+def load_path_reserves(
+    factory, multicall, paths: Iterable[Sequence[str]]
+) -> PairReserves:
+    """Reserves of every pair along `paths`, read with two multicalls: one for the
+    pair addresses and one for their token0 and reserves
+    """
+    # imported here so the quote math stays usable without a brownie project
+    from brownie import interface
+
+    from .multicall import MulticallBatch
+
+    hops = sorted(
+        {
+            tuple(sorted((a.lower(), b.lower())))
+            for path in paths
+            for a, b in zip(path, path[1:])
+        }
+    )
+    batch = MulticallBatch(multicall)
+    for token_a, token_b in hops:
+        batch.add(factory.getPair, token_a, token_b)
+    pair_addresses = batch.execute()
+    for (token_a, token_b), address in zip(hops, pair_addresses):
+        if int(address, 16) == 0:
+            raise QuoteError(f"No pair for {token_a} and {token_b}")
+
+    batch = MulticallBatch(multicall)
+    pairs = [interface.IPangolinPair(address) for address in pair_addresses]
+    for pair in pairs:
+        batch.add(pair.token0)
+        batch.add(pair.getReserves)
+    results = batch.execute()
+
+    reserves: PairReserves = {}
+    for (token_a, token_b), token0, (reserve0, reserve1, _) in zip(
+        hops, results[0::2], results[1::2]
+    ):
+        token1 = token_b if token0.lower() == token_a else token_a
+        add_pair_reserves(reserves, token0, token1, reserve0, reserve1)
+    return reserves
@@ -0,0 +1,245 @@
+"""Time-weighted average Pangolin prices from the pairs' cumulative prices.
+
+    sampler = TwapSampler(NavEngine(factory, multicall, pangolin_factory, WAVAX))
+    sampler.track_vaults()
+    sampler.sample()  # e.g. every minute from a keeper
+    price = sampler.twap(WETH, WAVAX, window=3600)
+
+A swap moves the spot price for everyone reading it in the same block, while
+`price0CumulativeLast` and `price1CumulativeLast` only grow by the price times the
+time it held, so averaging them over a window costs a manipulator that price for
+the whole window. Every sample reads all tracked pairs in one multicall and
+extends their accumulators to the block timestamp with the current reserves, like
+the Uniswap V2 oracle library, so pairs nobody trades still get samples.
+
+Samples of a pair live in a `PriceRing`: fixed-size arrays written round robin,
+the oldest sample is overwritten once it is full. The TWAP over the last `n`
+samples is O(1), over an arbitrary time window O(log n) to find its ends.
+Accumulators are UQ112x112 and wrap around 2**256, timestamps wrap around 2**32,
+differences are taken modulo both like the pair does.
+"""
+
+import json
+from array import array
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from brownie import interface, web3
+
+from .multicall import MulticallBatch
+from .nav import NavEngine
+
+DEFAULT_CAPACITY = 1024
+Q112 = 2**112
+UINT256 = 2**256
+UINT32 = 2**32
+
+# (timestamp, price0 cumulative, price1 cumulative)
+Observation = Tuple[int, int, int]
+
+
+class PriceRing:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.timestamps = array("Q", [0] * capacity)
+        self.cumulative0: List[int] = [0] * capacity
+        self.cumulative1: List[int] = [0] * capacity
+        # slot of the oldest sample
+        self.start = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _slot(self, index: int) -> int:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return (self.start + index) % self.capacity
+
+    def append(self, timestamp: int, cumulative0: int, cumulative1: int) -> bool:
+        """Adds a sample, ignored (returns False) when it isn't newer than the last"""
+        if self.count and timestamp <= self.timestamps[self._slot(-1)]:
+            return False
+        if self.count < self.capacity:
+            slot = (self.start + self.count) % self.capacity
+            self.count += 1
+        else:
+            slot = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.timestamps[slot] = timestamp
+        self.cumulative0[slot] = cumulative0
+        self.cumulative1[slot] = cumulative1
+        return True
+
+    def observation(self, index: int) -> Observation:
+        """Sample `index`, 0 is the oldest and -1 the newest"""
+        slot = self._slot(index)
+        return self.timestamps[slot], self.cumulative0[slot], self.cumulative1[slot]
+
+    def index_at_or_before(self, timestamp: int) -> Optional[int]:
+        """Newest sample taken at or before `timestamp`, None when all are later"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamps[self._slot(middle)] <= timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low - 1 if low else None
+
+    def twap_between(self, first: int, last: int) -> Tuple[Fraction, Fraction]:
+        """Average price of token0 in token1 and of token1 in token0, in wei, between
+        samples `first` and `last`
+        """
+        t0, a0, b0 = self.observation(first)
+        t1, a1, b1 = self.observation(last)
+        elapsed = t1 - t0
+        if elapsed <= 0:
+            raise ValueError("The window must span two samples")
+        return (
+            Fraction((a1 - a0) % UINT256, elapsed * Q112),
+            Fraction((b1 - b0) % UINT256, elapsed * Q112),
+        )
+
+    def twap_last(self, samples: int) -> Tuple[Fraction, Fraction]:
+        """TWAP over the last `samples` intervals"""
+        return self.twap_between(-1 - samples, -1)
+
+    def twap(self, start: int, end: int) -> Tuple[Fraction, Fraction]:
+        """TWAP between the samples at or before `start` and `end`"""
+        first = self.index_at_or_before(start)
+        if first is None:
+            raise ValueError(f"No sample at or before {start}, the ring is too short")
+        return self.twap_between(first, self.index_at_or_before(end))
+
+    def to_json(self) -> dict:
+        observations = [self.observation(i) for i in range(self.count)]
+        return {
+            "capacity": self.capacity,
+            "observations": [[t, str(a), str(b)] for t, a, b in observations],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PriceRing":
+        ring = cls(data["capacity"])
+        for timestamp, cumulative0, cumulative1 in data["observations"]:
+            ring.append(timestamp, int(cumulative0), int(cumulative1))
+        return ring
+
+
+def current_cumulatives(
+    cumulative0: int,
+    cumulative1: int,
+    reserve0: int,
+    reserve1: int,
+    timestamp_last: int,
+    timestamp: int,
+) -> Tuple[int, int]:
+    """Accumulators as the pair would have them at `timestamp`, the same update as
+    `_update` with the reserves held since `timestamp_last`
+    """
+    elapsed = (timestamp - timestamp_last) % UINT32
+    if elapsed and reserve0 and reserve1:
+        cumulative0 = (cumulative0 + (reserve1 * Q112 // reserve0) * elapsed) % UINT256
+        cumulative1 = (cumulative1 + (reserve0 * Q112 // reserve1) * elapsed) % UINT256
+    return cumulative0, cumulative1
+
+
+class TwapSampler:
+    def __init__(self, engine: NavEngine, capacity: int = DEFAULT_CAPACITY):
+        self.engine = engine
+        self.capacity = capacity
+        # pair address -> (token0, token1), lowercase
+        self.tokens: Dict[str, Tuple[str, str]] = {}
+        self.rings: Dict[str, PriceRing] = {}
+        # sorted token pair -> pair address
+        self.pairs: Dict[Tuple[str, str], str] = {}
+
+    def track_vaults(self, vaults: Optional[List[str]] = None) -> List[str]:
+        """Starts sampling every pair that prices the assets of `vaults` (every vault
+        of the engine's factory by default), returns the tracked pairs
+        """
+        pairs = self.engine.vault_pairs(vaults)
+        new = sorted({p for p in pairs.values() if p.lower() not in self.tokens})
+        if new:
+            batch = MulticallBatch(self.engine.multicall)
+            for pair in new:
+                batch.add(interface.IPangolinPair(pair).token0)
+            for pair, token0 in zip(new, batch.execute()):
+                token0 = token0.lower()
+                tokens = next(t for t, a in pairs.items() if a == pair)
+                token1 = tokens[1] if tokens[0] == token0 else tokens[0]
+                self._add_pair(pair, token0, token1, PriceRing(self.capacity))
+        return sorted(self.tokens)
+
+    def _add_pair(self, pair: str, token0: str, token1: str, ring: PriceRing):
+        pair = pair.lower()
+        self.tokens[pair] = (token0, token1)
+        self.rings[pair] = ring
+        self.pairs[tuple(sorted((token0, token1)))] = pair
+
+    def sample(self) -> int:
+        """Records the accumulators of every tracked pair, returns the timestamp"""
+        pairs = sorted(self.tokens)
+        batch = MulticallBatch(self.engine.multicall)
+        for pair in pairs:
+            contract = interface.IPangolinPair(pair)
+            batch.add(contract.price0CumulativeLast)
+            batch.add(contract.price1CumulativeLast)
+            batch.add(contract.getReserves)
+        results = iter(batch.execute())
+        timestamp = web3.eth.get_block(batch.block_number)["timestamp"]
+        for pair in pairs:
+            cumulative0, cumulative1 = next(results), next(results)
+            reserve0, reserve1, timestamp_last = next(results)
+            self.rings[pair].append(
+                timestamp,
+                *current_cumulatives(
+                    cumulative0,
+                    cumulative1,
+                    reserve0,
+                    reserve1,
+                    timestamp_last,
+                    timestamp,
+                ),
+            )
+        return timestamp
+
+    def ring(self, token_a: str, token_b: str) -> PriceRing:
+        pair = self.pairs.get(tuple(sorted((token_a.lower(), token_b.lower()))))
+        if pair is None:
+            raise KeyError(f"{token_a}/{token_b} isn't tracked")
+        return self.rings[pair]
+
+    def twap(
+        self, base: str, quote: str, window: int, end: Optional[int] = None
+    ) -> Fraction:
+        """Average price of 1 wei of `base` in `quote` wei over the `window` seconds
+        before `end`, the newest sample by default
+        """
+        ring = self.ring(base, quote)
+        if end is None:
+            end = ring.observation(-1)[0]
+        price0, price1 = ring.twap(end - window, end)
+        pair = self.pairs[tuple(sorted((base.lower(), quote.lower())))]
+        return price0 if self.tokens[pair][0] == base.lower() else price1
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            pair: {"tokens": list(self.tokens[pair]), **ring.to_json()}
+            for pair, ring in self.rings.items()
+        }
+        with open(path, "w") as fp:
+            json.dump(data, fp)
+
+    def load(self, path):
+        """Restores the pairs and samples of `save`, replacing tracked ones"""
+        with open(path) as fp:
+            data = json.load(fp)
+        for pair, saved in data.items():
+            self._add_pair(pair, *saved["tokens"], PriceRing.from_json(saved))
@@ -0,0 +1,81 @@
+"""Off-chain CREATE2 address prediction for VaultFactory and VaultCloneFactory vaults.
+
+Mirrors `getVaultAddress` of both factories without any RPC call:
+
+    salt      = keccak256(abi.encodePacked(addresses, weights, trackingToken))
+    address   = keccak256(0xff ++ factory ++ salt ++ initCodeHash)[12:]
+
+VaultFactory deploys `FactoryImmutableVault`, whose init code has no constructor
+arguments, so the hash only depends on the build artifact and is computed once per
+artifact. Clones use the EIP-1167 init code of the factory's implementation.
+"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple, Union
+
+from eth_utils import keccak, to_checksum_address
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+VAULT_ARTIFACT = PROJECT_ROOT / "build" / "contracts" / "FactoryImmutableVault.json"
+
+# EIP-1167 creation code around the implementation address, as in OpenZeppelin Clones
+CLONE_PREFIX = bytes.fromhex("3d602d80600a3d3981f3363d3d373d3d3d363d73")
+CLONE_SUFFIX = bytes.fromhex("5af43d82803e903d91602b57fd5bf3")
+
+# (addresses, weights, trackingToken) as passed to createVault
+Basket = Tuple[Sequence[str], Sequence[int], str]
+
+
+def _address_bytes(address: str) -> bytes:
+    return bytes.fromhex(address[2:] if address.startswith("0x") else address)
+
+
+def vault_salt(
+    addresses: Sequence[str], weights: Sequence[int], tracking_token: str
+) -> bytes:
+    # encodePacked pads array elements to 32 bytes but not the trailing address
+    packed = b"".join(_address_bytes(a).rjust(32, b"\0") for a in addresses)
+    packed += b"".join(int(w).to_bytes(32, "big") for w in weights)
+    return keccak(packed + _address_bytes(tracking_token))
+
+
+@lru_cache(maxsize=None)
+def _hash_artifact(path: str, mtime_ns: int) -> bytes:
+    with open(path) as fp:
+        bytecode = json.load(fp)["bytecode"]
+    return keccak(hexstr=bytecode)
+
+
+def vault_init_code_hash(artifact: Union[str, Path] = VAULT_ARTIFACT) -> bytes:
+    """Init code hash of the vaults VaultFactory deploys, cached per build artifact
+    and recomputed when the artifact is rebuilt
+    """
+    path = os.fspath(artifact)
+    return _hash_artifact(path, os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=None)
+def clone_init_code_hash(implementation: str) -> bytes:
+    return keccak(CLONE_PREFIX + _address_bytes(implementation) + CLONE_SUFFIX)
+
+
+def create2_address(deployer: str, salt: bytes, init_code_hash: bytes) -> str:
+    digest = keccak(b"\xff" + _address_bytes(deployer) + salt + init_code_hash)
+    return to_checksum_address(digest[12:])
+
+
+def predict_vault_addresses(
+    factory: str, baskets: Iterable[Basket], init_code_hash: bytes
+) -> List[str]:
+    """Addresses the factory at `factory` deploys (or deployed) each basket at.
+    Use `vault_init_code_hash()` for VaultFactory and
+    `clone_init_code_hash(factory.implementation())` for VaultCloneFactory.
+    """
+    prefix = b"\xff" + _address_bytes(factory)
+    return [
+        to_checksum_address(keccak(prefix + vault_salt(*basket) + init_code_hash)[12:])
+        for basket in baskets
+    ]
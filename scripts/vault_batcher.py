@@ -0,0 +1,68 @@
+"""Operations and EIP-2612 permits for VaultBatcher.
+
+    batcher.executeWithPermits(
+        [sign_permit(WBTC, account, batcher, amount, deadline)],
+        [deposit_op(vault, shares, account)],
+        {"from": account},
+    )
+
+Permits are signed over the token's own `DOMAIN_SEPARATOR`, so they don't depend on
+the chain id the node reports (ganache-cli reports 1337 to web3 and 1 to contracts).
+"""
+
+from typing import Tuple
+
+from brownie import Contract
+from brownie.network.account import LocalAccount
+from eth_abi import encode_abi
+from eth_account import Account as EthAccount
+from eth_utils import keccak
+
+DEPOSIT = 0
+WITHDRAW = 1
+
+PERMIT_TYPEHASH = keccak(
+    text="Permit(address owner,address spender,uint256 value,uint256 nonce,uint256 deadline)"
+)
+
+# (vault, action, amount, to) and (token, value, deadline, v, r, s)
+Operation = Tuple[str, int, int, str]
+Permit = Tuple[str, int, int, int, bytes, bytes]
+
+
+def deposit_op(vault, amount: int, to) -> Operation:
+    return (str(vault), DEPOSIT, amount, str(to))
+
+
+def withdraw_op(vault, amount: int, to) -> Operation:
+    return (str(vault), WITHDRAW, amount, str(to))
+
+
+def permit_digest(
+    token: Contract, owner: str, spender: str, value: int, nonce: int, deadline: int
+) -> bytes:
+    struct_hash = keccak(
+        encode_abi(
+            ["bytes32", "address", "address", "uint256", "uint256", "uint256"],
+            [PERMIT_TYPEHASH, owner, spender, value, nonce, deadline],
+        )
+    )
+    return keccak(b"\x19\x01" + bytes(token.DOMAIN_SEPARATOR()) + struct_hash)
+
+
+def sign_permit(
+    token: Contract, owner: LocalAccount, spender, value: int, deadline: int
+) -> Permit:
+    """Permit letting `spender` pull `value` of `token` from `owner`"""
+    digest = permit_digest(
+        token, owner.address, str(spender), value, token.nonces(owner), deadline
+    )
+    signed = EthAccount.signHash(digest, owner.private_key)
+    return (
+        token.address,
+        value,
+        deadline,
+        signed.v,
+        signed.r.to_bytes(32, "big"),
+        signed.s.to_bytes(32, "big"),
+    )
@@ -0,0 +1,190 @@
+"""Off-chain model of `ImmutableVault` for capacity planning.
+
+The model follows the contract's integer semantics exactly: deposits pull
+`weights[i] * amount` of every asset, withdrawals pay `amount * balance /
+_totalSupply` of the vault's actual token balance, `reserves` are updated on both
+paths and every failing check reverts the whole operation with the same message
+the contract (or the OpenZeppelin ERC20 it calls) would give.
+
+State is kept in flat arrays: shares are indexed by holder, the vault's holdings
+and reserves by asset, and holder wallets by `[asset][holder]`. Holders are
+referenced by index in batches, use `holder()` to map addresses to indices.
+Amounts are uint256, so arrays are plain Python int lists rather than fixed-width
+numeric arrays. Allowances are not modelled, every holder is assumed to have
+approved the vault.
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+UINT256_MAX = 2**256 - 1
+
+DEPOSIT = 0
+WITHDRAW = 1
+TRANSFER = 2
+
+# (op, sender, to, amount), sender and to are holder indices
+Operation = Tuple[int, int, int, int]
+
+# holder index standing for address(0)
+ZERO_HOLDER = 0
+
+
+class VaultRevert(Exception):
+    def __init__(self, revert_msg: str):
+        super().__init__(revert_msg)
+        self.revert_msg = revert_msg
+
+
+class VaultSimulator:
+    def __init__(self, weights: Sequence[int]):
+        if len(weights) < 2:
+            raise VaultRevert("At least 2 tokens are needed")
+        self.weights: List[int] = [int(w) for w in weights]
+        self.reserves: List[int] = [0] * len(weights)
+        # actual token balances of the vault, they drift from reserves on donations
+        # and slashing
+        self.holdings: List[int] = [0] * len(weights)
+        self.total_supply = 0
+        self.shares: List[int] = []
+        self.wallets: List[List[int]] = [[] for _ in weights]
+        self.holder_index: Dict[Hashable, int] = {}
+        self.holder(ZERO_HOLDER)
+
+    def holder(self, address: Hashable) -> int:
+        """Index of `address`, registering it on first use"""
+        index = self.holder_index.get(address)
+        if index is None:
+            index = self.holder_index[address] = len(self.shares)
+            self.shares.append(0)
+            for wallet in self.wallets:
+                wallet.append(0)
+        return index
+
+    def fund(self, holder: int, asset: int, amount: int):
+        self.wallets[asset][holder] += amount
+
+    def donate(self, asset: int, amount: int, sender: Optional[int] = None):
+        """Tokens sent to the vault without going through deposit, out of the wallet
+        of `sender` when given
+        """
+        if sender is not None:
+            if self.wallets[asset][sender] < amount:
+                raise VaultRevert("ERC20: transfer amount exceeds balance")
+            self.wallets[asset][sender] -= amount
+        self.holdings[asset] += amount
+
+    def slash(self, asset: int):
+        """Burns the vault's balance of `asset`, like `SlashingERC20.slash`"""
+        self.holdings[asset] = 0
+
+    def deposit(self, sender: int, to: int, amount: int):
+        weights, wallets = self.weights, self.wallets
+        pulled = []
+        for i in range(len(weights)):
+            asset_amount = weights[i] * amount
+            if asset_amount > UINT256_MAX:
+                raise VaultRevert("Integer overflow")
+            if wallets[i][sender] < asset_amount:
+                raise VaultRevert("ERC20: transfer amount exceeds balance")
+            pulled.append(asset_amount)
+        if to == ZERO_HOLDER:
+            raise VaultRevert("ERC20: mint to the zero address")
+        if self.total_supply + amount > UINT256_MAX:
+            raise VaultRevert("Integer overflow")
+        for i, asset_amount in enumerate(pulled):
+            wallets[i][sender] -= asset_amount
+            self.holdings[i] += asset_amount
+            self.reserves[i] += asset_amount
+        self.total_supply += amount
+        self.shares[to] += amount
+
+    def withdraw(self, sender: int, to: int, amount: int):
+        total_supply = self.total_supply
+        if sender == ZERO_HOLDER:
+            raise VaultRevert("ERC20: burn from the zero address")
+        if self.shares[sender] < amount:
+            raise VaultRevert("ERC20: burn amount exceeds balance")
+        paid = []
+        for i in range(len(self.weights)):
+            numerator = amount * self.holdings[i]
+            if numerator > UINT256_MAX:
+                raise VaultRevert("Integer overflow")
+            if total_supply == 0:
+                raise VaultRevert("Division or modulo by zero")
+            token_amount = numerator // total_supply
+            if token_amount == 0:
+                raise VaultRevert("Insufficient token to transfer")
+            if to == ZERO_HOLDER:
+                raise VaultRevert("ERC20: transfer to the zero address")
+            if self.reserves[i] < token_amount:
+                raise VaultRevert("Integer overflow")
+            paid.append(token_amount)
+        self.shares[sender] -= amount
+        self.total_supply -= amount
+        for i, token_amount in enumerate(paid):
+            self.holdings[i] -= token_amount
+            self.reserves[i] -= token_amount
+            self.wallets[i][to] += token_amount
+
+    def transfer(self, sender: int, to: int, amount: int):
+        if sender == ZERO_HOLDER:
+            raise VaultRevert("ERC20: transfer from the zero address")
+        if to == ZERO_HOLDER:
+            raise VaultRevert("ERC20: transfer to the zero address")
+        if self.shares[sender] < amount:
+            raise VaultRevert("ERC20: transfer amount exceeds balance")
+        self.shares[sender] -= amount
+        self.shares[to] += amount
+
+    def apply(self, op: Operation):
+        kind, sender, to, amount = op
+        if kind == DEPOSIT:
+            self.deposit(sender, to, amount)
+        elif kind == WITHDRAW:
+            self.withdraw(sender, to, amount)
+        elif kind == TRANSFER:
+            self.transfer(sender, to, amount)
+        else:
+            raise ValueError(f"Unknown operation {kind}")
+
+    def apply_batch(self, ops: Iterable[Operation]) -> List[Optional[str]]:
+        """Applies `ops` in order, a reverted operation leaves the state untouched.
+        Returns the revert message of every operation, None for the successful ones.
+        """
+        results: List[Optional[str]] = []
+        append = results.append
+        apply = self.apply
+        for op in ops:
+            try:
+                apply(op)
+            except VaultRevert as exc:
+                append(exc.revert_msg)
+            else:
+                append(None)
+        return results
+
+    def apply_deposits(self, senders: Sequence[int], amounts: Sequence[int]) -> int:
+        """Fast path for a stream of self-deposits that are known to succeed, e.g.
+        replaying mined history. Checks balances for the whole batch up front and
+        applies it per asset column. Returns the number of shares minted.
+        """
+        minted = sum(amounts)
+        for i, weight in enumerate(self.weights):
+            wallet = self.wallets[i]
+            needed: Dict[int, int] = {}
+            for sender, amount in zip(senders, amounts):
+                needed[sender] = needed.get(sender, 0) + weight * amount
+            if any(wallet[s] < n for s, n in needed.items()):
+                raise VaultRevert("ERC20: transfer amount exceeds balance")
+        for i, weight in enumerate(self.weights):
+            wallet = self.wallets[i]
+            for sender, amount in zip(senders, amounts):
+                wallet[sender] -= weight * amount
+            pulled = weight * minted
+            self.holdings[i] += pulled
+            self.reserves[i] += pulled
+        shares = self.shares
+        for sender, amount in zip(senders, amounts):
+            shares[sender] += amount
+        self.total_supply += minted
+        return minted
@@ -0,0 +1,227 @@
+"""Plans VaultZap zap-ins and zap-outs with the exact-integer Pangolin quotes.
+
+    plan = plan_vault_zap_in(vault, WETH, 10**18, factory, multicall, WAVAX)
+    zap.zapIn(vault, WETH, plan.amount_in_max, plan.shares, plan.paths, account,
+              deadline, {"from": account})
+
+Swaps of one zap run one after the other and several of them may go through the same
+pair (e.g. WAVAX/WETH for every asset bought with WETH through WAVAX), so each
+swap is quoted against the reserves the previous ones leave behind. `slippage` is
+the price movement tolerated between planning and execution: a zap-in plan buys as
+many shares as `amount_in / (1 + slippage)` pays for and lets the contract spend up
+to `amount_in`, a zap-out plan requires at least `(1 - slippage)` of the quote.
+"""
+
+from fractions import Fraction
+from math import floor
+from typing import List, NamedTuple, Sequence
+
+from brownie import Contract, interface
+
+from .multicall import MulticallBatch
+from .pangolin_quotes import (
+    PairReserves,
+    QuoteError,
+    add_pair_reserves,
+    get_amounts_in,
+    get_amounts_out,
+    load_path_reserves,
+)
+
+DEFAULT_SLIPPAGE = Fraction(1, 200)
+
+# empty when the token is the asset itself
+Path = List[str]
+
+
+class ZapInPlan(NamedTuple):
+    shares: int
+    # input the swaps are quoted at
+    amount_in: int
+    # input sent to the zap, the unspent part is refunded
+    amount_in_max: int
+    paths: List[Path]
+    asset_amounts: List[int]
+
+
+class ZapOutPlan(NamedTuple):
+    shares: int
+    amount_out: int
+    amount_out_min: int
+    paths: List[Path]
+    asset_amounts: List[int]
+
+
+def _apply_swap(reserves: PairReserves, path: Path, amounts: Sequence[int]):
+    for token_in, token_out, amount_in, amount_out in zip(
+        path, path[1:], amounts, amounts[1:]
+    ):
+        reserve_in, reserve_out = reserves[(token_in.lower(), token_out.lower())]
+        add_pair_reserves(
+            reserves,
+            token_in,
+            token_out,
+            reserve_in + amount_in,
+            reserve_out - amount_out,
+        )
+
+
+def zap_in_cost(
+    shares: int, weights: Sequence[int], paths: Sequence[Path], reserves: PairReserves
+) -> int:
+    """Input the zap spends on `shares`, raises QuoteError when a pair can't cover it"""
+    reserves = dict(reserves)
+    cost = 0
+    for weight, path in zip(weights, paths):
+        amount = weight * shares
+        if not path:
+            cost += amount
+            continue
+        amounts = get_amounts_in(amount, path, reserves)
+        _apply_swap(reserves, path, amounts)
+        cost += amounts[0]
+    return cost
+
+
+def plan_zap_in(
+    weights: Sequence[int],
+    paths: Sequence[Path],
+    amount_in: int,
+    reserves: PairReserves,
+    slippage: Fraction = DEFAULT_SLIPPAGE,
+) -> ZapInPlan:
+    """Most shares `amount_in` buys with `slippage` to spare"""
+    budget = floor(amount_in / (1 + slippage))
+
+    def affordable(shares: int) -> bool:
+        try:
+            return zap_in_cost(shares, weights, paths, reserves) <= budget
+        except QuoteError:
+            return False
+
+    # the cost grows with the shares: double past the budget, then bisect
+    low, high = 0, 1
+    while affordable(high):
+        low, high = high, high * 2
+    while high - low > 1:
+        middle = (low + high) // 2
+        if affordable(middle):
+            low = middle
+        else:
+            high = middle
+    if low == 0:
+        raise QuoteError("Input too small for a single share")
+    return ZapInPlan(
+        low,
+        zap_in_cost(low, weights, paths, reserves),
+        amount_in,
+        list(paths),
+        [weight * low for weight in weights],
+    )
+
+
+def plan_zap_out(
+    shares: int,
+    total_supply: int,
+    balances: Sequence[int],
+    paths: Sequence[Path],
+    reserves: PairReserves,
+    slippage: Fraction = DEFAULT_SLIPPAGE,
+) -> ZapOutPlan:
+    # same rounding as the vault's withdraw
+    asset_amounts = [shares * balance // total_supply for balance in balances]
+    reserves = dict(reserves)
+    amount_out = 0
+    for amount, path in zip(asset_amounts, paths):
+        if not path:
+            amount_out += amount
+            continue
+        amounts = get_amounts_out(amount, path, reserves)
+        _apply_swap(reserves, path, amounts)
+        amount_out += amounts[-1]
+    return ZapOutPlan(
+        shares,
+        amount_out,
+        floor(amount_out * (1 - slippage)),
+        list(paths),
+        asset_amounts,
+    )
+
+
+def zap_paths(
+    factory: Contract,
+    multicall: Contract,
+    token: str,
+    assets: Sequence[str],
+    wavax: str,
+) -> List[Path]:
+    """Paths from `token` to every asset: direct when the pair exists, through WAVAX
+    otherwise. Reverse them for zap-outs.
+    """
+    batch = MulticallBatch(multicall)
+    swapped = [a for a in assets if a.lower() != token.lower()]
+    for asset in swapped:
+        batch.add(factory.getPair, token, asset)
+    direct = {
+        asset.lower(): int(pair, 16) != 0
+        for asset, pair in zip(swapped, batch.execute())
+    }
+    paths: List[Path] = []
+    for asset in assets:
+        if asset.lower() == token.lower():
+            paths.append([])
+        elif direct[asset.lower()] or wavax.lower() in (token.lower(), asset.lower()):
+            paths.append([token, asset])
+        else:
+            paths.append([token, wavax, asset])
+    return paths
+
+
+def _basket(multicall: Contract, vault: Contract):
+    length = vault.assetLength()
+    batch = MulticallBatch(multicall)
+    for i in range(length):
+        batch.add(vault.assets, i)
+        batch.add(vault.weights, i)
+    batch.add(vault.trackingToken)
+    batch.add(vault.totalSupply)
+    results = batch.execute()
+    assets, weights = results[0 : 2 * length : 2], results[1 : 2 * length : 2]
+    return assets, weights, results[-2], results[-1]
+
+
+def plan_vault_zap_in(
+    vault: Contract,
+    token_in: str,
+    amount_in: int,
+    factory: Contract,
+    multicall: Contract,
+    wavax: str,
+    slippage: Fraction = DEFAULT_SLIPPAGE,
+) -> ZapInPlan:
+    assets, weights, _, _ = _basket(multicall, vault)
+    paths = zap_paths(factory, multicall, token_in, assets, wavax)
+    reserves = load_path_reserves(factory, multicall, [p for p in paths if p])
+    return plan_zap_in(weights, paths, amount_in, reserves, slippage)
+
+
+def plan_vault_zap_out(
+    vault: Contract,
+    shares: int,
+    factory: Contract,
+    multicall: Contract,
+    wavax: str,
+    slippage: Fraction = DEFAULT_SLIPPAGE,
+) -> ZapOutPlan:
+    assets, _, tracking_token, total_supply = _basket(multicall, vault)
+    paths = [
+        path[::-1]
+        for path in zap_paths(factory, multicall, tracking_token, assets, wavax)
+    ]
+    reserves = load_path_reserves(factory, multicall, [p for p in paths if p])
+    batch = MulticallBatch(multicall)
+    for asset in assets:
+        batch.add(interface.IERC20(asset).balanceOf, vault)
+    return plan_zap_out(
+        shares, total_supply, batch.execute(), paths, reserves, slippage
+    )
@@ -1 +1,6 @@
-from .loader import PRICE_FEED_ABI
+from . import loader
+from .loader import load_abi
+
+
+def __getattr__(name: str):
+    return getattr(loader, name)
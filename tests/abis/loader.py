@@ -1,8 +1,19 @@
 import json
-import os
+from functools import lru_cache
+from pathlib import Path
+from typing import List
 
-__location__ = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
+ABI_DIR = Path(__file__).parent
 
 
-with open(os.path.join(__location__, "linkfeed.json"), "r") as fp:
-    PRICE_FEED_ABI = json.loads(fp.read())
+@lru_cache(maxsize=None)
+def load_abi(name: str) -> List[dict]:
+    """ABI of `<name>.json` next to this file, parsed on first use"""
+    with open(ABI_DIR / f"{name}.json") as fp:
+        return json.load(fp)
+
+
+def __getattr__(name: str):
+    if name == "PRICE_FEED_ABI":
+        return load_abi("linkfeed")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,15 +1,90 @@
 import pytest
-from brownie import Contract, Vault, VaultFactory
+from brownie import (
+    Contract,
+    ImmutableVault,
+    Multicall,
+    Vault,
+    VaultBatcher,
+    VaultCloneFactory,
+    VaultFactory,
+    VaultZap,
+    chain,
+)
 from brownie.network.account import Accounts
 
-from .abis import PRICE_FEED_ABI
+from scripts.contract_registry import REGISTRY
+from scripts.multicall import deploy_multicall, set_default_multicall
+
+from .abis import load_abi
+from .utils import parallel
+from .utils.dex import fund_token, pangolin_router
+from .utils.fuzz import FUZZ_STATS
+from .utils.local import deploy_local_dex, deploy_local_price_feed, is_forked_network
+from .utils.rpc_stats import RPC_STATS
+from .utils.state_cache import STATE_CACHE
+from .utils.tokens import TOKEN_ADDRESSES
 
 ETH_USD_PRICE_FEED: str = "0x976B3D034E162d8bD72D6b9C989d545b839003b0"
 
+# tokens every named account holds at the start of each test
+SESSION_BASKET = {
+    "WBTC": int(2e8),
+    "WETH": int(30e18),
+}
+
+
+def pytest_configure(config):
+    parallel.configure(config)
+
+
+def pytest_sessionfinish(session):
+    parallel.send_worker_stats(session.config)
+
+
+def pytest_terminal_summary(terminalreporter):
+    lines = RPC_STATS.summary()
+    if lines:
+        terminalreporter.section("fixture layer")
+        for line in lines:
+            terminalreporter.write_line(line)
+    lines = FUZZ_STATS.summary()
+    if lines:
+        terminalreporter.section("fuzz campaigns")
+        for line in lines:
+            terminalreporter.write_line(line)
+    lines = STATE_CACHE.summary()
+    if lines:
+        terminalreporter.section("chain state cache")
+        for line in lines:
+            terminalreporter.write_line(line)
+
+
+@pytest.fixture(scope="session")
+def state_cache():
+    """Restores the session state a previous run prepared, when it is still valid"""
+    RPC_STATS.install()
+    with RPC_STATS.measure("state_cache"):
+        STATE_CACHE.start()
+    yield STATE_CACHE
+
+
+@pytest.fixture(scope="session", autouse=True)
+def local_dex(state_cache, owner):
+    """Deploys the offline Pangolin/WAVAX stand-in unless the suite runs on a fork"""
+    if not is_forked_network() and not state_cache.restored:
+        deploy_local_dex(owner)
+    yield
+
 
 @pytest.fixture(scope="session")
-def eth_usd_price_feed():
-    yield Contract.from_abi("ChainlinkFeed", ETH_USD_PRICE_FEED, PRICE_FEED_ABI)
+def eth_usd_price_feed(state_cache, owner):
+    if is_forked_network():
+        address = ETH_USD_PRICE_FEED
+    else:
+        address = state_cache.address(
+            "eth_usd_price_feed", lambda: deploy_local_price_feed(owner)
+        )
+    yield REGISTRY.contract("ChainlinkFeed", address, load_abi("linkfeed"))
 
 
 @pytest.fixture(scope="session")
@@ -42,11 +117,120 @@ def owner(accounts: Accounts):
     yield accounts[0]
 
 
-@pytest.fixture(scope="function")
-def vault(Vault, owner):
-    yield Vault.deploy({"from": owner})
+@pytest.fixture(scope="session")
+def funded_accounts(state_cache, local_dex, alice, bob, charlie, dave, erin):
+    """Funds the named accounts with `SESSION_BASKET` once per session"""
+    funded = [alice, bob, charlie, dave, erin]
+    if state_cache.restored:
+        yield funded
+        return
+    for account in funded:
+        for symbol, amount in SESSION_BASKET.items():
+            with RPC_STATS.measure("fund_token"):
+                fund_token(TOKEN_ADDRESSES[symbol], account, amount)
+    yield funded
+
+
+@pytest.fixture(scope="session")
+def wbtc_weth_vault(state_cache, local_dex, owner):
+    """Canonical WBTC/WETH vault, 1 WBTC satoshi and 15e10 WETH wei per share"""
+    with RPC_STATS.measure("deploy"):
+        deployed = state_cache.deployment(
+            "wbtc_weth_vault",
+            ImmutableVault,
+            lambda: ImmutableVault.deploy(
+                [TOKEN_ADDRESSES["WBTC"], TOKEN_ADDRESSES["WETH"]],
+                [1, 15e10],
+                TOKEN_ADDRESSES["WAVAX"],
+                {"from": owner},
+            ),
+        )
+    yield deployed
+
+
+@pytest.fixture(scope="session")
+def vault(state_cache, owner):
+    with RPC_STATS.measure("deploy"):
+        deployed = state_cache.deployment(
+            "vault", Vault, lambda: Vault.deploy({"from": owner})
+        )
+    yield deployed
+
+
+@pytest.fixture(scope="session")
+def vault_factory(state_cache, owner):
+    with RPC_STATS.measure("deploy"):
+        deployed = state_cache.deployment(
+            "vault_factory", VaultFactory, lambda: VaultFactory.deploy({"from": owner})
+        )
+    yield deployed
+
+
+@pytest.fixture(scope="session")
+def vault_clone_factory(state_cache, owner):
+    with RPC_STATS.measure("deploy"):
+        deployed = state_cache.deployment(
+            "vault_clone_factory",
+            VaultCloneFactory,
+            lambda: VaultCloneFactory.deploy({"from": owner}),
+        )
+    yield deployed
+
+
+@pytest.fixture(scope="session")
+def multicall(state_cache, owner):
+    """Multicall used by the balance checks to batch their reads"""
+    with RPC_STATS.measure("deploy"):
+        deployed = state_cache.deployment(
+            "multicall", Multicall, lambda: deploy_multicall(owner)
+        )
+    set_default_multicall(deployed)
+    yield deployed
+
+
+@pytest.fixture(scope="session")
+def zap(state_cache, local_dex, owner):
+    with RPC_STATS.measure("deploy"):
+        deployed = state_cache.deployment(
+            "zap", VaultZap, lambda: VaultZap.deploy(pangolin_router(), {"from": owner})
+        )
+    yield deployed
 
 
-@pytest.fixture(scope="function")
-def vault_factory(owner):
-    yield VaultFactory.deploy({"from": owner})
+@pytest.fixture(scope="session")
+def batcher(state_cache, owner):
+    with RPC_STATS.measure("deploy"):
+        deployed = state_cache.deployment(
+            "batcher", VaultBatcher, lambda: VaultBatcher.deploy({"from": owner})
+        )
+    yield deployed
+
+
+@pytest.fixture(scope="session")
+def session_snapshot(
+    state_cache,
+    local_dex,
+    eth_usd_price_feed,
+    funded_accounts,
+    wbtc_weth_vault,
+    vault,
+    vault_factory,
+    vault_clone_factory,
+    multicall,
+    zap,
+    batcher,
+):
+    """Takes the snapshot every test reverts to, once all session state is on chain.
+    A cold start saves that state for the next sessions first.
+    """
+    with RPC_STATS.measure("state_cache"):
+        state_cache.finish()
+    chain.snapshot()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def isolation(session_snapshot):
+    with RPC_STATS.measure("test"):
+        yield
+        chain.revert()
@@ -0,0 +1,250 @@
+"""Random deposit, withdraw and transfer sequences against `ImmutableVault`, checked
+against `VaultSimulator` and the vault invariants after every step.
+"""
+
+import copy
+
+import pytest
+from brownie import ZERO_ADDRESS, Contract, ImmutableVault, MockERC20, SlashingERC20
+from brownie.exceptions import VirtualMachineError
+from brownie.test import strategy
+
+from scripts.multicall import MulticallBatch
+from scripts.vault_sim import (
+    DEPOSIT,
+    TRANSFER,
+    WITHDRAW,
+    ZERO_HOLDER,
+    VaultRevert,
+    VaultSimulator,
+)
+
+from ..utils.fuzz import run_campaign
+
+# shares worth of every asset each holder starts with
+FUNDED_SHARES = 10**4
+HOLDERS = 5
+
+METHODS = {DEPOSIT: "deposit", WITHDRAW: "withdraw"}
+TO_METHODS = {DEPOSIT: "depositTo", WITHDRAW: "withdrawTo", TRANSFER: "transfer"}
+
+# name -> (weights, decimals, whether the second asset is a SlashingERC20)
+VAULTS = {
+    "rounding": ([1, 3], (0, 0), False),
+    "skewed": ([1, 15 * 10**10], (8, 18), False),
+    "slashing": ([2, 5], (6, 18), True),
+}
+
+
+class VaultInvariants:
+    st_sender = strategy("uint", max_value=HOLDERS - 1)
+    # HOLDERS stands for address(0)
+    st_to = strategy("uint", max_value=HOLDERS)
+    st_amount = strategy("uint256", max_value=2 * FUNDED_SHARES)
+    st_asset = strategy("uint", max_value=1)
+    st_explicit_to = strategy("bool")
+
+    def __init__(cls, vault, tokens, holders, multicall, slashable):
+        cls.vault = vault
+        cls.tokens = tokens
+        cls.holders = holders
+        cls.multicall = multicall
+        cls.slashable = slashable
+        cls.weights = [vault.weights(i) for i in range(len(tokens))]
+        cls.initial_sim = VaultSimulator(cls.weights)
+        for i, token in enumerate(tokens):
+            for holder in holders:
+                cls.initial_sim.fund(
+                    cls.initial_sim.holder(holder.address),
+                    i,
+                    token.balanceOf(holder),
+                )
+
+    def setup(self):
+        self.campaign.examples += 1
+        self.sim = copy.deepcopy(self.initial_sim)
+        # assets whose vault balance was changed outside deposit and withdraw
+        self.disturbed = set()
+        self.withdrawal = None
+        self.state = self.read_state()
+
+    def address(self, holder: int) -> str:
+        return ZERO_ADDRESS if holder == HOLDERS else self.holders[holder].address
+
+    def sim_holder(self, holder: int) -> int:
+        return (
+            ZERO_HOLDER if holder == HOLDERS else self.sim.holder(self.address(holder))
+        )
+
+    def run(self, kind: int, sender: int, to: int, amount: int, explicit_to: bool):
+        """Sends the operation to the vault and the simulator, they must agree on
+        whether (and why) it reverts
+        """
+        self.campaign.steps += 1
+        if not explicit_to:
+            to = sender
+        if explicit_to or kind == TRANSFER:
+            method = getattr(self.vault, TO_METHODS[kind])
+            args = (self.address(to), amount)
+        else:
+            method = getattr(self.vault, METHODS[kind])
+            args = (amount,)
+        try:
+            method(*args, {"from": self.holders[sender]})
+            chain_revert = None
+        except VirtualMachineError as exc:
+            chain_revert = exc.revert_msg
+        try:
+            self.sim.apply((kind, self.sim_holder(sender), self.sim_holder(to), amount))
+            sim_revert = None
+        except VaultRevert as exc:
+            sim_revert = exc.revert_msg
+        assert chain_revert == sim_revert, (kind, sender, to, amount)
+        return chain_revert is None
+
+    def rule_deposit(self, st_sender, st_to, st_amount, st_explicit_to):
+        self.run(DEPOSIT, st_sender, st_to, st_amount, st_explicit_to)
+
+    def rule_withdraw(self, st_sender, st_to, st_amount, st_explicit_to):
+        before = self.state
+        if self.run(WITHDRAW, st_sender, st_to, st_amount, st_explicit_to):
+            to = st_to if st_explicit_to else st_sender
+            self.withdrawal = (to, st_amount, before)
+
+    def rule_transfer(self, st_sender, st_to, st_amount):
+        self.run(TRANSFER, st_sender, st_to, st_amount, True)
+
+    def rule_donate(self, st_sender, st_asset, st_amount):
+        """Tokens sent straight to the vault"""
+        self.campaign.steps += 1
+        try:
+            self.tokens[st_asset].transfer(
+                self.vault, st_amount, {"from": self.holders[st_sender]}
+            )
+            chain_revert = None
+        except VirtualMachineError as exc:
+            chain_revert = exc.revert_msg
+        try:
+            self.sim.donate(st_asset, st_amount, self.sim_holder(st_sender))
+            sim_revert = None
+        except VaultRevert as exc:
+            sim_revert = exc.revert_msg
+        assert chain_revert == sim_revert
+        if chain_revert is None and st_amount:
+            self.disturbed.add(st_asset)
+
+    def rule_slash(self):
+        """Burns the vault's balance of the slashing token"""
+        if not self.slashable:
+            return
+        self.campaign.steps += 1
+        self.tokens[1].slash(self.vault, {"from": self.holders[0]})
+        self.sim.slash(1)
+        self.disturbed.add(1)
+
+    def read_state(self) -> dict:
+        batch = MulticallBatch(self.multicall)
+        batch.add(self.vault.totalSupply)
+        for holder in self.holders:
+            batch.add(self.vault.balanceOf, holder)
+        for i, token in enumerate(self.tokens):
+            batch.add(self.vault.reserves, i)
+            batch.add(token.balanceOf, self.vault)
+            batch.add(token.totalSupply)
+            for holder in self.holders:
+                batch.add(token.balanceOf, holder)
+        results = iter(batch.execute())
+        state = {
+            "total_supply": next(results),
+            "shares": [next(results) for _ in self.holders],
+            "assets": [],
+        }
+        for _ in self.tokens:
+            state["assets"].append(
+                {
+                    "reserve": next(results),
+                    "holding": next(results),
+                    "token_supply": next(results),
+                    "wallets": [next(results) for _ in self.holders],
+                }
+            )
+        return state
+
+    def invariant_vault(self):
+        state = self.state = self.read_state()
+        sim = self.sim
+        supply = state["total_supply"]
+
+        # the vault behaves like the model
+        assert supply == sim.total_supply
+        assert state["shares"] == [
+            sim.shares[sim.holder(h.address)] for h in self.holders
+        ]
+        for i, asset in enumerate(state["assets"]):
+            assert asset["reserve"] == sim.reserves[i]
+            assert asset["holding"] == sim.holdings[i]
+            assert asset["wallets"] == [
+                sim.wallets[i][sim.holder(h.address)] for h in self.holders
+            ]
+
+        # every share belongs to someone
+        assert supply == sum(state["shares"])
+        for i, asset in enumerate(state["assets"]):
+            # no token is created or lost, only slashing burns them
+            assert asset["token_supply"] == asset["holding"] + sum(asset["wallets"])
+            # reserves track balances until tokens move outside the vault's control
+            if i not in self.disturbed:
+                assert asset["reserve"] == asset["holding"] == self.weights[i] * supply
+
+        if self.withdrawal is not None:
+            self.check_pro_rata(*self.withdrawal, state)
+            self.withdrawal = None
+
+    def check_pro_rata(self, to: int, amount: int, before: dict, after: dict):
+        """A withdrawal pays its share of every asset, rounded down by less than one
+        token unit, so the remaining holders are never diluted
+        """
+        supply = before["total_supply"]
+        for asset_before, asset_after in zip(before["assets"], after["assets"]):
+            holding = asset_before["holding"]
+            paid = asset_after["wallets"][to] - asset_before["wallets"][to]
+            assert paid == holding - asset_after["holding"]
+            assert paid * supply <= amount * holding < (paid + 1) * supply
+
+
+def deploy_vault(name: str, owner, holders):
+    weights, decimals, slashable = VAULTS[name]
+    tokens = [MockERC20.deploy("Fuzz A", "FZA", decimals[0], {"from": owner})]
+    supply = weights[1] * FUNDED_SHARES * len(holders)
+    if slashable:
+        tokens.append(SlashingERC20.deploy(supply, {"from": owner}))
+    else:
+        tokens.append(MockERC20.deploy("Fuzz B", "FZB", decimals[1], {"from": owner}))
+        tokens[1].mint(owner, supply, {"from": owner})
+    vault = ImmutableVault.deploy(tokens, weights, tokens[0], {"from": owner})
+    for holder in holders:
+        tokens[0].mint(holder, weights[0] * FUNDED_SHARES, {"from": owner})
+        tokens[1].transfer(holder, weights[1] * FUNDED_SHARES, {"from": owner})
+        for token in tokens:
+            token.approve(vault, 2**256 - 1, {"from": holder})
+    return vault, tokens
+
+
+@pytest.mark.parametrize("name", VAULTS)
+def test_vault_invariants(
+    state_machine, name, multicall: Contract, owner, alice, bob, charlie, dave, erin
+):
+    holders = [alice, bob, charlie, dave, erin]
+    assert len(holders) == HOLDERS
+    vault, tokens = deploy_vault(name, owner, holders)
+    campaign = run_campaign(
+        state_machine,
+        f"vault invariants ({name})",
+        VaultInvariants,
+        vault,
+        tokens,
+        holders,
+        multicall,
+        VAULTS[name][2],
+    )
+    assert campaign.examples > 0
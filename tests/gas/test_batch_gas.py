@@ -0,0 +1,11 @@
+from brownie.network.account import Account
+
+from scripts.benchmarks.batch_gas import measure_batch_gas
+
+
+def test_batching_amortizes_gas(owner: Account, alice: Account):
+    report = measure_batch_gas(owner, alice, batch_sizes=(1, 4, 16))
+    for op in ("deposit", "withdraw"):
+        by_size = report[op]
+        assert by_size[4] < by_size[1]
+        assert by_size[16] < by_size[4]
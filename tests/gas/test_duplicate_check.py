@@ -0,0 +1,39 @@
+from brownie import AssetCheckHarness, reverts
+from brownie.network.account import Account
+
+from scripts.benchmarks.duplicate_check_gas import (
+    measure_duplicate_check,
+    random_addresses,
+)
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def test_rejects_repeating_token_anywhere(owner: Account):
+    harness = AssetCheckHarness.deploy({"from": owner})
+    addresses = random_addresses(40)
+    assert harness.checkAssets(addresses)
+    for i, j in [(0, 1), (0, 39), (17, 23), (38, 39)]:
+        repeated = list(addresses)
+        repeated[j] = repeated[i]
+        with reverts("Repeating token not supported"):
+            harness.checkAssets(repeated)
+    assert harness.checkAssets([ZERO_ADDRESS] + addresses)
+    with reverts("Repeating token not supported"):
+        harness.checkAssets([ZERO_ADDRESS] + addresses + [ZERO_ADDRESS])
+
+
+def test_rejects_colliding_slots(owner: Account):
+    harness = AssetCheckHarness.deploy({"from": owner})
+    # same low bits, every address probes past the previous ones
+    addresses = [f"0x{i:02x}" + "00" * 18 + "01" for i in range(1, 9)]
+    assert harness.checkAssets(addresses)
+    with reverts("Repeating token not supported"):
+        harness.checkAssets(addresses + [addresses[3]])
+
+
+def test_duplicate_check_scales_linearly(owner: Account):
+    curve = measure_duplicate_check(owner)["linear"]
+    per_asset_16_32 = (curve[32] - curve[16]) / 16
+    per_asset_32_64 = (curve[64] - curve[32]) / 32
+    assert per_asset_32_64 < 1.5 * per_asset_16_32
@@ -0,0 +1,40 @@
+from brownie.network.account import Account
+
+from scripts.benchmarks.vault_gas_profile import profile_vault_ops, write_profiles
+from scripts.gas_profiler import OVERHEAD_FRAME, opcode_costs
+
+
+def test_opcode_costs_exclude_callee_gas():
+    trace = [
+        {"op": "PUSH1", "depth": 1, "gas": 1000, "gasCost": 3},
+        {"op": "CALL", "depth": 1, "gas": 997, "gasCost": 900},
+        {"op": "SLOAD", "depth": 2, "gas": 800, "gasCost": 100},
+        {"op": "STOP", "depth": 2, "gas": 700, "gasCost": 0},
+        {"op": "POP", "depth": 1, "gas": 600, "gasCost": 2},
+    ]
+    # the call lost 397 gas, 100 of them in the callee's SLOAD
+    assert opcode_costs(trace) == [3, 297, 100, 0, 2]
+
+
+def test_profile_adds_up_to_gas_used(
+    owner: Account, alice: Account, bob: Account, tmp_path
+):
+    profiles = profile_vault_ops(owner, alice, bob, count=2)
+    for profile in profiles.values():
+        assert sum(profile.stacks.values()) == profile.gas_used
+        assert sum(profile.self_gas.values()) == profile.gas_used
+
+    deposit = profiles["deposit"]
+    functions = set(deposit.self_gas)
+    assert {"BaseImmutableVault._deposit", "ERC20._mint"} <= functions
+    assert any(fn.endswith(".transferFrom") for fn in functions)
+    assert deposit.inclusive_gas["BaseImmutableVault._deposit"] > (
+        deposit.inclusive_gas["ERC20._mint"]
+    )
+    assert any(line for _, line in deposit.line_gas)
+
+    write_profiles(profiles, 2, tmp_path)
+    folded = (tmp_path / "withdraw_2.folded").read_text().splitlines()
+    assert any("BaseImmutableVault._withdraw" in line for line in folded)
+    assert any(line.startswith(OVERHEAD_FRAME) for line in folded)
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in folded)
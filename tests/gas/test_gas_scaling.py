@@ -0,0 +1,30 @@
+import pytest
+from brownie.network.account import Account
+
+from scripts.benchmarks.gas_scaling import (
+    find_regressions,
+    load_baseline,
+    measure_gas_scaling,
+    write_report,
+)
+
+
+def test_gas_scaling_does_not_regress(owner: Account, bob: Account, alice: Account):
+    report = measure_gas_scaling(owner, bob, alice)
+    write_report(report)
+    baseline = load_baseline()
+    if not baseline["gas"]:
+        pytest.skip(
+            "gas_baseline.json has no measurements yet, record them with "
+            "`brownie run benchmarks/gas_scaling update_baseline`"
+        )
+    regressions = find_regressions(report, baseline)
+    assert not regressions, "\n".join(regressions)
+
+
+def test_find_regressions_uses_threshold():
+    baseline = {"threshold": 0.05, "gas": {"deposit": {"2": 100_000}}}
+    assert find_regressions({"deposit": {"2": 105_000}}, baseline) == []
+    assert len(find_regressions({"deposit": {"2": 105_001}}, baseline)) == 1
+    missing = find_regressions({"deposit": {"4": 1_000_000}}, baseline)
+    assert len(missing) == 1 and "not in the baseline" in missing[0]
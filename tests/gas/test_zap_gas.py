@@ -0,0 +1,24 @@
+from brownie import ImmutableVault
+
+from scripts.benchmarks.zap_gas import compare_zap
+
+from ..utils.tokens import TOKEN_ADDRESSES
+
+
+def test_zap_is_cheaper_than_per_asset_flow(zap, vault_factory, multicall, alice):
+    tx = vault_factory.createVault(
+        [TOKEN_ADDRESSES["WBTC"], TOKEN_ADDRESSES["WETH"], TOKEN_ADDRESSES["LINK"]],
+        [1, 15e10, 3e12],
+        TOKEN_ADDRESSES["WAVAX"],
+        {"from": alice},
+    )
+    vault = ImmutableVault.at(tx.events["VaultCreated"]["vault"])
+    costs = compare_zap(
+        zap, vault, TOKEN_ADDRESSES["WETH"], int(2e18), multicall, alice
+    )
+    base, zapped = costs["per-asset"], costs["zap"]
+    assert zapped.transactions == 2
+    assert base.transactions == 1 + 2 + 3 + 1
+    assert zapped.gas < base.gas
+    # same swaps, the zap only saves transactions
+    assert abs(zapped.price_impact - base.price_impact) < 0.001
@@ -1,9 +1,8 @@
-from brownie import Contract, ImmutableVault, SlashingERC20, interface, reverts
+from brownie import Contract, ImmutableVault, SlashingERC20, reverts
 from brownie.network.account import Account
 
 from ...utils.checks import assert_balance_change
-from ...utils.dex import fund_token
-from ...utils.tokens import TOKEN_ADDRESSES, clean_balance
+from ...utils.tokens import TOKEN_ADDRESSES, clean_balance, erc20
 
 
 def test_deploy(owner: Account):
@@ -13,8 +12,8 @@ def test_deploy(owner: Account):
     my_vault: Contract = ImmutableVault.deploy(
         [WBTC_addr, WETH_addr], [1, 15], WAVAX_addr, {"from": owner}
     )
-    WBTC: Contract = interface.IERC20(WBTC_addr)
-    WETH: Contract = interface.IERC20(WETH_addr)
+    WBTC: Contract = erc20(WBTC_addr)
+    WETH: Contract = erc20(WETH_addr)
 
     assert my_vault.assetLength() == 2
     assert my_vault.assets(0) == WBTC_addr
@@ -45,23 +44,17 @@ def test_assets_and_weights_must_match(owner: Account, bob: Account):
         )
 
 
-def test_deposit(owner: Account, bob: Account):
+def test_deposit(owner: Account, bob: Account, wbtc_weth_vault: Contract):
     WBTC_addr = TOKEN_ADDRESSES["WBTC"]
     WETH_addr = TOKEN_ADDRESSES["WETH"]
-    WAVAX_addr = TOKEN_ADDRESSES["WAVAX"]
-    my_vault: Contract = ImmutableVault.deploy(
-        [WBTC_addr, WETH_addr], [1, 15e10], WAVAX_addr, {"from": owner}
-    )
-    WBTC: Contract = interface.IERC20(WBTC_addr)
-    WETH: Contract = interface.IERC20(WETH_addr)
-    PGV: Contract = interface.IERC20(my_vault.address)
+    my_vault: Contract = wbtc_weth_vault
+    WBTC: Contract = erc20(WBTC_addr)
+    WETH: Contract = erc20(WETH_addr)
+    PGV: Contract = erc20(my_vault.address)
     # wbtc has only 8 decimals opposed to the default 18 decimals
-    # funds 1 wbtc
+    # 1 wbtc and 15 weth, bob is funded by the session basket
     wbtc_amount = int(1e8)
-    fund_token(WBTC_addr, bob, wbtc_amount)
-    # funds 15 weth
     weth_amount = int(15e18)
-    fund_token(WETH_addr, bob, weth_amount)
     WBTC.approve(my_vault.address, 1e40, {"from": bob})
     WETH.approve(my_vault.address, 1e40, {"from": bob})
     with assert_balance_change(
@@ -75,23 +68,19 @@ def test_deposit(owner: Account, bob: Account):
     assert my_vault.symbol() == "PGV"
 
 
-def test_deposit_from_to(owner: Account, bob: Account, alice: Account):
+def test_deposit_from_to(
+    owner: Account, bob: Account, alice: Account, wbtc_weth_vault: Contract
+):
     WBTC_addr = TOKEN_ADDRESSES["WBTC"]
     WETH_addr = TOKEN_ADDRESSES["WETH"]
-    WAVAX_addr = TOKEN_ADDRESSES["WAVAX"]
-    my_vault: Contract = ImmutableVault.deploy(
-        [WBTC_addr, WETH_addr], [1, 15e10], WAVAX_addr, {"from": owner}
-    )
-    WBTC: Contract = interface.IERC20(WBTC_addr)
-    WETH: Contract = interface.IERC20(WETH_addr)
-    PGV: Contract = interface.IERC20(my_vault.address)
+    my_vault: Contract = wbtc_weth_vault
+    WBTC: Contract = erc20(WBTC_addr)
+    WETH: Contract = erc20(WETH_addr)
+    PGV: Contract = erc20(my_vault.address)
     # wbtc has only 8 decimals opposed to the default 18 decimals
-    # funds 1 wbtc
+    # 1 wbtc and 15 weth, bob is funded by the session basket
     wbtc_amount = int(1e8)
-    fund_token(WBTC_addr, bob, wbtc_amount)
-    # funds 15 weth
     weth_amount = int(15e18)
-    fund_token(WETH_addr, bob, weth_amount)
     WBTC.approve(my_vault.address, 1e40, {"from": bob})
     WETH.approve(my_vault.address, 1e40, {"from": bob})
     bob_expected_balance = {WBTC: -wbtc_amount, WETH: -weth_amount, PGV: 0}
@@ -105,23 +94,19 @@ def test_deposit_from_to(owner: Account, bob: Account, alice: Account):
     assert my_vault.totalSupply() == wbtc_amount
 
 
-def test_withdraw_from_to(owner: Account, bob: Account, alice: Account):
+def test_withdraw_from_to(
+    owner: Account, bob: Account, alice: Account, wbtc_weth_vault: Contract
+):
     WBTC_addr = TOKEN_ADDRESSES["WBTC"]
     WETH_addr = TOKEN_ADDRESSES["WETH"]
-    WAVAX_addr = TOKEN_ADDRESSES["WAVAX"]
-    my_vault: Contract = ImmutableVault.deploy(
-        [WBTC_addr, WETH_addr], [1, 15e10], WAVAX_addr, {"from": owner}
-    )
-    WBTC: Contract = interface.IERC20(WBTC_addr)
-    WETH: Contract = interface.IERC20(WETH_addr)
-    PGV: Contract = interface.IERC20(my_vault.address)
+    my_vault: Contract = wbtc_weth_vault
+    WBTC: Contract = erc20(WBTC_addr)
+    WETH: Contract = erc20(WETH_addr)
+    PGV: Contract = erc20(my_vault.address)
     # wbtc has only 8 decimals opposed to the default 18 decimals
-    # funds 1 wbtc
+    # 1 wbtc and 15 weth, bob is funded by the session basket
     wbtc_amount = int(1e8)
-    fund_token(WBTC_addr, bob, wbtc_amount)
-    # funds 15 weth
     weth_amount = int(15e18)
-    fund_token(WETH_addr, bob, weth_amount)
     WBTC.approve(my_vault.address, 1e40, {"from": bob})
     WETH.approve(my_vault.address, 1e40, {"from": bob})
     my_vault.depositTo(alice.address, wbtc_amount, {"from": bob})
@@ -135,13 +120,10 @@ def test_withdraw_from_to(owner: Account, bob: Account, alice: Account):
     assert my_vault.totalSupply() == 0
 
 
-def test_cant_withdraw_without_balance(owner: Account, bob: Account):
-    WBTC_addr = TOKEN_ADDRESSES["WBTC"]
-    WETH_addr = TOKEN_ADDRESSES["WETH"]
-    WAVAX_addr = TOKEN_ADDRESSES["WAVAX"]
-    my_vault: Contract = ImmutableVault.deploy(
-        [WBTC_addr, WETH_addr], [1, 15e10], WAVAX_addr, {"from": owner}
-    )
+def test_cant_withdraw_without_balance(
+    owner: Account, bob: Account, wbtc_weth_vault: Contract
+):
+    my_vault: Contract = wbtc_weth_vault
     with reverts():
         my_vault.withdraw(1e18, {"from": bob})
 
@@ -158,12 +140,11 @@ def test_cant_withdraw_corrupted_balance(owner: Account, bob: Account):
     wbtc_amount = int(1e8)
     slash_amount = int(15e18)
     SLASH: Contract = SlashingERC20.deploy(slash_amount, {"from": owner})
-    WBTC: Contract = interface.IERC20(WBTC_addr)
+    WBTC: Contract = erc20(WBTC_addr)
     SLASH.transfer(bob.address, slash_amount, {"from": owner})
     my_vault: Contract = ImmutableVault.deploy(
         [WBTC_addr, SLASH.address], [1, 15e10], WAVAX_addr, {"from": owner}
     )
-    fund_token(WBTC_addr, bob, wbtc_amount)
     WBTC.approve(my_vault.address, 1e40, {"from": bob})
     SLASH.approve(my_vault.address, 1e40, {"from": bob})
     my_vault.deposit(wbtc_amount, {"from": bob})
@@ -176,20 +157,18 @@ def test_cant_withdraw_corrupted_balance(owner: Account, bob: Account):
         my_vault.withdrawTo(owner.address, wbtc_amount, {"from": bob})
 
 
-def test_cant_deposit_without_balance_on_all_tokens(owner: Account, bob: Account):
+def test_cant_deposit_without_balance_on_all_tokens(
+    owner: Account, bob: Account, wbtc_weth_vault: Contract
+):
     WBTC_addr = TOKEN_ADDRESSES["WBTC"]
     WETH_addr = TOKEN_ADDRESSES["WETH"]
-    WAVAX_addr = TOKEN_ADDRESSES["WAVAX"]
-    my_vault: Contract = ImmutableVault.deploy(
-        [WBTC_addr, WETH_addr], [1, 15e10], WAVAX_addr, {"from": owner}
-    )
-    WBTC: Contract = interface.IERC20(WBTC_addr)
-    WETH: Contract = interface.IERC20(WETH_addr)
-    PGV: Contract = interface.IERC20(my_vault.address)
+    my_vault: Contract = wbtc_weth_vault
+    WBTC: Contract = erc20(WBTC_addr)
+    WETH: Contract = erc20(WETH_addr)
+    PGV: Contract = erc20(my_vault.address)
     # wbtc has only 8 decimals opposed to the default 18 decimals
-    # funds 1 wbtc
+    # 1 wbtc, bob is funded by the session basket
     wbtc_amount = int(1e8)
-    fund_token(WBTC_addr, bob, wbtc_amount)
     clean_balance(bob, WETH)
     WBTC.approve(my_vault.address, 1e40, {"from": bob})
     WETH.approve(my_vault.address, 1e40, {"from": bob})
@@ -211,17 +190,15 @@ def test_balance_weights_guarantee_smallest_deposits_wont_be_lost(
     my_vault: Contract = ImmutableVault.deploy(
         [WETH_addr, WBTC_addr], [1, 15], WAVAX_addr, {"from": owner}
     )
-    WBTC: Contract = interface.IERC20(WBTC_addr)
-    WETH: Contract = interface.IERC20(WETH_addr)
-    PGV: Contract = interface.IERC20(my_vault.address)
+    WBTC: Contract = erc20(WBTC_addr)
+    WETH: Contract = erc20(WETH_addr)
+    PGV: Contract = erc20(my_vault.address)
     assert my_vault.assets(0) == WETH_addr
     assert my_vault.weights(0) == 1
     assert my_vault.assets(1) == WBTC_addr
     assert my_vault.weights(1) == 15
     expected_btc = 15  # 15 satoshi
     expected_eth = 1
-    fund_token(WBTC_addr, bob, expected_btc)
-    fund_token(WETH_addr, bob, expected_eth)
     WBTC.approve(my_vault.address, 1e40, {"from": bob})
     WETH.approve(my_vault.address, 1e40, {"from": bob})
     with assert_balance_change(bob, {WBTC: -expected_btc, WETH: -expected_eth, PGV: 1}):
@@ -235,17 +212,15 @@ def test_deposit_for_non_normalized_weights_work(owner: Account, bob: Account):
     my_vault: Contract = ImmutableVault.deploy(
         [WETH_addr, WBTC_addr], [4, 15], WAVAX_addr, {"from": owner}
     )
-    WBTC: Contract = interface.IERC20(WBTC_addr)
-    WETH: Contract = interface.IERC20(WETH_addr)
-    PGV: Contract = interface.IERC20(my_vault.address)
+    WBTC: Contract = erc20(WBTC_addr)
+    WETH: Contract = erc20(WETH_addr)
+    PGV: Contract = erc20(my_vault.address)
     assert my_vault.assets(0) == WETH_addr
     assert my_vault.weights(0) == 4
     assert my_vault.assets(1) == WBTC_addr
     assert my_vault.weights(1) == 15
     expected_btc = 15  # 15 satoshi
     expected_eth = 4
-    fund_token(WBTC_addr, bob, expected_btc)
-    fund_token(WETH_addr, bob, expected_eth)
     WBTC.approve(my_vault.address, 1e40, {"from": bob})
     WETH.approve(my_vault.address, 1e40, {"from": bob})
     with assert_balance_change(bob, {WBTC: -expected_btc, WETH: -expected_eth, PGV: 1}):
@@ -0,0 +1,50 @@
+"""Runs the ImmutableVault test module unchanged against LeanImmutableVault"""
+
+import pytest
+from brownie import Contract, LeanImmutableVault, MockERC20
+from brownie.network.account import Account
+
+from ...utils.tokens import TOKEN_ADDRESSES, erc20
+from . import test_immutable_vault
+from .test_immutable_vault import *  # noqa: F401,F403
+
+
+@pytest.fixture(autouse=True)
+def lean_vault(monkeypatch):
+    monkeypatch.setattr(test_immutable_vault, "ImmutableVault", LeanImmutableVault)
+
+
+@pytest.fixture
+def wbtc_weth_vault(owner: Account):
+    yield LeanImmutableVault.deploy(
+        [TOKEN_ADDRESSES["WBTC"], TOKEN_ADDRESSES["WETH"]],
+        [1, 15e10],
+        TOKEN_ADDRESSES["WAVAX"],
+        {"from": owner},
+    )
+
+
+@pytest.mark.parametrize("count", [2, 8, 9, 12])
+def test_assets_above_immutable_slots(owner: Account, bob: Account, count: int):
+    tokens = [
+        MockERC20.deploy(f"Token {i}", f"T{i}", 18, {"from": owner})
+        for i in range(count)
+    ]
+    weights = [i + 1 for i in range(count)]
+    my_vault: Contract = LeanImmutableVault.deploy(
+        tokens, weights, TOKEN_ADDRESSES["WAVAX"], {"from": owner}
+    )
+    assert my_vault.assetLength() == count
+    assert my_vault.name() == "PGVault: " + "-".join(f"T{i}" for i in range(count))
+    for i, (token, weight) in enumerate(zip(tokens, weights)):
+        assert my_vault.assets(i) == token.address
+        assert my_vault.weights(i) == weight
+        token.mint(bob, weight * 10, {"from": owner})
+        token.approve(my_vault, weight * 10, {"from": bob})
+    my_vault.deposit(10, {"from": bob})
+    for i, weight in enumerate(weights):
+        assert my_vault.reserves(i) == weight * 10
+    my_vault.withdraw(10, {"from": bob})
+    for i, token in enumerate(tokens):
+        assert my_vault.reserves(i) == 0
+        assert erc20(token).balanceOf(bob.address) == weights[i] * 10
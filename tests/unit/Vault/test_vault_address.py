@@ -0,0 +1,50 @@
+from brownie import ImmutableVault, VaultCloneFactory, VaultFactory
+
+from scripts.vault_address import (
+    clone_init_code_hash,
+    predict_vault_addresses,
+    vault_init_code_hash,
+)
+
+from ...utils.tokens import TOKEN_ADDRESSES
+
+
+def baskets():
+    WBTC_addr = TOKEN_ADDRESSES["WBTC"]
+    WETH_addr = TOKEN_ADDRESSES["WETH"]
+    DAI_addr = TOKEN_ADDRESSES["DAI"]
+    WAVAX_addr = TOKEN_ADDRESSES["WAVAX"]
+    return [
+        ([WBTC_addr, WETH_addr], [1, 2], WAVAX_addr),
+        ([WETH_addr, WBTC_addr], [1, 2], WAVAX_addr),
+        ([WBTC_addr, WETH_addr], [1, 15 * 10**10], WBTC_addr),
+        ([WBTC_addr, WETH_addr, DAI_addr], [1, 4, 10**18], WAVAX_addr),
+    ]
+
+
+def test_init_code_hash_matches_artifact(vault_factory: VaultFactory):
+    assert vault_factory.vaultInitCodeHash() == "0x" + vault_init_code_hash().hex()
+
+
+def test_predicts_vault_factory_addresses(vault_factory: VaultFactory):
+    predicted = predict_vault_addresses(
+        vault_factory.address, baskets(), vault_init_code_hash()
+    )
+    for basket, address in zip(baskets(), predicted):
+        assert vault_factory.getVaultAddress(*basket) == address
+        tx_receipt = vault_factory.createVault(*basket)
+        assert tx_receipt.events["VaultCreated"]["vault"] == address
+        vault = ImmutableVault.at(address)
+        assert vault.assetLength() == len(basket[0])
+        assert vault.trackingToken() == basket[2]
+
+
+def test_predicts_clone_factory_addresses(vault_clone_factory: VaultCloneFactory):
+    init_code_hash = clone_init_code_hash(vault_clone_factory.implementation())
+    predicted = predict_vault_addresses(
+        vault_clone_factory.address, baskets(), init_code_hash
+    )
+    for basket, address in zip(baskets(), predicted):
+        assert vault_clone_factory.getVaultAddress(*basket) == address
+        tx_receipt = vault_clone_factory.createVault(*basket)
+        assert tx_receipt.events["VaultCreated"]["vault"] == address
@@ -0,0 +1,115 @@
+from brownie import Contract, ImmutableVaultClone, VaultCloneFactory, reverts
+from brownie.network.account import Account
+
+from ...utils.checks import assert_balance_change
+from ...utils.tokens import TOKEN_ADDRESSES, erc20
+
+
+def test_deploy(owner: Account):
+    vault_factory: Contract = VaultCloneFactory.deploy({"from": owner})
+    assert vault_factory.allVaultsLength() == 0
+    implementation = ImmutableVaultClone.at(vault_factory.implementation())
+    assert implementation.assetLength() == 0
+
+
+def test_implementation_cant_be_initialized(
+    vault_clone_factory: VaultCloneFactory, bob: Account
+):
+    implementation = ImmutableVaultClone.at(vault_clone_factory.implementation())
+    with reverts("Initializable: contract is already initialized"):
+        implementation.initialize(
+            [TOKEN_ADDRESSES["WBTC"], TOKEN_ADDRESSES["WETH"]],
+            [1, 2],
+            TOKEN_ADDRESSES["WAVAX"],
+            {"from": bob},
+        )
+
+
+def test_create_vault(vault_clone_factory: VaultCloneFactory, bob: Account):
+    WBTC_addr = TOKEN_ADDRESSES["WBTC"]
+    WETH_addr = TOKEN_ADDRESSES["WETH"]
+    WAVAX_addr = TOKEN_ADDRESSES["WAVAX"]
+    tx_receipt = vault_clone_factory.createVault(
+        [WBTC_addr, WETH_addr], [1, 2], WAVAX_addr
+    )
+    event = tx_receipt.events["VaultCreated"]
+    vault = ImmutableVaultClone.at(event["vault"])
+    assert event["addresses"] == [WBTC_addr, WETH_addr]
+    assert event["weights"] == [1, 2]
+    assert event["trackingToken"] == WAVAX_addr
+    assert vault_clone_factory.allVaultsLength() == 1
+    assert vault_clone_factory.allVaults(0) == vault.address
+    assert vault_clone_factory.getVault(WAVAX_addr, 0) == vault.address
+
+    assert vault.address == vault_clone_factory.getVaultAddress(
+        [WBTC_addr, WETH_addr], [1, 2], WAVAX_addr
+    )
+    # token order matter, also does weights and trackingToken
+    assert vault.address != vault_clone_factory.getVaultAddress(
+        [WETH_addr, WBTC_addr], [2, 1], WAVAX_addr
+    )
+    assert vault.address != vault_clone_factory.getVaultAddress(
+        [WBTC_addr, WETH_addr], [1, 2], WBTC_addr
+    )
+    assert vault.assetLength() == 2
+    assert vault.assets(0) == WBTC_addr
+    assert vault.assets(1) == WETH_addr
+    assert vault.weights(0) == 1
+    assert vault.weights(1) == 2
+    assert vault.trackingToken() == WAVAX_addr
+    assert vault.name() == (
+        f"PGVault: {erc20(WBTC_addr).symbol()}-{erc20(WETH_addr).symbol()}"
+    )
+    assert vault.symbol() == "PGV"
+    with reverts("Initializable: contract is already initialized"):
+        vault.initialize([WBTC_addr, WETH_addr], [1, 2], WAVAX_addr, {"from": bob})
+
+
+def test_clone_deposit_and_withdraw(
+    vault_clone_factory: VaultCloneFactory, bob: Account
+):
+    WBTC_addr = TOKEN_ADDRESSES["WBTC"]
+    WETH_addr = TOKEN_ADDRESSES["WETH"]
+    tx_receipt = vault_clone_factory.createVault(
+        [WBTC_addr, WETH_addr], [1, 15e10], TOKEN_ADDRESSES["WAVAX"]
+    )
+    vault = ImmutableVaultClone.at(tx_receipt.events["VaultCreated"]["vault"])
+    WBTC: Contract = erc20(WBTC_addr)
+    WETH: Contract = erc20(WETH_addr)
+    PGV: Contract = erc20(vault.address)
+    wbtc_amount = int(1e8)
+    weth_amount = int(15e18)
+    WBTC.approve(vault.address, 1e40, {"from": bob})
+    WETH.approve(vault.address, 1e40, {"from": bob})
+    with assert_balance_change(
+        bob, {WBTC: -wbtc_amount, WETH: -weth_amount, PGV: wbtc_amount}
+    ):
+        vault.deposit(wbtc_amount, {"from": bob})
+    assert vault.reserves(0) == wbtc_amount
+    assert vault.reserves(1) == weth_amount
+    with assert_balance_change(
+        bob, {WBTC: wbtc_amount, WETH: weth_amount, PGV: -wbtc_amount}
+    ):
+        vault.withdraw(wbtc_amount, {"from": bob})
+    assert vault.totalSupply() == 0
+
+
+def test_cant_create_vault_with_repeating_token(
+    vault_clone_factory: VaultCloneFactory,
+):
+    WBTC_addr = TOKEN_ADDRESSES["WBTC"]
+    WETH_addr = TOKEN_ADDRESSES["WETH"]
+    WAVAX_addr = TOKEN_ADDRESSES["WAVAX"]
+    with reverts("Repeating token not supported"):
+        vault_clone_factory.createVault(
+            [WBTC_addr, WETH_addr, WBTC_addr], [1, 2, 1], WAVAX_addr
+        )
+
+
+def test_cant_deploy_the_same_vault(vault_clone_factory: VaultCloneFactory):
+    WBTC_addr = TOKEN_ADDRESSES["WBTC"]
+    WETH_addr = TOKEN_ADDRESSES["WETH"]
+    WAVAX_addr = TOKEN_ADDRESSES["WAVAX"]
+    vault_clone_factory.createVault([WBTC_addr, WETH_addr], [1, 2], WAVAX_addr)
+    with reverts("ERC1167: create2 failed"):
+        vault_clone_factory.createVault([WBTC_addr, WETH_addr], [1, 2], WAVAX_addr)
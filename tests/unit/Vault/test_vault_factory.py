@@ -51,6 +51,15 @@ def test_cant_create_vault_with_repeating_token(vault_factory: VaultFactory):
         )
 
 
+def test_cant_create_large_vault_with_repeating_token(vault_factory: VaultFactory):
+    addresses = list(TOKEN_ADDRESSES.values())
+    weights = [1] * (len(addresses) + 1)
+    with reverts("Repeating token not supported"):
+        vault_factory.createVault(
+            addresses + [addresses[5]], weights, TOKEN_ADDRESSES["WAVAX"]
+        )
+
+
 def test_cant_deploy_the_same_vault(vault_factory: VaultFactory):
     WBTC_addr = TOKEN_ADDRESSES["WBTC"]
     WETH_addr = TOKEN_ADDRESSES["WETH"]
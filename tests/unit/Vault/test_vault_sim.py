@@ -0,0 +1,118 @@
+from brownie import Contract, ImmutableVault, SlashingERC20
+from brownie.exceptions import VirtualMachineError
+from brownie.network.account import Account
+
+from scripts.vault_sim import DEPOSIT, TRANSFER, WITHDRAW, VaultRevert, VaultSimulator
+
+from ...utils.tokens import TOKEN_ADDRESSES, erc20
+
+CONTRACT_METHODS = {DEPOSIT: "depositTo", WITHDRAW: "withdrawTo", TRANSFER: "transfer"}
+
+
+def mirror(vault: Contract, accounts: list) -> VaultSimulator:
+    """Simulator for `vault` with the on-chain wallets of `accounts`"""
+    sim = VaultSimulator([vault.weights(i) for i in range(vault.assetLength())])
+    for i in range(vault.assetLength()):
+        asset = erc20(vault.assets(i))
+        for account in accounts:
+            sim.fund(sim.holder(account.address), i, asset.balanceOf(account.address))
+            asset.approve(vault.address, 2**256 - 1, {"from": account})
+    return sim
+
+
+def assert_same_state(vault: Contract, sim: VaultSimulator, accounts: list):
+    assert vault.totalSupply() == sim.total_supply
+    for i in range(vault.assetLength()):
+        asset = erc20(vault.assets(i))
+        assert vault.reserves(i) == sim.reserves[i]
+        assert asset.balanceOf(vault.address) == sim.holdings[i]
+        for account in accounts:
+            index = sim.holder(account.address)
+            assert asset.balanceOf(account.address) == sim.wallets[i][index]
+    for account in accounts:
+        assert (
+            vault.balanceOf(account.address) == sim.shares[sim.holder(account.address)]
+        )
+
+
+def replay(vault: Contract, sim: VaultSimulator, accounts: list, ops: list):
+    for kind, sender, to, amount in ops:
+        method = getattr(vault, CONTRACT_METHODS[kind])
+        try:
+            method(accounts[to].address, amount, {"from": accounts[sender]})
+            chain_revert = None
+        except VirtualMachineError as exc:
+            chain_revert = exc.revert_msg
+        try:
+            sim.apply(
+                (
+                    kind,
+                    sim.holder(accounts[sender].address),
+                    sim.holder(accounts[to].address),
+                    amount,
+                )
+            )
+            sim_revert = None
+        except VaultRevert as exc:
+            sim_revert = exc.revert_msg
+        assert chain_revert == sim_revert, (kind, sender, to, amount)
+        assert_same_state(vault, sim, accounts)
+
+
+def test_simulator_matches_vault(
+    wbtc_weth_vault: Contract, alice: Account, bob: Account, charlie: Account
+):
+    accounts = [alice, bob, charlie]
+    sim = mirror(wbtc_weth_vault, accounts)
+    ops = [
+        (DEPOSIT, 1, 1, int(5e7)),
+        (DEPOSIT, 1, 0, int(3e7)),
+        (WITHDRAW, 0, 0, int(1e7)),
+        (TRANSFER, 0, 2, int(5e6)),
+        (WITHDRAW, 2, 1, int(5e6)),
+        (DEPOSIT, 2, 2, 7),
+        (WITHDRAW, 1, 1, int(1e12)),
+        (DEPOSIT, 0, 0, int(3e8)),
+        (WITHDRAW, 2, 2, 1),
+        (WITHDRAW, 1, 1, int(5e7)),
+        (WITHDRAW, 0, 0, int(1e7)),
+        (WITHDRAW, 2, 2, 6),
+    ]
+    replay(wbtc_weth_vault, sim, accounts, ops)
+
+
+def test_simulator_matches_slashed_vault(owner: Account, bob: Account):
+    slash_amount = int(15e18)
+    SLASH: Contract = SlashingERC20.deploy(slash_amount, {"from": owner})
+    SLASH.transfer(bob.address, slash_amount, {"from": owner})
+    my_vault: Contract = ImmutableVault.deploy(
+        [TOKEN_ADDRESSES["WBTC"], SLASH.address],
+        [1, 15e10],
+        TOKEN_ADDRESSES["WAVAX"],
+        {"from": owner},
+    )
+    sim = mirror(my_vault, [bob])
+    replay(my_vault, sim, [bob], [(DEPOSIT, 0, 0, int(1e8))])
+    SLASH.slash(my_vault.address, {"from": owner})
+    sim.slash(1)
+    replay(my_vault, sim, [bob], [(WITHDRAW, 0, 0, int(1e8))])
+    assert sim.apply_batch([(WITHDRAW, 1, 1, int(1e8))]) == [
+        "Insufficient token to transfer"
+    ]
+
+
+def test_batch_deposits_match_single_deposits():
+    single, batched = VaultSimulator([1, 15]), VaultSimulator([1, 15])
+    for sim in (single, batched):
+        for holder in range(1, 101):
+            sim.holder(holder)
+            sim.fund(holder, 0, 1000)
+            sim.fund(holder, 1, 15000)
+    senders = list(range(1, 101)) * 3
+    amounts = [holder % 7 + 1 for holder in senders]
+    results = single.apply_batch((DEPOSIT, s, s, a) for s, a in zip(senders, amounts))
+    assert results == [None] * len(senders)
+    assert batched.apply_deposits(senders, amounts) == sum(amounts)
+    assert single.shares == batched.shares
+    assert single.reserves == batched.reserves
+    assert single.wallets == batched.wallets
@@ -0,0 +1,50 @@
+from brownie import interface
+
+from scripts.contract_registry import ZERO_ADDRESS, ContractRegistry
+
+from ..abis import PRICE_FEED_ABI, load_abi
+from ..utils.dex import pangolin_factory
+from ..utils.rpc_stats import RPC_STATS
+from ..utils.tokens import TOKEN_ADDRESSES
+
+
+def test_handles_are_built_once():
+    registry = ContractRegistry()
+    wbtc = registry.interface("IERC20", TOKEN_ADDRESSES["WBTC"])
+    assert registry.interface("IERC20", TOKEN_ADDRESSES["WBTC"].lower()) is wbtc
+    assert registry.interface("IERC20", TOKEN_ADDRESSES["WETH"]) is not wbtc
+    assert registry.interface("IWAVAX", TOKEN_ADDRESSES["WBTC"]) is not wbtc
+    assert wbtc.balanceOf.signature == "0x70a08231"
+
+
+def test_selector_tables():
+    registry = ContractRegistry()
+    selectors = registry.selectors(interface.IERC20.abi)
+    assert selectors["0xa9059cbb"] == "transfer(address,uint256)"
+    assert selectors["0x70a08231"] == "balanceOf(address)"
+    assert registry.selectors(list(interface.IERC20.abi)) is selectors
+
+
+def test_pairs_are_memoized():
+    registry = ContractRegistry()
+    factory = pangolin_factory()
+    wavax, wbtc = TOKEN_ADDRESSES["WAVAX"], TOKEN_ADDRESSES["WBTC"]
+    pair = registry.get_pair(factory, wavax, wbtc)
+    token0 = registry.token0(pair)
+    assert pair == factory.getPair(wavax, wbtc)
+    assert token0 == interface.IPangolinPair(pair).token0()
+
+    calls = RPC_STATS.calls
+    assert registry.get_pair(factory, wbtc, wavax) == pair
+    assert registry.token0(pair) == token0
+    assert RPC_STATS.calls == calls
+
+    # missing pairs may be created later, they aren't memoized
+    missing = registry.get_pair(factory, wbtc, TOKEN_ADDRESSES["WETH"])
+    assert missing == ZERO_ADDRESS
+    assert len(registry.pairs) == 1
+
+
+def test_abis_load_lazily():
+    assert load_abi("linkfeed") is load_abi("linkfeed")
+    assert PRICE_FEED_ABI is load_abi("linkfeed")
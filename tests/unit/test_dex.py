@@ -0,0 +1,32 @@
+from ..utils.dex import WAVAX_contract, fund_token, get_liquidity_pair, pangolin_factory
+from ..utils.tokens import TOKEN_ADDRESSES, ZERO_ADDRESS, erc20
+
+
+def test_every_token_has_a_wavax_pair():
+    factory = pangolin_factory()
+    for symbol, address in TOKEN_ADDRESSES.items():
+        if symbol == "WAVAX":
+            continue
+        pair_addr = factory.getPair(TOKEN_ADDRESSES["WAVAX"], address)
+        assert pair_addr != ZERO_ADDRESS, f"{symbol} has no WAVAX pair"
+        reserve0, reserve1, _ = get_liquidity_pair(pair_addr).getReserves()
+        assert reserve0 > 0 and reserve1 > 0
+
+
+def test_fund_token(bob):
+    for symbol, amount in (
+        ("WBTC", int(1e8)),
+        ("USDT", int(100e6)),
+        ("WETH", int(15e18)),
+    ):
+        token = erc20(TOKEN_ADDRESSES[symbol])
+        balance_before = token.balanceOf(bob.address)
+        fund_token(TOKEN_ADDRESSES[symbol], bob, amount)
+        assert token.balanceOf(bob.address) - balance_before >= amount
+
+
+def test_fund_wavax_is_backed_by_avax(bob):
+    wavax = WAVAX_contract()
+    balance_before = wavax.balanceOf(bob.address)
+    wavax.deposit({"from": bob, "amount": int(1e18)})
+    assert wavax.balanceOf(bob.address) == balance_before + int(1e18)
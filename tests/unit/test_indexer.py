@@ -0,0 +1,215 @@
+from typing import List
+
+import pytest
+from brownie import Contract, ImmutableVault, chain, web3
+from brownie.network.account import Account
+
+from scripts.indexer import ADDRESS_BATCH, MAX_CHUNK_SIZE, VaultIndexer
+
+from ..utils.tokens import TOKEN_ADDRESSES, erc20
+
+WEIGHTS = [1, 15e10]
+
+
+def wbtc_weth():
+    # resolved at call time, the local stand-in replaces the addresses in place
+    return [TOKEN_ADDRESSES["WBTC"], TOKEN_ADDRESSES["WETH"]]
+
+
+def create_vault(factory: Contract, tracking: str, owner) -> Contract:
+    tx = factory.createVault(
+        wbtc_weth(), WEIGHTS, TOKEN_ADDRESSES[tracking], {"from": owner}
+    )
+    return ImmutableVault.at(tx.events["VaultCreated"]["vault"])
+
+
+def deposit(vault: Contract, account: Account, amount: int):
+    for i in range(vault.assetLength()):
+        erc20(vault.assets(i)).approve(vault, 1e40, {"from": account})
+    vault.deposit(amount, {"from": account})
+
+
+def indexer(tmp_path, vault_factory: Contract, **kwargs) -> VaultIndexer:
+    return VaultIndexer(
+        str(tmp_path / "vaults.db"),
+        vault_factory.address,
+        start_block=vault_factory.tx.block_number,
+        **kwargs,
+    )
+
+
+def assert_balances_match(indexed: VaultIndexer, vault: Contract, accounts):
+    for account in accounts:
+        assert indexed.balance_of(vault.address, account.address) == vault.balanceOf(
+            account
+        )
+
+
+def test_indexes_vaults_and_balances(tmp_path, vault_factory, owner, alice, bob):
+    by_wavax = create_vault(vault_factory, "WAVAX", owner)
+    by_dai = create_vault(vault_factory, "DAI", owner)
+    deposit(by_wavax, alice, 1000)
+    by_wavax.transfer(bob, 300, {"from": alice})
+    by_wavax.withdraw(100, {"from": bob})
+    deposit(by_dai, bob, 50)
+
+    indexed = indexer(tmp_path, vault_factory)
+    stats = indexed.sync()
+    assert stats.head == chain.height
+    assert stats.reorg_ancestor is None
+
+    addresses = [by_wavax.address.lower(), by_dai.address.lower()]
+    assert indexed.vaults() == addresses
+    assert indexed.vaults(tracking_token=TOKEN_ADDRESSES["DAI"]) == addresses[1:]
+    assert indexed.vaults(asset=TOKEN_ADDRESSES["WETH"]) == addresses
+    assert indexed.vaults(asset=TOKEN_ADDRESSES["DAI"]) == []
+    assert indexed.basket(by_dai) == [
+        (a.lower(), w) for a, w in zip(wbtc_weth(), WEIGHTS)
+    ]
+
+    assert indexed.holders(by_wavax) == {
+        alice.address.lower(): 700,
+        bob.address.lower(): 200,
+    }
+    assert indexed.holdings(bob) == {addresses[0]: 200, addresses[1]: 50}
+
+
+def test_resumes_from_cursors(tmp_path, vault_factory, owner, alice, bob):
+    vault = create_vault(vault_factory, "WAVAX", owner)
+    deposit(vault, alice, 1000)
+    first = indexer(tmp_path, vault_factory)
+    first.sync()
+    first.close()
+
+    vault.transfer(bob, 400, {"from": alice})
+    second = create_vault(vault_factory, "DAI", owner)
+    deposit(second, bob, 10)
+    resumed = indexer(tmp_path, vault_factory)
+    assert resumed.cursor(vault.address) < chain.height
+    stats = resumed.sync()
+    # VaultCreated, the transfer and the mint of the new vault
+    assert stats.logs == 3
+    assert resumed.cursor(vault.address) == resumed.cursor(second.address)
+    assert_balances_match(resumed, vault, [alice, bob])
+    assert_balances_match(resumed, second, [alice, bob])
+
+    assert resumed.sync().logs == 0
+
+
+def counting_get_logs(monkeypatch) -> List[List[str]]:
+    """Address lists of the eth_getLogs requests sent from now on"""
+    get_logs = web3.eth.get_logs
+    requests = []
+
+    def counted(params):
+        requests.append(params["address"])
+        return get_logs(params)
+
+    monkeypatch.setattr(web3.eth, "get_logs", counted)
+    return requests
+
+
+def test_vaults_created_apart_share_one_scan(
+    tmp_path, monkeypatch, vault_factory, owner, alice
+):
+    vaults = []
+    for tracking in ("WAVAX", "DAI", "USDT", "LINK"):
+        vaults.append(create_vault(vault_factory, tracking, owner))
+        deposit(vaults[-1], alice, 100)
+        chain.mine(5)
+
+    requests = counting_get_logs(monkeypatch)
+    indexed = indexer(tmp_path, vault_factory, chunk_size=MAX_CHUNK_SIZE)
+    indexed.sync()
+    # the factory, then every vault from the oldest creation block
+    assert len(requests) == 2
+    assert len(requests[1]) == len(vaults)
+    for vault in vaults:
+        assert_balances_match(indexed, vault, [alice])
+
+
+def test_batches_skip_logs_behind_each_cursor(
+    tmp_path, monkeypatch, vault_factory, owner, alice, bob
+):
+    vaults = []
+    for tracking in ("WAVAX", "DAI", "USDT", "LINK"):
+        vaults.append(create_vault(vault_factory, tracking, owner))
+        deposit(vaults[-1], alice, 100)
+    # inside the range the lagging vaults are scanned over again below
+    vaults[0].transfer(bob, 10, {"from": alice})
+    lagging = {vaults[2].address, vaults[3].address}
+
+    # the sync stops after the first batch of two vaults, the others stay behind
+    get_logs = web3.eth.get_logs
+
+    def failing_get_logs(params):
+        if lagging & set(params["address"]):
+            raise RuntimeError("node went away")
+        return get_logs(params)
+
+    monkeypatch.setattr("scripts.indexer.ADDRESS_BATCH", 2)
+    monkeypatch.setattr(web3.eth, "get_logs", failing_get_logs)
+    indexed = indexer(tmp_path, vault_factory, chunk_size=MAX_CHUNK_SIZE)
+    with pytest.raises(RuntimeError):
+        indexed.sync()
+    assert indexed.cursor(vaults[0]) > indexed.cursor(vaults[3])
+
+    vaults[0].transfer(bob, 30, {"from": alice})
+    vaults[3].transfer(bob, 40, {"from": alice})
+    monkeypatch.setattr("scripts.indexer.ADDRESS_BATCH", ADDRESS_BATCH)
+    requests = counting_get_logs(monkeypatch)
+    indexed.sync()
+    # one scan from the lagging vaults' cursors, the others keep their logs once
+    assert len(requests) == 2
+    for vault in vaults:
+        assert_balances_match(indexed, vault, [alice, bob])
+
+
+def test_ranges_shrink_on_rejected_queries(
+    tmp_path, monkeypatch, vault_factory, owner, alice, bob
+):
+    vault = create_vault(vault_factory, "WAVAX", owner)
+    deposit(vault, alice, 1000)
+    for amount in range(1, 6):
+        vault.transfer(bob, amount, {"from": alice})
+
+    get_logs = web3.eth.get_logs
+    ranges = []
+
+    def limited_get_logs(params):
+        if params["toBlock"] - params["fromBlock"] >= 2:
+            raise ValueError({"message": "query returned more than 10000 results"})
+        ranges.append((params["fromBlock"], params["toBlock"]))
+        return get_logs(params)
+
+    monkeypatch.setattr(web3.eth, "get_logs", limited_get_logs)
+    indexed = indexer(tmp_path, vault_factory, chunk_size=64)
+    stats = indexed.sync()
+    assert stats.requests > len(ranges)
+    assert all(end - start <= 1 for start, end in ranges)
+    assert_balances_match(indexed, vault, [alice, bob])
+
+
+def test_rolls_back_reorged_blocks(tmp_path, vault_factory, owner, alice, bob, charlie):
+    vault = create_vault(vault_factory, "WAVAX", owner)
+    deposit(vault, alice, 1000)
+    deposit_block = chain.height
+    indexed = indexer(tmp_path, vault_factory)
+    indexed.sync()
+
+    vault.transfer(bob, 400, {"from": alice})
+    reorged = create_vault(vault_factory, "DAI", owner)
+    assert indexed.sync().reorg_ancestor is None
+    assert indexed.balance_of(vault, bob) == 400
+    assert len(indexed.vaults()) == 2
+
+    # replace the last two blocks with a different history
+    chain.undo(2)
+    vault.transfer(charlie, 250, {"from": alice})
+    chain.mine(2)
+    stats = indexed.sync()
+    assert stats.reorg_ancestor == deposit_block
+    assert indexed.vaults() == [vault.address.lower()]
+    assert indexed.cursor(reorged) is None
+    assert indexed.balance_of(vault, bob) == 0
+    assert_balances_match(indexed, vault, [alice, bob, charlie])
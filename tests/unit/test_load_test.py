@@ -0,0 +1,39 @@
+import asyncio
+
+from brownie import Contract
+
+from scripts.load_test import (
+    DEPOSIT,
+    LoadGenerator,
+    LoadReport,
+    TxResult,
+    prepare_users,
+)
+
+from ..utils.dex import fund_token
+
+
+def test_load_generator(wbtc_weth_vault: Contract, owner):
+    users = prepare_users(owner, [wbtc_weth_vault], 4, fund_token, deposits=6)
+    generator = LoadGenerator([wbtc_weth_vault], users, pipeline=3, workers=8)
+    report = asyncio.run(generator.run(txs_per_user=6))
+
+    assert len(report.results) == 24
+    assert report.rejected == 0
+    assert all(result.success for result in report.results)
+    balances = [wbtc_weth_vault.balanceOf(user) for user in users]
+    assert sum(balances) == wbtc_weth_vault.totalSupply() > 0
+    # every transaction is mined in its own block on an automining node
+    assert sum(txs for txs, _ in report.blocks.values()) == 24
+    assert report.tx_per_second() > 0
+
+
+def test_latency_percentiles():
+    results = [
+        TxResult(DEPOSIT, "0x0", latency / 100, 1, 21000, True)
+        for latency in range(1, 101)
+    ]
+    report = LoadReport(results, 2.0, {1: (100, 2_100_000)}, 0)
+    assert report.latency_percentiles() == {50: 0.51, 90: 0.91, 99: 1.0}
+    assert report.tx_per_second() == 50
+    assert report.summary()[0].startswith("100 txs in 2.0s: 50.0 tx/s")
@@ -0,0 +1,70 @@
+import pytest
+from brownie import Contract, ImmutableVault
+from brownie.network.account import Account
+
+from scripts.contract_registry import REGISTRY
+from scripts.multicall import MulticallBatch, fetch_balances, fetch_vault_state
+
+from ..utils.rpc_stats import RPC_STATS
+from ..utils.tokens import TOKEN_ADDRESSES, erc20
+
+
+def deposit(vault: Contract, account: Account, amount: int):
+    for i in range(vault.assetLength()):
+        erc20(vault.assets(i)).approve(vault, 1e40, {"from": account})
+    vault.deposit(amount, {"from": account})
+
+
+def test_fetch_vault_state(multicall: Contract, wbtc_weth_vault: Contract, bob):
+    deposit(wbtc_weth_vault, bob, int(1e7))
+    state = fetch_vault_state(multicall, wbtc_weth_vault)
+    assert state.name == wbtc_weth_vault.name()
+    assert state.tracking_token == wbtc_weth_vault.trackingToken()
+    assert state.total_supply == wbtc_weth_vault.totalSupply()
+    assert state.assets == [TOKEN_ADDRESSES["WBTC"], TOKEN_ADDRESSES["WETH"]]
+    assert state.weights == [1, 15e10]
+    assert state.reserves == [wbtc_weth_vault.reserves(0), wbtc_weth_vault.reserves(1)]
+    assert state == fetch_vault_state(multicall, wbtc_weth_vault, asset_length=2)
+
+
+def test_fetch_vault_state_rejects_non_vaults(multicall: Contract):
+    # a token has `name` and `totalSupply`, not `trackingToken` or `assetLength`
+    token = REGISTRY.contract(
+        "ImmutableVault", TOKEN_ADDRESSES["WBTC"], ImmutableVault.abi
+    )
+    with pytest.raises(ValueError):
+        fetch_vault_state(multicall, token)
+
+
+def test_fetch_balances(multicall: Contract, alice, bob, charlie):
+    tokens = [erc20(TOKEN_ADDRESSES[s]) for s in ("WBTC", "WETH", "DAI")]
+    accounts = [alice.address, bob.address, charlie.address]
+    balances = fetch_balances(multicall, tokens, accounts)
+    for token in tokens:
+        for account in accounts:
+            assert balances[(token, account)] == token.balanceOf(account)
+
+
+def test_try_execute_skips_failed_calls(multicall: Contract, wbtc_weth_vault):
+    batch = MulticallBatch(multicall)
+    batch.add(wbtc_weth_vault.assets, 0)
+    batch.add(wbtc_weth_vault.assets, 5)
+    assert batch.try_execute() == [TOKEN_ADDRESSES["WBTC"], None]
+
+
+def test_multicall_round_trips(multicall: Contract, alice, bob, charlie):
+    tokens = [erc20(address) for address in TOKEN_ADDRESSES.values()]
+    accounts = [alice.address, bob.address, charlie.address]
+    with RPC_STATS.measure("sequential balances"):
+        sequential = {
+            (token, account): token.balanceOf(account)
+            for token in tokens
+            for account in accounts
+        }
+    with RPC_STATS.measure("multicall balances"):
+        batched = fetch_balances(multicall, tokens, accounts)
+    assert batched == sequential
+    ((sequential_rpc, _),) = RPC_STATS.phases["sequential balances"][-1:]
+    ((batched_rpc, _),) = RPC_STATS.phases["multicall balances"][-1:]
+    assert sequential_rpc >= len(sequential)
+    assert batched_rpc <= 2
@@ -0,0 +1,147 @@
+from fractions import Fraction
+
+from brownie import Contract, ImmutableVault, MockAggregator, chain, interface
+from brownie.network.account import Account
+
+from scripts.nav import NavEngine
+
+from ..utils.dex import pangolin_factory
+from ..utils.rpc_stats import RPC_STATS
+from ..utils.tokens import TOKEN_ADDRESSES, erc20
+
+WBTC_WETH = (["WBTC", "WETH"], [1, 15e10])
+
+
+def create_vault(factory: Contract, symbols, weights, tracking: str, owner) -> Contract:
+    tx = factory.createVault(
+        [TOKEN_ADDRESSES[s] for s in symbols],
+        weights,
+        TOKEN_ADDRESSES[tracking],
+        {"from": owner},
+    )
+    return ImmutableVault.at(tx.events["VaultCreated"]["vault"])
+
+
+def deposit(vault: Contract, account: Account, amount: int):
+    for i in range(vault.assetLength()):
+        erc20(vault.assets(i)).approve(vault, 1e40, {"from": account})
+    vault.deposit(amount, {"from": account})
+
+
+def mid_price(base: str, quote: str) -> Fraction:
+    pair = interface.IPangolinPair(pangolin_factory().getPair(base, quote))
+    reserve0, reserve1, _ = pair.getReserves()
+    if pair.token0().lower() == base.lower():
+        return Fraction(reserve1, reserve0)
+    return Fraction(reserve0, reserve1)
+
+
+def engine(vault_factory: Contract, multicall: Contract, **kwargs) -> NavEngine:
+    return NavEngine(
+        vault_factory, multicall, pangolin_factory(), TOKEN_ADDRESSES["WAVAX"], **kwargs
+    )
+
+
+def test_nav_per_share(vault_factory, multicall, owner, alice):
+    vault = create_vault(vault_factory, *WBTC_WETH, "WAVAX", owner)
+    deposit(vault, alice, int(1e7))
+    (nav,) = engine(vault_factory, multicall).value_all()
+
+    wavax = TOKEN_ADDRESSES["WAVAX"]
+    expected = sum(
+        erc20(TOKEN_ADDRESSES[s]).balanceOf(vault)
+        * mid_price(TOKEN_ADDRESSES[s], wavax)
+        for s in WBTC_WETH[0]
+    )
+    assert nav.vault == vault.address
+    assert nav.tracking_token == wavax.lower()
+    assert nav.total_supply == int(1e7)
+    assert nav.total_value == expected
+    assert nav.nav_per_share == expected / int(1e7)
+    assert nav.block_number == chain.height
+
+
+def test_nav_routes_through_wavax(vault_factory, multicall, owner, alice):
+    vault = create_vault(vault_factory, *WBTC_WETH, "DAI", owner)
+    deposit(vault, alice, int(1e7))
+    (nav,) = engine(vault_factory, multicall).value_all()
+
+    wavax, dai = TOKEN_ADDRESSES["WAVAX"], TOKEN_ADDRESSES["DAI"]
+    expected = sum(
+        erc20(TOKEN_ADDRESSES[s]).balanceOf(vault)
+        * mid_price(TOKEN_ADDRESSES[s], wavax)
+        * mid_price(wavax, dai)
+        for s in WBTC_WETH[0]
+    )
+    assert nav.total_value == expected
+
+
+def test_empty_vault_is_worth_nothing(vault_factory, multicall, owner):
+    create_vault(vault_factory, *WBTC_WETH, "WAVAX", owner)
+    (nav,) = engine(vault_factory, multicall).value_all()
+    assert nav.total_supply == 0
+    assert nav.nav_per_share == 0
+
+
+def test_vaults_tracking(vault_factory, multicall, owner):
+    by_wavax = [
+        create_vault(vault_factory, WBTC_WETH[0], [i + 1, 1], "WAVAX", owner).address
+        for i in range(3)
+    ]
+    create_vault(vault_factory, WBTC_WETH[0], [1, 1], "DAI", owner)
+    nav_engine = engine(vault_factory, multicall)
+    assert nav_engine.vaults_tracking(TOKEN_ADDRESSES["WAVAX"]) == by_wavax
+    assert len(nav_engine.refresh_vaults()) == 4
+
+
+def test_prices_cached_per_block(vault_factory, multicall, owner, alice):
+    for tracking in ("WAVAX", "DAI", "USDT"):
+        deposit(create_vault(vault_factory, *WBTC_WETH, tracking, owner), alice, 10)
+    nav_engine = engine(vault_factory, multicall)
+    with RPC_STATS.measure("nav cold"):
+        cold = nav_engine.value_all()
+    with RPC_STATS.measure("nav warm"):
+        warm = nav_engine.value_all()
+    ((cold_rpc, _),) = RPC_STATS.phases["nav cold"][-1:]
+    ((warm_rpc, _),) = RPC_STATS.phases["nav warm"][-1:]
+    assert warm == cold
+    # block number, vault count and balances
+    assert warm_rpc <= 3
+
+    # WBTC, WETH, DAI and USDT against WAVAX, shared by every vault
+    assert len(nav_engine.prices) == 2 * 4
+
+    wbtc = erc20(TOKEN_ADDRESSES["WBTC"])
+    pair = pangolin_factory().getPair(wbtc, TOKEN_ADDRESSES["WAVAX"])
+    wbtc.transfer(pair, wbtc.balanceOf(alice), {"from": alice})
+    interface.IPangolinPair(pair).sync({"from": alice})
+    moved = nav_engine.value_all()
+    assert moved[0].block_number > cold[0].block_number
+    assert all(m.nav_per_share < c.nav_per_share for m, c in zip(moved, cold))
+
+
+def test_chainlink_cross_check(
+    vault_factory, multicall, owner, alice, eth_usd_price_feed
+):
+    vault = create_vault(vault_factory, *WBTC_WETH, "WAVAX", owner)
+    deposit(vault, alice, 10)
+    weth, wavax = TOKEN_ADDRESSES["WETH"], TOKEN_ADDRESSES["WAVAX"]
+    # AVAX / USD feed agreeing with the WETH/WAVAX pair
+    decimals = eth_usd_price_feed.decimals()
+    avax_usd = int(eth_usd_price_feed.latestAnswer() / mid_price(weth, wavax))
+    avax_usd_feed = MockAggregator.deploy(
+        decimals, "AVAX / USD", avax_usd, {"from": owner}
+    )
+    nav_engine = engine(
+        vault_factory,
+        multicall,
+        usd_feeds={weth: eth_usd_price_feed, wavax: avax_usd_feed},
+    )
+
+    (nav,) = nav_engine.value_all()
+    assert list(nav.deviations) == [weth.lower()]
+    assert abs(nav.deviations[weth.lower()]) < Fraction(1, 10**6)
+
+    avax_usd_feed.updateAnswer(avax_usd * 11 // 10, {"from": owner})
+    (nav,) = nav_engine.value_all()
+    assert abs(nav.deviations[weth.lower()] + Fraction(1, 11)) < Fraction(1, 10**6)
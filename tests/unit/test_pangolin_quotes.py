@@ -0,0 +1,91 @@
+from brownie import Contract
+from brownie.test import given, strategy
+from hypothesis import HealthCheck, settings
+
+from scripts.pangolin_quotes import (
+    get_amount_in,
+    get_amount_out,
+    get_amounts_in,
+    get_amounts_in_batch,
+    get_amounts_out,
+    get_amounts_out_batch,
+    load_path_reserves,
+)
+
+from ..utils.dex import pangolin_factory, pangolin_router
+from ..utils.tokens import TOKEN_ADDRESSES
+
+PATHS = [
+    ["WAVAX", "WETH"],
+    ["WBTC", "WAVAX"],
+    ["WBTC", "WAVAX", "WETH"],
+    ["USDT", "WAVAX", "DAI", "WAVAX", "LINK"],
+]
+
+
+def addresses(path):
+    return [TOKEN_ADDRESSES[symbol] for symbol in path]
+
+
+def max_amount_out(token_path, reserves) -> int:
+    """Largest output every hop of the path can deliver, each hop's input is
+    capped by what the previous hop can output
+    """
+    limit = None
+    for hop in zip(token_path, token_path[1:]):
+        reserve_in, reserve_out = reserves[tuple(token.lower() for token in hop)]
+        hop_limit = reserve_out - 1
+        if limit is not None:
+            hop_limit = min(hop_limit, get_amount_out(limit, reserve_in, reserve_out))
+        limit = hop_limit
+    return limit
+
+
+@settings(suppress_health_check=list(HealthCheck))
+@given(
+    path=strategy("uint", max_value=len(PATHS) - 1),
+    amount_in=strategy("uint256", min_value=10**6, max_value=10**30),
+)
+def test_amounts_out_match_router(multicall: Contract, path: int, amount_in: int):
+    token_path = addresses(PATHS[path])
+    reserves = load_path_reserves(pangolin_factory(), multicall, [token_path])
+    expected = pangolin_router().getAmountsOut(amount_in, token_path)
+    assert get_amounts_out(amount_in, token_path, reserves) == list(expected)
+
+
+@settings(suppress_health_check=list(HealthCheck))
+@given(
+    path=strategy("uint", max_value=len(PATHS) - 1),
+    share_bps=strategy("uint", min_value=1, max_value=5000),
+)
+def test_amounts_in_match_router(multicall: Contract, path: int, share_bps: int):
+    token_path = addresses(PATHS[path])
+    reserves = load_path_reserves(pangolin_factory(), multicall, [token_path])
+    amount_out = max_amount_out(token_path, reserves) * share_bps // 10_000 + 1
+    expected = pangolin_router().getAmountsIn(amount_out, token_path)
+    assert get_amounts_in(amount_out, token_path, reserves) == list(expected)
+
+
+def test_quotes_are_exact_above_float_precision():
+    reserve_in, reserve_out = 3 * 10**27 + 7, 5 * 10**25 + 11
+    amount_in = 10**22 + 3
+    amount_out = get_amount_out(amount_in, reserve_in, reserve_out)
+    assert amount_out == amount_in * 997 * reserve_out // (
+        reserve_in * 1000 + amount_in * 997
+    )
+    # the exact amount in is the smallest input that gets at least amount_out
+    needed = get_amount_in(amount_out, reserve_in, reserve_out)
+    assert get_amount_out(needed, reserve_in, reserve_out) >= amount_out
+    assert get_amount_out(needed - 1, reserve_in, reserve_out) < amount_out
+
+
+def test_batches_match_single_quotes():
+    reserve_in, reserve_out = 10**24, 6 * 10**9
+    amounts = [1 + i * 10**19 for i in range(200)]
+    assert get_amounts_out_batch(amounts, reserve_in, reserve_out) == [
+        get_amount_out(a, reserve_in, reserve_out) for a in amounts
+    ]
+    amounts_out = [1 + i * 10**7 for i in range(200)]
+    assert get_amounts_in_batch(amounts_out, reserve_in, reserve_out) == [
+        get_amount_in(a, reserve_in, reserve_out) for a in amounts_out
+    ]
@@ -0,0 +1,125 @@
+import pytest
+from brownie import chain, web3
+from brownie._config import CONFIG
+
+from ..utils.state_cache import (
+    ChainStateCache,
+    _setters,
+    cache_key,
+    pinned_fork_block,
+    touch_trace,
+)
+
+ADDRESS = "0x00000000000000000000000000000000000C0FFE"
+CLONE = "0x" + "c1" * 20
+IMPLEMENTATION = "0x" + "1b" * 20
+TOKEN = "0x" + "70" * 20
+
+
+def step(address, depth, op, *stack):
+    return {"address": address, "depth": depth, "op": op, "stack": list(stack)}
+
+
+def test_key_follows_the_start_block():
+    key = cache_key()
+    assert cache_key() == key
+    chain.mine()
+    assert cache_key() != key
+
+
+def test_key_is_shared_by_xdist_workers(monkeypatch):
+    key = cache_key()
+    settings = CONFIG.active_network["cmd_settings"]
+    monkeypatch.setitem(settings, "port", settings.get("port", 8545) + 3)
+    assert cache_key() == key
+    monkeypatch.setitem(settings, "default_balance", 1)
+    assert cache_key() != key
+
+
+def test_pinned_fork_block():
+    url = "https://user@api.avax.network/ext/bc/C/rpc"
+    assert pinned_fork_block(f"{url}@2500000") == 2500000
+    assert pinned_fork_block(url) is None
+    assert pinned_fork_block("avax-main") is None
+    assert pinned_fork_block(None) is None
+
+
+def test_unpinned_forks_are_reported(tmp_path):
+    cache = ChainStateCache(tmp_path)
+    reason = "the fork isn't pinned to a block (`fork: <url>@<block>`)"
+    cache.merge(
+        {
+            "enabled": False,
+            "reason": reason,
+            "network": None,
+            "key": None,
+            "built_seconds": None,
+            "sessions": [[False, 40.0]],
+        }
+    )
+    assert cache.summary()[0] == f"{reason}, every session starts cold"
+
+
+def test_delegatecall_storage_belongs_to_the_caller():
+    touched = {}
+    touch_trace(
+        touched,
+        [
+            step(CLONE, 1, "DELEGATECALL"),
+            step(IMPLEMENTATION, 2, "SSTORE", "2a", "05"),
+            step(IMPLEMENTATION, 2, "CALL", "00", TOKEN[2:], "00"),
+            step(TOKEN, 3, "SLOAD", "07"),
+            step(IMPLEMENTATION, 2, "SLOAD", "06"),
+            step(IMPLEMENTATION, 2, "RETURN"),
+            step(CLONE, 1, "SLOAD", "01"),
+        ],
+    )
+    assert touched == {CLONE: {1, 5, 6}, IMPLEMENTATION: set(), TOKEN: {7}}
+
+
+def test_state_is_written_back():
+    if _setters() is None:
+        pytest.skip("the node can't set account state")
+    ChainStateCache()._write_state(
+        {
+            ADDRESS: {
+                "code": "0x6001600055",
+                "balance": 10**18,
+                "nonce": 3,
+                "storage": {"0x2": "0x2a"},
+            }
+        }
+    )
+    assert web3.toHex(web3.eth.get_code(ADDRESS)) == "0x6001600055"
+    assert web3.eth.get_balance(ADDRESS) == 10**18
+    assert web3.eth.get_transaction_count(ADDRESS) == 3
+    assert int(web3.toHex(web3.eth.get_storage_at(ADDRESS, 2)), 16) == 42
+
+
+def test_worker_sessions_are_merged(tmp_path):
+    cache = ChainStateCache(tmp_path)
+    cache.merge(
+        {
+            "enabled": True,
+            "reason": "",
+            "network": "development",
+            "key": "abc",
+            "built_seconds": 30.0,
+            "sessions": [[False, 30.0]],
+        }
+    )
+    cache.merge(
+        {
+            "enabled": True,
+            "reason": "",
+            "network": "development",
+            "key": "abc",
+            "built_seconds": None,
+            "sessions": [[True, 2.0]],
+        }
+    )
+    assert cache.sessions == [(False, 30.0), (True, 2.0)]
+    lines = cache.summary()
+    assert lines[0] == f"cache {tmp_path / 'development' / 'abc.json'}"
+    assert "cold start: 1 sessions, 30.00s setup on average" in lines
+    assert "warm start: 1 sessions, 2.00s setup on average" in lines
@@ -0,0 +1,99 @@
+from fractions import Fraction
+
+import pytest
+from brownie import Contract, ImmutableVault, chain, interface
+
+from scripts.nav import NavEngine
+from scripts.twap import Q112, PriceRing, TwapSampler
+
+from ..utils.dex import fund_token, pangolin_factory
+from ..utils.tokens import TOKEN_ADDRESSES
+
+
+def tracked_sampler(vault_factory: Contract, multicall: Contract, owner) -> TwapSampler:
+    tx = vault_factory.createVault(
+        [TOKEN_ADDRESSES["WBTC"], TOKEN_ADDRESSES["WETH"]],
+        [1, 15e10],
+        TOKEN_ADDRESSES["WAVAX"],
+        {"from": owner},
+    )
+    engine = NavEngine(
+        vault_factory, multicall, pangolin_factory(), TOKEN_ADDRESSES["WAVAX"]
+    )
+    sampler = TwapSampler(engine, capacity=16)
+    sampler.track_vaults([tx.events["VaultCreated"]["vault"]])
+    return sampler
+
+
+def accumulated_price(base: str, quote: str) -> Fraction:
+    """Price of `base` in `quote` with the UQ112x112 rounding of the accumulators"""
+    pair = interface.IPangolinPair(pangolin_factory().getPair(base, quote))
+    reserve0, reserve1, _ = pair.getReserves()
+    if pair.token0().lower() != base.lower():
+        reserve0, reserve1 = reserve1, reserve0
+    return Fraction(reserve1 * Q112 // reserve0, Q112)
+
+
+def test_ring_overwrites_oldest_samples():
+    ring = PriceRing(capacity=4)
+    for t in range(1, 7):
+        assert ring.append(10 * t, 100 * t * Q112, 7 * t * Q112)
+    assert not ring.append(60, 0, 0)
+    assert len(ring) == 4
+    assert ring.observation(0)[0] == 30
+    assert ring.observation(-1)[0] == 60
+    assert ring.index_at_or_before(29) is None
+    assert ring.index_at_or_before(45) == 1
+    assert ring.twap(30, 60) == (Fraction(10), Fraction(7, 10))
+    assert ring.twap_last(1) == ring.twap_between(2, 3)
+    with pytest.raises(ValueError):
+        ring.twap(0, 60)
+
+
+def test_twap_of_idle_pair_is_spot(vault_factory, multicall, owner):
+    sampler = tracked_sampler(vault_factory, multicall, owner)
+    # WBTC/WAVAX and WETH/WAVAX
+    assert len(sampler.rings) == 2
+    wbtc, wavax = TOKEN_ADDRESSES["WBTC"], TOKEN_ADDRESSES["WAVAX"]
+
+    start = sampler.sample()
+    chain.sleep(600)
+    chain.mine()
+    end = sampler.sample()
+    assert sampler.twap(wbtc, wavax, end - start) == accumulated_price(wbtc, wavax)
+    assert sampler.twap(wavax, wbtc, end - start) == accumulated_price(wavax, wbtc)
+
+
+def test_twap_resists_single_block_manipulation(
+    vault_factory, multicall, owner, alice, tmp_path
+):
+    sampler = tracked_sampler(vault_factory, multicall, owner)
+    wbtc, wavax = TOKEN_ADDRESSES["WBTC"], TOKEN_ADDRESSES["WAVAX"]
+    price_before = accumulated_price(wbtc, wavax)
+    start = sampler.sample()
+    chain.sleep(3600)
+    chain.mine()
+    sampler.sample()
+
+    # buying a third of the pool's WBTC pushes its spot price up by more than half
+    fund_token(wbtc, alice, int(20e8))
+    swapped_at = chain[-1].timestamp
+    price_after = accumulated_price(wbtc, wavax)
+    assert price_after > price_before * 3 / 2
+    chain.sleep(30)
+    chain.mine()
+    end = sampler.sample()
+
+    twap = sampler.twap(wbtc, wavax, end - start)
+    expected = (
+        price_before * (swapped_at - start) + price_after * (end - swapped_at)
+    ) / (end - start)
+    assert twap == expected
+    assert twap < price_before * Fraction(102, 100)
+
+    path = tmp_path / "twap.json"
+    sampler.save(path)
+    reloaded = TwapSampler(sampler.engine)
+    reloaded.load(path)
+    assert reloaded.twap(wbtc, wavax, end - start) == twap
+    assert len(reloaded.ring(wbtc, wavax)) == 3
@@ -0,0 +1,92 @@
+import pytest
+from brownie import Contract, ImmutableVault, MockERC20, accounts, chain, reverts
+
+from scripts.vault_batcher import deposit_op, sign_permit, withdraw_op
+
+from ..utils.local import is_forked_network
+from ..utils.tokens import TOKEN_ADDRESSES, erc20
+
+
+def create_vaults(vault_factory: Contract, owner, count: int):
+    vaults = []
+    for i in range(count):
+        tx = vault_factory.createVault(
+            [TOKEN_ADDRESSES["WBTC"], TOKEN_ADDRESSES["WETH"]],
+            [i + 1, 15e10],
+            TOKEN_ADDRESSES["WAVAX"],
+            {"from": owner},
+        )
+        vaults.append(ImmutableVault.at(tx.events["VaultCreated"]["vault"]))
+    return vaults
+
+
+def approve_assets(batcher: Contract, account):
+    for symbol in ("WBTC", "WETH"):
+        erc20(TOKEN_ADDRESSES[symbol]).approve(batcher, 2**256 - 1, {"from": account})
+
+
+def test_batch_deposits_and_withdraws(batcher, vault_factory, owner, alice, bob):
+    vaults = create_vaults(vault_factory, owner, 3)
+    approve_assets(batcher, alice)
+    wbtc = erc20(TOKEN_ADDRESSES["WBTC"])
+    before = wbtc.balanceOf(alice)
+
+    batcher.execute(
+        [deposit_op(vault, 1000, alice) for vault in vaults]
+        + [deposit_op(vaults[0], 10, bob)],
+        {"from": alice},
+    )
+    assert [v.balanceOf(alice) for v in vaults] == [1000, 1000, 1000]
+    assert vaults[0].balanceOf(bob) == 10
+    assert before - wbtc.balanceOf(alice) == 1010 * 1 + 1000 * 2 + 1000 * 3
+    assert wbtc.balanceOf(batcher) == 0
+
+    for vault in vaults[:2]:
+        vault.approve(batcher, 400, {"from": alice})
+    bob_before = wbtc.balanceOf(bob)
+    batcher.execute(
+        [withdraw_op(vaults[0], 400, bob), withdraw_op(vaults[1], 400, alice)],
+        {"from": alice},
+    )
+    assert [v.balanceOf(alice) for v in vaults] == [600, 600, 1000]
+    assert vaults[0].totalSupply() == 610
+    # 400 shares of vaults[0], which holds 1 WBTC satoshi per share
+    assert wbtc.balanceOf(bob) - bob_before == 400
+
+
+def test_batch_is_atomic(batcher, vault_factory, owner, alice):
+    vaults = create_vaults(vault_factory, owner, 2)
+    approve_assets(batcher, alice)
+    vaults[1].approve(batcher, 2**256 - 1, {"from": alice})
+    with reverts():
+        batcher.execute(
+            [deposit_op(vaults[0], 1000, alice), withdraw_op(vaults[1], 1, alice)],
+            {"from": alice},
+        )
+    assert vaults[0].totalSupply() == 0
+
+
+def test_permit_deposit(batcher, vault_factory, owner):
+    if is_forked_network():
+        pytest.skip("mainnet WBTC.e and WETH.e don't implement EIP-2612")
+    vaults = create_vaults(vault_factory, owner, 2)
+    signer = accounts.add()
+    tokens = [MockERC20.at(TOKEN_ADDRESSES[s]) for s in ("WBTC", "WETH")]
+    amounts = [3 * 100, 2 * 15 * 10**10 * 100]
+    for token, amount in zip(tokens, amounts):
+        token.mint(signer, amount, {"from": owner})
+    owner.transfer(signer, "1 ether")
+
+    deadline = chain.time() + 600
+    permits = [
+        sign_permit(token, signer, batcher, amount, deadline)
+        for token, amount in zip(tokens, amounts)
+    ]
+    batcher.executeWithPermits(
+        permits,
+        [deposit_op(vault, 100, signer) for vault in vaults],
+        {"from": signer},
+    )
+    assert [v.balanceOf(signer) for v in vaults] == [100, 100]
+    assert [t.balanceOf(signer) for t in tokens] == [0, 0]
+    assert [t.allowance(signer, batcher) for t in tokens] == [0, 0]
@@ -0,0 +1,145 @@
+from brownie import Contract, ImmutableVault, chain, reverts
+
+from scripts.pangolin_quotes import add_pair_reserves
+from scripts.zap import plan_vault_zap_in, plan_vault_zap_out, plan_zap_in, zap_in_cost
+
+from ..utils.dex import pangolin_factory
+from ..utils.tokens import TOKEN_ADDRESSES, erc20
+
+
+def create_vault(vault_factory: Contract, owner) -> Contract:
+    tx = vault_factory.createVault(
+        [TOKEN_ADDRESSES["WBTC"], TOKEN_ADDRESSES["WETH"]],
+        [1, 15e10],
+        TOKEN_ADDRESSES["WAVAX"],
+        {"from": owner},
+    )
+    return ImmutableVault.at(tx.events["VaultCreated"]["vault"])
+
+
+def deadline() -> int:
+    return chain.time() + 600
+
+
+def zap_in_weth(zap, vault, multicall, account, amount_in):
+    weth = erc20(TOKEN_ADDRESSES["WETH"])
+    plan = plan_vault_zap_in(
+        vault,
+        weth.address,
+        amount_in,
+        pangolin_factory(),
+        multicall,
+        TOKEN_ADDRESSES["WAVAX"],
+    )
+    weth.approve(zap, plan.amount_in_max, {"from": account})
+    zap.zapIn(
+        vault,
+        weth,
+        plan.amount_in_max,
+        plan.shares,
+        plan.paths,
+        account,
+        deadline(),
+        {"from": account},
+    )
+    return plan
+
+
+def test_plan_buys_most_shares():
+    reserves = {}
+    add_pair_reserves(reserves, "0xa", "0xb", 10**24, 5 * 10**23)
+    add_pair_reserves(reserves, "0xa", "0xc", 10**24, 10**14)
+    weights, paths = [7, 3, 2], [["0xa", "0xb"], ["0xa", "0xc"], []]
+    plan = plan_zap_in(weights, paths, 10**20, reserves, slippage=0)
+    assert plan.amount_in == zap_in_cost(plan.shares, weights, paths, reserves)
+    assert plan.amount_in <= 10**20
+    assert zap_in_cost(plan.shares + 1, weights, paths, reserves) > 10**20
+
+
+def test_zap_in(zap, vault_factory, multicall, alice):
+    vault = create_vault(vault_factory, alice)
+    weth = erc20(TOKEN_ADDRESSES["WETH"])
+    before = weth.balanceOf(alice)
+    plan = zap_in_weth(zap, vault, multicall, alice, int(1e18))
+    assert vault.balanceOf(alice) == plan.shares
+    assert weth.balanceOf(alice) == before - plan.amount_in
+    assert plan.amount_in < int(1e18)
+    for asset, amount in zip((TOKEN_ADDRESSES["WBTC"], weth), plan.asset_amounts):
+        assert erc20(asset).balanceOf(vault) == amount
+        assert erc20(asset).balanceOf(zap) == 0
+
+
+def test_zap_in_avax(zap, vault_factory, multicall, bob):
+    vault = create_vault(vault_factory, bob)
+    wavax = TOKEN_ADDRESSES["WAVAX"]
+    plan = plan_vault_zap_in(
+        vault, wavax, int(100e18), pangolin_factory(), multicall, wavax
+    )
+    before = bob.balance()
+    tx = zap.zapInAVAX(
+        vault,
+        plan.shares,
+        plan.paths,
+        bob,
+        deadline(),
+        {"from": bob, "value": plan.amount_in_max},
+    )
+    assert vault.balanceOf(bob) == plan.shares
+    assert before - bob.balance() == plan.amount_in + tx.gas_used * tx.gas_price
+    assert erc20(wavax).balanceOf(zap) == 0
+    assert zap.balance() == 0
+
+
+def test_zap_out(zap, vault_factory, multicall, alice, bob):
+    vault = create_vault(vault_factory, alice)
+    plan_in = zap_in_weth(zap, vault, multicall, alice, int(1e18))
+    wavax = erc20(TOKEN_ADDRESSES["WAVAX"])
+    shares = plan_in.shares // 2
+    plan = plan_vault_zap_out(
+        vault, shares, pangolin_factory(), multicall, wavax.address
+    )
+    vault.approve(zap, shares, {"from": alice})
+    before = wavax.balanceOf(bob)
+    zap.zapOut(
+        vault, shares, plan.paths, plan.amount_out_min, bob, deadline(), {"from": alice}
+    )
+    assert wavax.balanceOf(bob) - before == plan.amount_out
+    assert vault.balanceOf(alice) == plan_in.shares - shares
+    assert vault.totalSupply() == plan_in.shares - shares
+
+
+def test_zap_respects_slippage_bounds(zap, vault_factory, multicall, alice):
+    vault = create_vault(vault_factory, alice)
+    plan_in = zap_in_weth(zap, vault, multicall, alice, int(1e18))
+    weth = erc20(TOKEN_ADDRESSES["WETH"])
+    weth.approve(zap, plan_in.amount_in, {"from": alice})
+    with reverts():
+        zap.zapIn(
+            vault,
+            weth,
+            plan_in.amount_in // 2,
+            plan_in.shares,
+            plan_in.paths,
+            alice,
+            deadline(),
+            {"from": alice},
+        )
+
+    plan = plan_vault_zap_out(
+        vault, plan_in.shares, pangolin_factory(), multicall, TOKEN_ADDRESSES["WAVAX"]
+    )
+    vault.approve(zap, plan.shares, {"from": alice})
+    with reverts("VaultZap: INSUFFICIENT_OUTPUT_AMOUNT"):
+        zap.zapOut(
+            vault,
+            plan.shares,
+            plan.paths,
+            plan.amount_out + 1,
+            alice,
+            deadline(),
+            {"from": alice},
+        )
+    with reverts("VaultZap: EXPIRED"):
+        zap.zapOut(
+            vault, plan.shares, plan.paths, 0, alice, chain.time() - 1, {"from": alice}
+        )
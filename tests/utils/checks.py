@@ -1,19 +1,26 @@
 from contextlib import contextmanager
-from typing import ContextManager, Mapping
+from typing import ContextManager, Dict, Mapping
 
 from brownie import Contract
 from brownie.network.account import Account
 
+from scripts.multicall import default_multicall, fetch_balances
+
+
+def _balances(account: Account, tokens) -> Dict[Contract, int]:
+    """Balances of `account` in one eth_call when a Multicall is deployed"""
+    multicall = default_multicall()
+    if multicall is None:
+        return {token: token.balanceOf(account.address) for token in tokens}
+    balances = fetch_balances(multicall, tokens, [account.address])
+    return {token: balances[(token, account.address)] for token in tokens}
+
 
 @contextmanager
 def assert_balance_change(account: Account, tokens_diff: Mapping[Contract, int]):
-    balances_before = {
-        token: token.balanceOf(account.address) for token in tokens_diff.keys()
-    }
+    balances_before = _balances(account, tokens_diff.keys())
     yield
-    balances_after = {
-        token: token.balanceOf(account.address) for token in tokens_diff.keys()
-    }
+    balances_after = _balances(account, tokens_diff.keys())
     for token, diff in tokens_diff.items():
         assert (
             balances_after[token] - balances_before[token] == diff
@@ -1,25 +1,36 @@
+from fractions import Fraction
 from math import ceil
 
-from brownie import Contract, interface
+from brownie import Contract
 from brownie.network.account import Account
 
-from .tokens import TOKEN_ADDRESSES, ZERO_ADDRESS
+from scripts.contract_registry import REGISTRY
+from scripts.pangolin_quotes import get_amount_in, get_amount_out
+
+from .tokens import TOKEN_ADDRESSES, ZERO_ADDRESS, erc20
+
+# Pangolin deployment on avalanche mainnet, replaced in place by the local stand-in
+# when the suite doesn't run on a fork (see tests/utils/local.py)
+PANGOLIN_ADDRESSES = {
+    "router": "0xE54Ca86531e17Ef3616d22Ca28b0D458b6C89106",
+    "factory": "0xefa94DE7a4656D787667C749f7E1223D71E9FD88",
+}
 
 
 def pangolin_router() -> Contract:
-    return interface.IPangolinRouter("0xE54Ca86531e17Ef3616d22Ca28b0D458b6C89106")
+    return REGISTRY.interface("IPangolinRouter", PANGOLIN_ADDRESSES["router"])
 
 
 def pangolin_factory() -> Contract:
-    return interface.IPangolinFactory("0xefa94DE7a4656D787667C749f7E1223D71E9FD88")
+    return REGISTRY.interface("IPangolinFactory", PANGOLIN_ADDRESSES["factory"])
 
 
 def WAVAX_contract() -> Contract:
-    return interface.IWAVAX("0xB31f66AA3C1e785363F0875A1B74E27b85FD66c7")
+    return REGISTRY.interface("IWAVAX", TOKEN_ADDRESSES["WAVAX"])
 
 
 def get_liquidity_pair(liquidity_pair_addr: str) -> Contract:
-    return interface.IPangolinPair(liquidity_pair_addr)
+    return REGISTRY.interface("IPangolinPair", liquidity_pair_addr)
 
 
 def fund_wavax(account: Account, amount: int):
@@ -32,10 +43,7 @@ def get_swap_amount(amount_in: int, reserve_in: int, reserve_out: int) -> int:
     """Given an amount in, the reserves of the input token, the reserve sof the output token
     computes the amount of output token that the amount_in can provide
     """
-    amount_after_fee = amount_in * 997
-    numerator = amount_after_fee * reserve_out
-    denominator = (reserve_in * 1000) + amount_after_fee
-    return ceil(numerator / denominator)
+    return get_amount_out(amount_in, reserve_in, reserve_out)
 
 
 def get_swap_amount_in(
@@ -44,9 +52,9 @@ def get_swap_amount_in(
     """Given an amount out, the reserve of the input token, the reserve of the output
     computes the amount of input token for the swap to get the amount of the output token
     """
-    numerator = amount_out * reserve_in * 1000
-    denominator = 997 * (reserve_out - amount_out)
-    return ceil((numerator / denominator) * slippage_tolerance)
+    tolerance = Fraction(str(slippage_tolerance))
+    amount_in = get_amount_in(amount_out, reserve_in, reserve_out) * tolerance
+    return ceil(amount_in)
 
 
 def fund_token(token_address: str, account: Account, amount: int):
@@ -54,13 +62,15 @@ def fund_token(token_address: str, account: Account, amount: int):
     Adds enough WAVAX to funds the correct amount of the token
     """
     factory = pangolin_factory()
-    liquidity_pair_addr = factory.getPair(TOKEN_ADDRESSES["WAVAX"], token_address)
+    liquidity_pair_addr = REGISTRY.get_pair(
+        factory, TOKEN_ADDRESSES["WAVAX"], token_address
+    )
     assert (
         liquidity_pair_addr != ZERO_ADDRESS
     ), "Liquidity pair for {token} and WAVAX doesn't exist, can't fund {token}"
     liquidity_pair = get_liquidity_pair(liquidity_pair_addr)
     reserve0, reserve1, _ = liquidity_pair.getReserves()
-    if liquidity_pair.token0() == TOKEN_ADDRESSES["WAVAX"]:
+    if REGISTRY.token0(liquidity_pair_addr) == TOKEN_ADDRESSES["WAVAX"]:
         amount_out0, amount_out1 = 0, amount
     else:
         reserve0, reserve1 = reserve1, reserve0
@@ -78,4 +88,4 @@ def fund_token(token_address: str, account: Account, amount: int):
     liquidity_pair.swap(
         amount_out0, amount_out1, account.address, bytes(), {"from": account}
     )
-    assert interface.IERC20(token_address).balanceOf(account.address) >= amount
+    assert erc20(token_address).balanceOf(account.address) >= amount
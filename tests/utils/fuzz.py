@@ -0,0 +1,97 @@
+"""Runs brownie stateful tests as campaigns and counts their throughput.
+
+`state_machine` takes a chain snapshot before the first example and reverts to it
+at the start of every example, so the setup a test does before the campaign (token
+and vault deployments, funding, approvals) is paid once. That snapshot replaces the
+session one the `isolation` fixture reverts to; the node keeps the older snapshot
+valid, so `run_campaign` only has to point brownie back at it afterwards.
+
+The number of examples and steps comes from the environment, so nightly runs can
+go much further than the default suite:
+
+    FUZZ_EXAMPLES=5000 FUZZ_STEPS=50 brownie test tests/fuzz
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from brownie import chain
+from hypothesis import HealthCheck
+
+DEFAULT_EXAMPLES = 25
+DEFAULT_STEPS = 20
+
+
+def campaign_settings() -> dict:
+    return {
+        "max_examples": int(os.environ.get("FUZZ_EXAMPLES", DEFAULT_EXAMPLES)),
+        "stateful_step_count": int(os.environ.get("FUZZ_STEPS", DEFAULT_STEPS)),
+        "deadline": None,
+        "suppress_health_check": list(HealthCheck),
+    }
+
+
+class Campaign:
+    """Counters the rules object bumps in `setup` and in every rule"""
+
+    def __init__(self):
+        self.examples = 0
+        self.steps = 0
+
+
+class FuzzStats:
+    def __init__(self):
+        # campaign -> (sequences, steps, seconds)
+        self.campaigns: Dict[str, Tuple[int, int, float]] = {}
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[Campaign]:
+        campaign, start = Campaign(), time.perf_counter()
+        try:
+            yield campaign
+        finally:
+            self.add(
+                name, campaign.examples, campaign.steps, time.perf_counter() - start
+            )
+
+    def add(self, name: str, sequences: int, steps: int, seconds: float):
+        total = self.campaigns.get(name, (0, 0, 0.0))
+        self.campaigns[name] = (
+            total[0] + sequences,
+            total[1] + steps,
+            total[2] + seconds,
+        )
+
+    def merge(self, campaigns: Dict[str, Tuple[int, int, float]]):
+        """Adds the campaigns of another process, e.g. an xdist worker"""
+        for name, totals in campaigns.items():
+            self.add(name, *totals)
+
+    def summary(self) -> List[str]:
+        return [
+            f"{name}: {sequences} sequences, {steps} steps in {seconds:.1f}s, "
+            f"{sequences / seconds:.2f} sequences/s, {steps / seconds:.1f} steps/s"
+            for name, (sequences, steps, seconds) in sorted(self.campaigns.items())
+            if seconds
+        ]
+
+
+FUZZ_STATS = FuzzStats()
+
+
+def run_campaign(
+    state_machine: Callable, name: str, rules_object: type, *args, **kwargs
+) -> Campaign:
+    """Runs `rules_object` with the `state_machine` fixture, `rules_object.campaign`
+    is set to the counters of this run
+    """
+    session_snapshot = chain._snapshot_id
+    try:
+        with FUZZ_STATS.measure(name) as campaign:
+            rules_object.campaign = campaign
+            state_machine(rules_object, *args, settings=campaign_settings(), **kwargs)
+    finally:
+        chain._snapshot_id = session_snapshot
+    return campaign
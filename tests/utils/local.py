@@ -0,0 +1,94 @@
+"""Offline stand-in for the avalanche mainnet state the tests rely on.
+
+When the suite doesn't run on a fork, `deploy_local_dex` deploys mock Pangolin
+factory/pairs, WAVAX and one ERC20 per entry of `TOKEN_ADDRESSES`, seeds every
+token/WAVAX pair with reserves close to mainnet prices and rewrites the address
+registries in place, so `fund_token` and friends keep working unchanged.
+"""
+
+from typing import Dict, Tuple
+
+from brownie import (
+    MockAggregator,
+    MockERC20,
+    MockPangolinFactory,
+    MockPangolinPair,
+    MockPangolinRouter,
+    MockWAVAX,
+    network,
+)
+from brownie.network.account import Account
+
+from .dex import PANGOLIN_ADDRESSES
+from .tokens import TOKEN_ADDRESSES
+
+# (decimals, USD price in cents) of every token, roughly the prices at the fork block
+LOCAL_TOKENS: Dict[str, Tuple[int, int]] = {
+    "PNG": (18, 150),
+    "LINK": (18, 2_500),
+    "USDT": (6, 100),
+    "1INCH": (18, 300),
+    "AAVE": (18, 38_000),
+    "BAT": (18, 70),
+    "BUSD": (18, 100),
+    "DAI": (18, 100),
+    "GRT": (18, 80),
+    "RUNE": (18, 600),
+    "SNX": (18, 1_200),
+    "SUSHI": (18, 1_000),
+    "UMA": (18, 1_100),
+    "UNI": (18, 2_500),
+    "WBTC": (8, 4_700_000),
+    "WETH": (18, 320_000),
+    "YFI": (18, 3_500_000),
+}
+WAVAX_USD_CENTS = 3_000
+# WAVAX side of every local pair, 100k AVAX is ~3M USD of liquidity per pair
+LOCAL_PAIR_WAVAX_RESERVE = 100_000 * 10**18
+
+ETH_USD_DECIMALS = 8
+ETH_USD_PRICE = 3_200 * 10**ETH_USD_DECIMALS
+
+
+def is_forked_network() -> bool:
+    return network.show_active().endswith("-fork")
+
+
+def local_token_reserve(
+    symbol: str, wavax_reserve: int = LOCAL_PAIR_WAVAX_RESERVE
+) -> int:
+    """Amount of `symbol` worth `wavax_reserve` WAVAX at the seeded prices"""
+    decimals, usd_cents = LOCAL_TOKENS[symbol]
+    return wavax_reserve * WAVAX_USD_CENTS * 10**decimals // (usd_cents * 10**18)
+
+
+def deploy_local_dex(deployer: Account) -> None:
+    """Deploys WAVAX, the tokens and a Pangolin factory with one seeded pair per token.
+    `TOKEN_ADDRESSES` and `PANGOLIN_ADDRESSES` are updated in place.
+    """
+    wavax_needed = LOCAL_PAIR_WAVAX_RESERVE * len(LOCAL_TOKENS)
+    assert (
+        deployer.balance() >= wavax_needed
+    ), "Not enough AVAX to seed the local pairs, raise the development default_balance"
+    wavax = MockWAVAX.deploy({"from": deployer})
+    factory = MockPangolinFactory.deploy({"from": deployer})
+    TOKEN_ADDRESSES["WAVAX"] = wavax.address
+    PANGOLIN_ADDRESSES["factory"] = factory.address
+    router = MockPangolinRouter.deploy(factory, wavax, {"from": deployer})
+    PANGOLIN_ADDRESSES["router"] = router.address
+    wavax.deposit({"from": deployer, "value": wavax_needed})
+    for symbol, (decimals, _) in LOCAL_TOKENS.items():
+        token = MockERC20.deploy(symbol, symbol, decimals, {"from": deployer})
+        TOKEN_ADDRESSES[symbol] = token.address
+        factory.createPair(wavax.address, token.address, {"from": deployer})
+        pair = MockPangolinPair.at(factory.getPair(wavax.address, token.address))
+        wavax.transfer(pair.address, LOCAL_PAIR_WAVAX_RESERVE, {"from": deployer})
+        token.mint(pair.address, local_token_reserve(symbol), {"from": deployer})
+        pair.sync({"from": deployer})
+
+
+def deploy_local_price_feed(deployer: Account) -> str:
+    feed = MockAggregator.deploy(
+        ETH_USD_DECIMALS, "ETH / USD", ETH_USD_PRICE, {"from": deployer}
+    )
+    return feed.address
@@ -0,0 +1,53 @@
+"""Support for running the suite on several cores with pytest-xdist:
+
+    brownie test -n 4
+
+Brownie starts one local node per worker, on the configured port plus the worker
+number, so every worker has its own chain, accounts and session deployments (the
+local DEX, the vaults, the funded accounts) and the snapshot isolation of
+`tests/conftest.py` works unchanged. With `--network avalanche-main-fork` every
+worker forks mainnet on its own.
+
+Workers share the chain state cache of `state_cache.py`, those starting cold all
+write the same file. Workers send their RPC, fuzz campaign and setup time stats to
+the controller when they finish, so the summaries cover the whole run.
+"""
+
+from typing import Optional
+
+from .fuzz import FUZZ_STATS
+from .rpc_stats import RPC_STATS
+from .state_cache import STATE_CACHE
+
+
+def worker_id(config) -> Optional[str]:
+    """`gw0`, `gw1`... on xdist workers, None on the controller or a serial run"""
+    workerinput = getattr(config, "workerinput", None)
+    return None if workerinput is None else workerinput["workerid"]
+
+
+class WorkerStats:
+    """Registered on the xdist controller, collects the workers' RPC stats"""
+
+    def pytest_testnodedown(self, node, error):
+        phases = getattr(node, "workeroutput", {}).get("rpc_stats")
+        if phases:
+            RPC_STATS.merge(phases)
+        campaigns = getattr(node, "workeroutput", {}).get("fuzz_stats")
+        if campaigns:
+            FUZZ_STATS.merge(campaigns)
+        state_cache = getattr(node, "workeroutput", {}).get("state_cache")
+        if state_cache:
+            STATE_CACHE.merge(state_cache)
+
+
+def configure(config):
+    if config.pluginmanager.hasplugin("xdist") and worker_id(config) is None:
+        config.pluginmanager.register(WorkerStats(), "worker_stats")
+
+
+def send_worker_stats(config):
+    if worker_id(config) is not None:
+        config.workeroutput["rpc_stats"] = RPC_STATS.phases
+        config.workeroutput["fuzz_stats"] = FUZZ_STATS.campaigns
+        config.workeroutput["state_cache"] = STATE_CACHE.report()
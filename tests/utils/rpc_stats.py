@@ -0,0 +1,86 @@
+"""Counts JSON-RPC round-trips and wall time of the test fixture layer.
+
+The counter is a web3 middleware, so it sees every request brownie sends to the
+node (calls, transactions, receipts, snapshots...).
+"""
+
+import time
+from contextlib import contextmanager
+from statistics import mean
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from brownie import web3
+
+
+class RpcStats:
+    def __init__(self):
+        self.calls = 0
+        self.installed = False
+        # xdist workers merged in, 0 on a serial run
+        self.workers = 0
+        # phase -> [(rpc round-trips, seconds)]
+        self.phases: Dict[str, List[Tuple[int, float]]] = {}
+
+    def middleware(self, make_request: Callable, w3) -> Callable:
+        def count_request(method, params):
+            self.calls += 1
+            return make_request(method, params)
+
+        return count_request
+
+    def install(self):
+        if not self.installed:
+            web3.middleware_onion.add(self.middleware, "rpc_stats")
+            self.installed = True
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        calls_before, start = self.calls, time.perf_counter()
+        yield
+        self.phases.setdefault(phase, []).append(
+            (self.calls - calls_before, time.perf_counter() - start)
+        )
+
+    def merge(self, phases: Dict[str, List[Tuple[int, float]]]):
+        """Adds the samples of another process, e.g. an xdist worker"""
+        self.workers += 1
+        for phase, samples in phases.items():
+            self.phases.setdefault(phase, []).extend(tuple(s) for s in samples)
+
+    def mean(self, phase: str) -> Tuple[float, float]:
+        samples = self.phases.get(phase) or [(0, 0.0)]
+        return mean(s[0] for s in samples), mean(s[1] for s in samples)
+
+    def total(self, phase: str) -> Tuple[int, float]:
+        samples = self.phases.get(phase, [])
+        return sum(s[0] for s in samples), sum(s[1] for s in samples)
+
+    def summary(self) -> List[str]:
+        """Session setup cost, per-test cost and the estimated saving per vault test,
+        which used to redeploy its vault and call `fund_token` twice
+        """
+        if "test" not in self.phases:
+            return []
+        lines = []
+        if self.workers:
+            lines.append(f"{self.workers} workers, session setup runs once per worker")
+        for phase in ("fund_token", "deploy"):
+            rpc, seconds = self.total(phase)
+            count = len(self.phases.get(phase, []))
+            lines.append(f"session {phase}: {count} calls, {rpc} rpc, {seconds:.2f}s")
+        test_rpc, test_seconds = self.mean("test")
+        lines.append(
+            f"per test: {len(self.phases['test'])} tests, "
+            f"{test_rpc:.1f} rpc, {test_seconds * 1000:.0f}ms (incl. revert)"
+        )
+        fund_rpc, fund_seconds = self.mean("fund_token")
+        deploy_rpc, deploy_seconds = self.mean("deploy")
+        lines.append(
+            "saved per vault test: "
+            f"~{2 * fund_rpc + deploy_rpc:.0f} rpc, "
+            f"~{(2 * fund_seconds + deploy_seconds) * 1000:.0f}ms"
+        )
+        return lines
+
+
+RPC_STATS = RpcStats()
@@ -0,0 +1,344 @@
+"""On-disk cache of the chain state the session fixtures prepare.
+
+A cold session deploys the local DEX (or, on a fork, downloads the Pangolin, WAVAX
+and token state `fund_token` touches), funds the named accounts and deploys the
+session contracts. Once that is done, `finish` traces the setup transactions and
+writes down every account they touched: code, balance, nonce and the storage
+slots read or written, attributed to the account whose storage the frame uses so
+the delegatecalls of proxies and clones land on the proxy. The next session
+writes that state straight into the node instead, restores `TOKEN_ADDRESSES` and
+`PANGOLIN_ADDRESSES`, and the fixtures reattach to their contracts by address.
+
+The cache is keyed by
+    - the network, its node settings (fork, accounts, balances, EVM version...)
+      except the port xdist changes per worker, the chain id and the fork block,
+      or the block the session starts at without a fork,
+    - `brownie-config.yaml`,
+    - the bytecode and ABI of every contract of the project,
+    - the source of the modules defining the session fixtures,
+so changing any of them starts cold and replaces the network's cache. Writing
+state needs a node with account setters (ganache 7, hardhat, anvil); with any
+other node, or with `CHAIN_STATE_CACHE=0`, every session starts cold.
+
+A fork of the latest block starts at a new block every session, so its cache
+could never be restored. Caching a fork needs its block pinned in the network's
+`cmd_settings`, e.g. `fork: https://api.avax.network/ext/bc/C/rpc@2500000`;
+unpinned forks always start cold and the summary says so.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from brownie import accounts, history, network, project, web3
+from brownie._config import CONFIG
+from brownie.network.contract import ContractContainer
+
+from .dex import PANGOLIN_ADDRESSES
+from .local import is_forked_network
+from .tokens import TOKEN_ADDRESSES
+
+CACHE_DIR = Path(".chain_state_cache")
+TESTS_DIR = Path(__file__).resolve().parent.parent
+FIXTURE_SOURCES = (
+    TESTS_DIR / "conftest.py",
+    TESTS_DIR / "utils" / "dex.py",
+    TESTS_DIR / "utils" / "local.py",
+    TESTS_DIR / "utils" / "state_cache.py",
+    TESTS_DIR / "utils" / "tokens.py",
+    TESTS_DIR.parent / "scripts" / "multicall.py",
+)
+CONFIG_PATH = TESTS_DIR.parent / "brownie-config.yaml"
+# node settings brownie changes per xdist worker, left out of the key so workers share it
+PER_WORKER_SETTINGS = {"port"}
+STORAGE_OPS = {"SLOAD", "SSTORE"}
+CALL_OPS = {"CALL", "CALLCODE", "DELEGATECALL", "STATICCALL", "CREATE", "CREATE2"}
+VALUE_CALL_OPS = {"CALL", "CALLCODE"}
+# calls running the callee's code on the caller's storage
+DELEGATE_OPS = {"CALLCODE", "DELEGATECALL"}
+
+
+def _slot_word(slot: int) -> str:
+    return "0x" + format(slot, "064x")
+
+
+def _quantity(value: int) -> str:
+    return hex(value)
+
+
+# client name prefix -> (set code, set balance, set nonce, set storage, slot format)
+SETTERS = {
+    "ganache": (
+        "evm_setAccountCode",
+        "evm_setAccountBalance",
+        "evm_setAccountNonce",
+        "evm_setAccountStorageAt",
+        _slot_word,
+    ),
+    "hardhatnetwork": (
+        "hardhat_setCode",
+        "hardhat_setBalance",
+        "hardhat_setNonce",
+        "hardhat_setStorageAt",
+        _quantity,
+    ),
+    "anvil": (
+        "anvil_setCode",
+        "anvil_setBalance",
+        "anvil_setNonce",
+        "anvil_setStorageAt",
+        _quantity,
+    ),
+}
+
+
+def _setters() -> Optional[Tuple]:
+    client = web3.clientVersion.lower()
+    for prefix, setters in SETTERS.items():
+        if client.startswith(prefix):
+            return setters
+    return None
+
+
+def _rpc(method: str, *params):
+    response = web3.provider.make_request(method, list(params))
+    if "error" in response:
+        raise ValueError(f"{method} failed: {response['error']}")
+    return response.get("result")
+
+
+def _hash_files(digest, paths):
+    for path in paths:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+
+
+def pinned_fork_block(fork_setting) -> Optional[int]:
+    """Block of a `url@block` fork setting, None for a fork of the latest block"""
+    _, separator, block = str(fork_setting or "").rpartition("@")
+    return int(block) if separator and block.isdigit() else None
+
+
+def cache_key() -> str:
+    digest = hashlib.sha256()
+    settings = {
+        name: value
+        for name, value in (CONFIG.active_network.get("cmd_settings") or {}).items()
+        if name not in PER_WORKER_SETTINGS
+    }
+    if is_forked_network():
+        start_block = pinned_fork_block(settings.get("fork"))
+    else:
+        start_block = web3.eth.block_number
+    digest.update(
+        json.dumps(
+            [network.show_active(), settings, web3.eth.chain_id, start_block],
+            default=str,
+            sort_keys=True,
+        ).encode()
+    )
+    for name, container in sorted(project.get_loaded_projects()[0].items()):
+        digest.update(name.encode())
+        digest.update(container.bytecode.encode())
+        digest.update(json.dumps(container.abi, sort_keys=True).encode())
+    _hash_files(digest, (CONFIG_PATH, *FIXTURE_SOURCES))
+    return digest.hexdigest()[:16]
+
+
+def touch_trace(touched: Dict[str, set], trace: List[dict]):
+    """Adds the accounts and storage slots a transaction trace touches to `touched`.
+    Slots go to the account whose storage the frame uses, the caller's for
+    DELEGATECALL and CALLCODE frames.
+    """
+    # call depth -> account whose storage the frame uses
+    contexts: Dict[int, str] = {}
+    # (depth of the call, storage of the callee frame or None for its own)
+    entering: Optional[Tuple[int, Optional[str]]] = None
+    for step in trace:
+        depth, code_address = step["depth"], step["address"].lower()
+        if not contexts:
+            contexts[depth] = code_address
+        elif entering is not None and depth > entering[0]:
+            contexts[depth] = entering[1] or code_address
+        entering = None
+        touched.setdefault(code_address, set())
+        op = step["op"]
+        if op in STORAGE_OPS:
+            slot = int(step["stack"][-1], 16)
+            touched.setdefault(contexts[depth], set()).add(slot)
+        elif op in CALL_OPS:
+            storage = contexts[depth] if op in DELEGATE_OPS else None
+            entering = (depth, storage)
+            if op in VALUE_CALL_OPS:
+                recipient = "0x" + step["stack"][-2][-40:]
+                touched.setdefault(recipient.lower(), set())
+
+
+class ChainStateCache:
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.enabled = os.environ.get("CHAIN_STATE_CACHE", "1") != "0"
+        # why the cache is off
+        self.reason = "disabled by CHAIN_STATE_CACHE=0"
+        self.network: Optional[str] = None
+        self.key: Optional[str] = None
+        self.restored = False
+        self.started: Optional[float] = None
+        # fixture name -> address of the value it yields
+        self.fixtures: Dict[str, str] = {}
+        # setup seconds of the cold session that built the restored cache
+        self.built_seconds: Optional[float] = None
+        # (warm start, setup seconds) of this session and, on xdist, every worker
+        self.sessions: List[Tuple[bool, float]] = []
+
+    @property
+    def path(self) -> Path:
+        return self.cache_dir / self.network / f"{self.key}.json"
+
+    def start(self):
+        """Restores the cached state when there is a valid one, otherwise the
+        fixtures run cold and `finish` saves what they did
+        """
+        self.started = time.perf_counter()
+        if self.enabled and _setters() is None:
+            self.enabled, self.reason = False, "the node can't set account state"
+        settings = CONFIG.active_network.get("cmd_settings") or {}
+        if (
+            self.enabled
+            and is_forked_network()
+            and pinned_fork_block(settings.get("fork")) is None
+        ):
+            self.enabled = False
+            self.reason = "the fork isn't pinned to a block (`fork: <url>@<block>`)"
+        if not self.enabled:
+            return
+        self.network = network.show_active()
+        self.key = cache_key()
+        if not self.path.exists():
+            return
+        with open(self.path) as fp:
+            cached = json.load(fp)
+        self._write_state(cached["accounts"])
+        TOKEN_ADDRESSES.update(cached["token_addresses"])
+        PANGOLIN_ADDRESSES.update(cached["pangolin_addresses"])
+        self.fixtures = cached["fixtures"]
+        self.built_seconds = cached["seconds"]
+        self.restored = True
+
+    def deployment(self, name: str, container: ContractContainer, deploy: Callable):
+        """The contract fixture `name` yields, `deploy()` runs on a cold start only"""
+        if self.restored:
+            return container.at(self.fixtures[name])
+        deployed = deploy()
+        self.fixtures[name] = deployed.address
+        return deployed
+
+    def address(self, name: str, deploy: Callable[[], str]) -> str:
+        """Same as `deployment` for fixtures that only need an address"""
+        if not self.restored:
+            self.fixtures[name] = deploy()
+        return self.fixtures[name]
+
+    def finish(self):
+        """Called once every session fixture has run, saves the state of a cold start"""
+        seconds = time.perf_counter() - self.started
+        self.sessions.append((self.restored, seconds))
+        if self.enabled and not self.restored:
+            self._save(seconds)
+
+    def report(self) -> dict:
+        """What an xdist worker sends the controller for `merge`"""
+        return {
+            "enabled": self.enabled,
+            "reason": self.reason,
+            "network": self.network,
+            "key": self.key,
+            "built_seconds": self.built_seconds,
+            "sessions": self.sessions,
+        }
+
+    def merge(self, report: dict):
+        self.enabled = report["enabled"]
+        self.reason = report["reason"]
+        self.network = report["network"]
+        self.key = report["key"]
+        self.built_seconds = report["built_seconds"] or self.built_seconds
+        self.sessions.extend(tuple(session) for session in report["sessions"])
+
+    def _touched(self) -> Dict[str, set]:
+        """Account -> storage slots the setup transactions touched"""
+        touched: Dict[str, set] = {a.address.lower(): set() for a in accounts}
+        for tx in history:
+            touched.setdefault(tx.sender.address.lower(), set())
+            for address in (tx.receiver, tx.contract_address):
+                if address:
+                    touched.setdefault(address.lower(), set())
+            touch_trace(touched, tx.trace)
+        return touched
+
+    def _save(self, seconds: float):
+        state = {}
+        for address, slots in self._touched().items():
+            address = web3.toChecksumAddress(address)
+            state[address] = {
+                "code": web3.toHex(web3.eth.get_code(address)),
+                "balance": web3.eth.get_balance(address),
+                "nonce": web3.eth.get_transaction_count(address),
+                "storage": {
+                    hex(slot): web3.toHex(web3.eth.get_storage_at(address, slot))
+                    for slot in sorted(slots)
+                },
+            }
+        cached = {
+            "accounts": state,
+            "token_addresses": TOKEN_ADDRESSES,
+            "pangolin_addresses": PANGOLIN_ADDRESSES,
+            "fixtures": self.fixtures,
+            "seconds": seconds,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # caches of the network built for another key can't be restored anymore,
+        # workers of an xdist run share the key and write the same file
+        for stale in self.path.parent.glob("*.json"):
+            if stale != self.path:
+                stale.unlink(missing_ok=True)
+        # xdist workers share the directory, never leave a half-written cache
+        partial = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(partial, "w") as fp:
+            json.dump(cached, fp)
+        os.replace(partial, self.path)
+
+    def _write_state(self, state: Dict[str, dict]):
+        set_code, set_balance, set_nonce, set_storage, slot_format = _setters()
+        for address, account in state.items():
+            if account["code"] != "0x":
+                _rpc(set_code, address, account["code"])
+            _rpc(set_balance, address, hex(account["balance"]))
+            _rpc(set_nonce, address, hex(account["nonce"]))
+            for slot, value in account["storage"].items():
+                word = "0x" + value[2:].rjust(64, "0")
+                _rpc(set_storage, address, slot_format(int(slot, 16)), word)
+
+    def summary(self) -> List[str]:
+        if not self.sessions:
+            return []
+        if self.enabled:
+            lines = [f"cache {self.path}"]
+        else:
+            lines = [f"{self.reason}, every session starts cold"]
+        for warm, label in ((False, "cold"), (True, "warm")):
+            seconds = [s for w, s in self.sessions if w == warm]
+            if seconds:
+                lines.append(
+                    f"{label} start: {len(seconds)} sessions, "
+                    f"{sum(seconds) / len(seconds):.2f}s setup on average"
+                )
+        if self.built_seconds is not None:
+            lines.append(f"built by a cold start of {self.built_seconds:.2f}s")
+        return lines
+
+
+STATE_CACHE = ChainStateCache()
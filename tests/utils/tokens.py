@@ -1,6 +1,8 @@
 from brownie import Contract
 from brownie.network.account import Account
 
+from scripts.contract_registry import REGISTRY
+
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
 ONE_ADDRESS = "0x0000000000000000000000000000000000000001"
 
@@ -26,6 +28,11 @@ TOKEN_ADDRESSES = {
 }
 
 
+def erc20(address: str) -> Contract:
+    """`interface.IERC20(address)`, built once per token"""
+    return REGISTRY.interface("IERC20", address)
+
+
 def clean_balance(account: Account, token: Contract):
     balance = token.balanceOf(account.address)
     if balance > 0: